@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Report Aggregation
+Shared grouping engine for the JIRA and Excel aggregators. The finest grain
+(Feature Link x Assignee) is computed once from the detailed issue rows and
+every coarser view - per feature, per assignee, grand total - is rolled up
+from it instead of re-grouping the detailed data.
+"""
+
+from typing import Dict, List, Sequence
+
+import pandas as pd
+
+GROUP_KEYS = ['Feature Link', 'Assignee']
+METRIC_COLUMNS = ['Estimated Hours', 'Remaining Hours', 'Spent Hours']
+COUNT_COLUMN = 'Issue Count'
+
+# Grouping sets written as extra report sheets next to the Feature x Assignee summary
+REPORT_ROLLUPS = {
+    'Summary by Feature': ['Feature Link'],
+    'Summary by Assignee': ['Assignee']
+}
+
+def finest_grain(detailed_df: pd.DataFrame, keys: Sequence[str] = GROUP_KEYS) -> pd.DataFrame:
+    """Unrounded metric sums and issue counts per group, indexed by `keys`"""
+    return detailed_df.groupby(list(keys)).agg(
+        **{column: (column, 'sum') for column in METRIC_COLUMNS},
+        **{COUNT_COLUMN: ('Issue Key', 'count')}
+    )
+
+def summary_grain(summary_df: pd.DataFrame, keys: Sequence[str] = GROUP_KEYS) -> pd.DataFrame:
+    """Recover the grain from a finished summary so it can be rolled up further"""
+    return summary_df.set_index(list(keys))[METRIC_COLUMNS + [COUNT_COLUMN]]
+
+def rollup(grain: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """
+    Sum a grain up to a coarser grouping. `keys` must be a subset of the
+    grain's index levels; an empty `keys` gives a single 'Total' row.
+    """
+    keys = list(keys)
+    if keys == list(grain.index.names):
+        return grain
+    if not keys:
+        return grain.sum().to_frame('Total').T
+    return grain.groupby(level=keys).sum()
+
+def summarize(grouped: pd.DataFrame) -> pd.DataFrame:
+    """Round grouped totals and add the completion percentage"""
+    grouped = grouped.round(2)
+    grouped[COUNT_COLUMN] = grouped[COUNT_COLUMN].astype(int)
+
+    # Calculate completion percentage; groups without an estimate count as 0%
+    estimated = grouped['Estimated Hours']
+    grouped['Completion %'] = (
+        (grouped['Spent Hours'] / estimated.where(estimated > 0) * 100)
+        .fillna(0)
+        .round(1)
+    )
+    return grouped
+
+def grouping_sets(grain: pd.DataFrame, sets: Dict[str, Sequence[str]]) -> Dict[str, pd.DataFrame]:
+    """
+    Summaries for several groupings derived from one grain, e.g.
+
+        grouping_sets(grain, {'feature': ['Feature Link'], 'total': []})
+    """
+    return {name: summarize(rollup(grain, keys)) for name, keys in sets.items()}
+
+class RunningSummary:
+    """Grain totals accumulated one page of detailed issue rows at a time"""
+
+    def __init__(self, keys: Sequence[str] = GROUP_KEYS):
+        self.keys = list(keys)
+        self.totals: Dict[tuple, List[float]] = {}
+        self.issue_count = 0
+
+    def add(self, detailed_df: pd.DataFrame):
+        """Fold a page of detailed issue rows into the running totals"""
+        if detailed_df.empty:
+            return
+
+        grouped = finest_grain(detailed_df, self.keys)
+
+        for key, values in zip(grouped.index, grouped.itertuples(index=False)):
+            totals = self.totals.setdefault(key, [0.0] * len(METRIC_COLUMNS) + [0])
+            for i, value in enumerate(values):
+                totals[i] += value
+
+        self.issue_count += len(detailed_df)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Unrounded totals indexed by the grouping keys, like finest_grain"""
+        index = pd.MultiIndex.from_tuples(sorted(self.totals), names=self.keys)
+        return pd.DataFrame(
+            [self.totals[key] for key in index],
+            index=index,
+            columns=METRIC_COLUMNS + [COUNT_COLUMN]
+        )
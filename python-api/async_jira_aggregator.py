@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Async JIRA Data Aggregator
+Asyncio transport for the aggregator: search pagination, worklog fetches and
+field lookups run on a single event loop with a bounded number of requests
+in flight, so many JQL queries can be pulled at once from one process
+"""
+
+import asyncio
+import argparse
+import logging
+import sys
+from typing import Dict, List, Optional, Any
+
+import aiohttp  # Make sure to install this: pip install aiohttp
+
+from jira_data_aggregator import JiraConfig, JiraDataAggregator
+from jira_http import RetryPolicy, AsyncAdaptiveLimiter
+from field_projection import KEY_BATCH_SIZE, LINK_FIELD
+
+logger = logging.getLogger(__name__)
+
+class AsyncJiraDataAggregator(JiraDataAggregator):
+    """
+    JiraDataAggregator that fetches over aiohttp instead of requests.
+    
+    Extraction and aggregation are inherited unchanged; only the transport
+    differs, and the inherited requests session is never created. Use as an async context manager so the HTTP session is closed:
+        
+        async with AsyncJiraDataAggregator(config) as aggregator:
+            issues = await aggregator.fetch_issues_async(jql)
+    """
+    
+    def __init__(self, config: JiraConfig, concurrency: Optional[int] = None):
+        super().__init__(config)
+        self.concurrency = max(concurrency or config.workers, 1)
+        self.policy = RetryPolicy(max_retries=config.max_retries)
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'bytes': 0}
+        self._client: Optional[aiohttp.ClientSession] = None
+        self._limiter: Optional[AsyncAdaptiveLimiter] = None
+    
+    async def __aenter__(self):
+        self._limiter = AsyncAdaptiveLimiter(self.concurrency)
+        self._client = aiohttp.ClientSession(
+            auth=aiohttp.BasicAuth(self.config.username, self.config.api_token),
+            headers={
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+                'Accept-Encoding': 'gzip, deflate' if self.config.compress else 'identity'
+            },
+            connector=aiohttp.TCPConnector(
+                limit=max(self.concurrency, self.config.pool_size),
+                force_close=not self.config.keep_alive
+            ),
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=self.config.connect_timeout,
+                sock_read=self.config.read_timeout
+            )
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+    
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a JIRA REST path with retries, holding a concurrency slot per attempt"""
+        if self._client is None:
+            raise RuntimeError("AsyncJiraDataAggregator must be used as an async context manager")
+        
+        url = f"{self.config.base_url}{path}"
+        attempt = 0
+        
+        while True:
+            await self._limiter.acquire()
+            throttled = False
+            retry_after = None
+            try:
+                self.stats['requests'] += 1
+                async with self._client.get(url, params=params) as response:
+                    throttled = response.status in self.policy.throttle_statuses
+                    if response.status not in self.policy.retry_statuses or attempt >= self.policy.max_retries:
+                        response.raise_for_status()
+                        self.stats['bytes'] += len(await response.read())
+                        return await response.json()
+                    retry_after = response.headers.get('Retry-After')
+                    reason = response.status
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.policy.max_retries:
+                    raise
+                reason = e
+            finally:
+                if throttled:
+                    self.stats['throttled'] += 1
+                await self._limiter.release(throttled)
+            
+            delay = self.policy.compute_delay(attempt, retry_after)
+            logger.warning(f"GET {url} failed ({reason}), retrying in {delay:.1f}s")
+            self.stats['retries'] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+    
+    async def test_connection_async(self) -> bool:
+        """Test JIRA API connection"""
+        try:
+            await self._get_json('/rest/api/3/myself')
+            logger.info("JIRA connection successful")
+            return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Timeouts carry no message
+            logger.error(f"JIRA connection failed: {str(e) or type(e).__name__}")
+            return False
+    
+    async def _fetch_search_page_async(self, jql: str, fields: str, start_at: int, max_results: int) -> Dict[str, Any]:
+        """Fetch a single page of search results starting at the given offset"""
+        params = {
+            'jql': jql,
+            'fields': fields,
+            'maxResults': max_results,
+            'startAt': start_at
+        }
+        return await self._get_json('/rest/api/3/search', params)
+    
+    async def fetch_issues_async(self, jql: Optional[str] = None, additional_fields: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch issues from JIRA using JQL query.
+        The first page gives the total; the remaining pages are requested
+        concurrently and reassembled in offset order.
+        """
+        if jql is None:
+            jql = self.config.default_jql
+        
+        max_results = min(self.config.max_results, 100)  # JIRA API limit per request
+        all_issues = await self._search_all_async(jql, self._search_fields(additional_fields), max_results)
+        
+        await self.complete_issue_links_async(all_issues)
+        logger.info(f"Total issues fetched for '{jql}': {len(all_issues)}")
+        return all_issues
+    
+    async def _search_all_async(self, jql: str, fields: str, max_results: int) -> List[Dict[str, Any]]:
+        """Every search result for a query: the first page, then the rest concurrently"""
+        first_page = await self._fetch_search_page_async(jql, fields, 0, max_results)
+        all_issues = list(first_page.get('issues', []))
+        total = first_page.get('total', len(all_issues))
+        # The offsets of the remaining pages follow the page size the server applied
+        page_size = first_page.get('maxResults') or max_results
+        
+        if all_issues and total > len(all_issues):
+            # gather preserves argument order, so pages stay sorted
+            pages = await asyncio.gather(*[
+                self._fetch_search_page_async(jql, fields, start_at, page_size)
+                for start_at in range(page_size, total, page_size)
+            ])
+            
+            for data in pages:
+                all_issues.extend(data.get('issues', []))
+        return all_issues
+    
+    async def complete_issue_links_async(self, issues: List[Dict[str, Any]]):
+        """
+        Add issuelinks to the issues a projected search returned without an
+        Epic Link, fetched concurrently with `key in (...)` queries
+        """
+        missing = {issue['key']: issue for issue in issues if self.projection.needs_links(issue)}
+        if not missing:
+            return
+        
+        keys = list(missing)
+        # A server capping the page size below KEY_BATCH_SIZE splits a batch over several pages
+        batches = await asyncio.gather(*[
+            self._search_all_async(f"key in ({','.join(keys[i:i + KEY_BATCH_SIZE])})", LINK_FIELD, KEY_BATCH_SIZE)
+            for i in range(0, len(keys), KEY_BATCH_SIZE)
+        ])
+        
+        for linked_issues in batches:
+            for linked in linked_issues:
+                issue = missing.get(linked.get('key'))
+                if issue is not None:
+                    issue.setdefault('fields', {})[LINK_FIELD] = (linked.get('fields') or {}).get(LINK_FIELD) or []
+        
+        self.link_lookups += len(missing)
+    
+    async def fetch_many(self, queries: List[str], additional_fields: List[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch several JQL queries simultaneously, keyed by query"""
+        results = await asyncio.gather(*[
+            self.fetch_issues_async(jql, additional_fields) for jql in queries
+        ])
+        return dict(zip(queries, results))
+    
+    async def fetch_worklogs_async(self, issue_key: str) -> List[Dict[str, Any]]:
+        """Fetch every worklog of an issue, following the worklog pagination"""
+        path = f"/rest/api/3/issue/{issue_key}/worklog"
+        worklogs = []
+        start_at = 0
+        
+        while True:
+            data = await self._get_json(path, {'startAt': start_at, 'maxResults': 1000})
+            page = data.get('worklogs', [])
+            worklogs.extend(page)
+            
+            start_at += len(page)
+            if not page or start_at >= data.get('total', 0):
+                break
+        
+        return worklogs
+    
+    async def fetch_worklogs_for_issues(self, issue_keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch worklogs for many issues concurrently, keyed by issue key"""
+        results = await asyncio.gather(*[
+            self.fetch_worklogs_async(key) for key in issue_keys
+        ])
+        return dict(zip(issue_keys, results))
+    
+    async def get_all_fields_async(self) -> List[Dict[str, Any]]:
+        """Get all available fields in JIRA instance"""
+        try:
+            return await self._get_json('/rest/api/3/field')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching fields: {str(e) or type(e).__name__}")
+            return []
+
+async def run_queries(config: JiraConfig, queries: List[str], concurrency: Optional[int] = None):
+    """Fetch all queries on one event loop and print a summary for each"""
+    async with AsyncJiraDataAggregator(config, concurrency) as aggregator:
+        if not await aggregator.test_connection_async():
+            return False
+        
+        results = await aggregator.fetch_many(queries)
+    
+    stats = aggregator.stats
+    logger.info(f"HTTP requests: {stats['requests']}, retries: {stats['retries']}, "
+                f"throttled: {stats['throttled']}, received: {stats['bytes'] / 1024:.0f} KiB")
+    
+    for jql, issues in results.items():
+        print(f"\nJQL: {jql}")
+        if not issues:
+            logger.warning("No issues found matching the query")
+            continue
+        
+        detailed_df = aggregator.create_summary_report(issues)
+        summary_df = aggregator.create_aggregated_summary(detailed_df)
+        aggregator.print_summary_console(summary_df)
+    
+    return True
+
+def main():
+    """Main function to run several JQL aggregations concurrently"""
+    parser = argparse.ArgumentParser(description='Async JIRA Data Aggregator')
+    parser.add_argument('--config', '-c', help='Configuration file path', default='config.json')
+    parser.add_argument('--jql', '-j', action='append', help='JQL query to aggregate (repeatable)')
+    parser.add_argument('--concurrency', type=int, help='Maximum requests in flight (defaults to config workers)')
+    parser.add_argument('--use-env', action='store_true', help='Use environment variables for configuration')
+    
+    args = parser.parse_args()
+    
+    try:
+        if args.use_env:
+            config = JiraConfig.from_env()
+        else:
+            config = JiraConfig.from_file(args.config)
+        
+        if not all([config.base_url, config.username, config.api_token]):
+            logger.error("Missing required configuration. Please provide base_url, username, and api_token")
+            sys.exit(1)
+        
+        queries = args.jql or [config.default_jql]
+        if not asyncio.run(run_queries(config, queries, args.concurrency)):
+            logger.error("Failed to connect to JIRA. Please check your configuration.")
+            sys.exit(1)
+    
+    except FileNotFoundError as e:
+        logger.error(f"Configuration file not found: {e}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
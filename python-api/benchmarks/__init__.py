@@ -0,0 +1,4 @@
+"""
+Benchmarks for the JIRA data aggregator
+Run from the python-api directory, e.g. python -m benchmarks.flatten
+"""
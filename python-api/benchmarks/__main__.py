@@ -0,0 +1,39 @@
+"""
+Benchmark suite entry point
+
+    python -m benchmarks bench [--sizes 1000,10000] [--baseline FILE] [--update-baseline]
+    python -m benchmarks compare RESULTS BASELINE [--threshold 0.25]
+"""
+
+import argparse
+import sys
+
+from benchmarks.suite import (
+    DEFAULT_MIN_SECONDS, DEFAULT_THRESHOLD, add_bench_arguments, bench, compare, load_json, print_comparison
+)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='JIRA aggregator benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    bench_parser = commands.add_parser('bench', help='Time every pipeline stage at several data sizes')
+    add_bench_arguments(bench_parser)
+    
+    compare_parser = commands.add_parser('compare', help='Compare two results files')
+    compare_parser.add_argument('results', help='Results JSON')
+    compare_parser.add_argument('baseline', help='Baseline results JSON')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='Relative slowdown reported as a regression (default: %(default)s)')
+    compare_parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                                help='Ignore slowdowns smaller than this many seconds (default: %(default)s)')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'bench':
+        return bench(args)
+    
+    rows = compare(load_json(args.results), load_json(args.baseline), args.threshold, args.min_seconds)
+    return 1 if print_comparison(rows, args.threshold) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
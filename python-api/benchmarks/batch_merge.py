@@ -0,0 +1,65 @@
+"""
+Benchmark: merging many workbooks with ExcelBatchAggregator
+
+    python -m benchmarks.batch_merge --files 8 --rows 20000
+
+Every workbook repeats the same issue keys (newer files win) and has some
+rows with a blank key. The merged table is checked: each keyed issue is
+kept once, from the newest file, and every blank-key row is kept, since
+their numbered placeholder keys (ISSUE-n) collide across files.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from excel_data_aggregator import ExcelBatchAggregator
+
+def write_workbooks(directory: str, files: int, rows: int, blank_every: int):
+    """Workbooks drop_0.xlsx.. with shared keys; returns (keyed issues, blank-key rows)"""
+    blank_rows = 0
+    for number in range(files):
+        keys = [None if i % blank_every == 1 else f"PROJ-{i}" for i in range(rows)]
+        blank_rows += keys.count(None)
+        pd.DataFrame({
+            'Key': keys,
+            'Summary': [f"Issue {i}" for i in range(rows)],
+            'Assignee': [f"Developer {(i + number) % 7}" for i in range(rows)],
+            'Time Spent': [f"{number + 1}h" for _ in range(rows)]
+        }).to_excel(os.path.join(directory, f"drop_{number}.xlsx"), index=False)
+        # Modification times decide which copy of an issue wins
+        os.utime(os.path.join(directory, f"drop_{number}.xlsx"), (1_000_000 + number, 1_000_000 + number))
+    keyed = len({i for i in range(rows) if i % blank_every != 1})
+    return keyed, blank_rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark merging Excel workbooks')
+    parser.add_argument('--files', type=int, default=8, help='Workbooks to merge')
+    parser.add_argument('--rows', type=int, default=20_000, help='Rows per workbook')
+    parser.add_argument('--blank-every', type=int, default=50, help='One row in this many has a blank key')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        keyed, blank_rows = write_workbooks(tmp, args.files, args.rows, args.blank_every)
+        files = [os.path.join(tmp, f"drop_{number}.xlsx") for number in range(args.files)]
+        aggregator = ExcelBatchAggregator(files, workers=args.workers, mapping_cache=None)
+        
+        start = time.perf_counter()
+        detailed_df = aggregator.build_detailed_df()
+        elapsed = time.perf_counter() - start
+    
+    keyed_df = detailed_df[~aggregator.generated_keys]
+    assert len(keyed_df) == keyed and keyed_df['Issue Key'].is_unique, 'keyed issues must be kept once'
+    assert (keyed_df['Source File'].str.endswith(f"drop_{args.files - 1}.xlsx")).all(), 'newest copy must win'
+    assert int(aggregator.generated_keys.sum()) == blank_rows, 'blank-key rows must all be kept'
+    
+    print(f"Workbooks:   {args.files} x {args.rows:,} rows")
+    print(f"Merged:      {len(detailed_df):,} issues ({blank_rows:,} without a key)")
+    print(f"Time:        {elapsed:.3f}s")
+
+if __name__ == "__main__":
+    main()
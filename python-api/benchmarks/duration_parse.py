@@ -0,0 +1,89 @@
+"""
+Benchmark: per-cell time value parsing (the previous
+ExcelDataAggregator._parse_time_value applied row by row) vs. the
+vectorised duration_parser.parse_duration_series
+
+    python -m benchmarks.duration_parse --rows 300000
+"""
+
+import argparse
+import random
+
+import pandas as pd
+
+from benchmarks.flatten import best_of
+from duration_parser import parse_duration_series
+
+# Formats both implementations understand, so the results can be compared
+SIMPLE_VALUES = ['8h', '2.5h', '1d', '1.5d', '1w', '4:30', '0:45', '3', '7.25', '-2h', '-1.5d', '+3h',
+                 '', 'n/a', None, 6, 2.5]
+# JIRA's composite display format, which the previous parser read as 0
+COMPOSITE_VALUES = ['1d 4h', '2h 30m', '1w 2d', '3h 15m', '45m']
+
+def legacy_parse_time_value(value) -> float:
+    """The previous implementation, kept verbatim for comparison"""
+    if pd.isna(value) or value == '' or value is None:
+        return 0.0
+    
+    try:
+        if isinstance(value, (int, float)):
+            return float(value)
+        
+        str_value = str(value).strip().lower()
+        
+        if str_value in ['', 'null', 'none', 'n/a', '-']:
+            return 0.0
+        
+        if 'h' in str_value:
+            return float(str_value.replace('h', '').replace('hours', '').replace('hour', '').strip())
+        elif 'd' in str_value:
+            return float(str_value.replace('d', '').replace('days', '').replace('day', '').strip()) * 8
+        elif 'w' in str_value:
+            return float(str_value.replace('w', '').replace('weeks', '').replace('week', '').strip()) * 40
+        elif ':' in str_value:
+            parts = str_value.split(':')
+            hours = float(parts[0])
+            minutes = float(parts[1]) / 60 if len(parts) > 1 else 0
+            return hours + minutes
+        else:
+            return float(str_value)
+    
+    except (ValueError, TypeError):
+        return 0.0
+
+def make_values(rows: int, composite_share: float, seed: int = 0) -> pd.Series:
+    """An object column mixing numbers, unit strings, clock values and blanks"""
+    rng = random.Random(seed)
+    values = [
+        rng.choice(COMPOSITE_VALUES) if rng.random() < composite_share else rng.choice(SIMPLE_VALUES)
+        for _ in range(rows)
+    ]
+    return pd.Series(values, dtype=object)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark time value parsing')
+    parser.add_argument('--rows', type=int, default=300_000, help='Number of cells to parse')
+    parser.add_argument('--composite-share', type=float, default=0.2,
+                        help='Fraction of composite values like "1d 4h" (default: 0.2)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation (best is reported)')
+    args = parser.parse_args()
+    
+    values = make_values(args.rows, args.composite_share)
+    
+    legacy_time, expected = best_of(args.repeat, values.map, legacy_parse_time_value)
+    vectorised_time, actual = best_of(args.repeat, parse_duration_series, values)
+    
+    # Both must agree wherever the old parser understood the format
+    simple = ~values.isin(COMPOSITE_VALUES)
+    pd.testing.assert_series_equal(actual[simple], expected[simple].astype(float), check_names=False)
+    composite = actual[~simple]
+    
+    print(f"Rows:        {args.rows:,}")
+    print(f"Per-cell:    {legacy_time:.3f}s")
+    print(f"Vectorised:  {vectorised_time:.3f}s")
+    print(f"Speedup:     {legacy_time / vectorised_time:.2f}x")
+    print(f"Composite values parsed: {composite.gt(0).sum():,} of {len(composite):,} "
+          f"(previously read as 0)")
+
+if __name__ == "__main__":
+    main()
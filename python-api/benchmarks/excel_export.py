@@ -0,0 +1,70 @@
+"""
+Benchmark: pandas ExcelWriter vs. write-only streaming export
+in JiraDataAggregator.export_to_excel
+
+    python -m benchmarks.excel_export --issues 200000
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from jira_data_aggregator import JiraConfig, JiraDataAggregator
+from benchmarks.synthetic import make_issues
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_export(issues: int, streaming: bool) -> dict:
+    """Build the report frames and export them once, reporting time and memory"""
+    aggregator = JiraDataAggregator(JiraConfig('https://example.invalid', 'bench', 'bench'))
+    detailed_df = aggregator.create_summary_report(make_issues(issues))
+    summary_df = aggregator.create_aggregated_summary(detailed_df)
+    rss_before = peak_rss_mb()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'report.xlsx')
+        start = time.perf_counter()
+        aggregator.export_to_excel(detailed_df, summary_df, filename, streaming)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(filename)
+    
+    return {
+        'seconds': elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'export_rss_growth_mb': peak_rss_mb() - rss_before,
+        'file_bytes': size
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Excel export modes')
+    parser.add_argument('--issues', type=int, default=200_000, help='Rows in the Detailed Issues sheet')
+    parser.add_argument('--mode', choices=['pandas', 'streaming'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.mode:
+        # Child process: run a single mode and report as JSON
+        print(json.dumps(run_export(args.issues, args.mode == 'streaming')))
+        return
+    
+    print(f"Issues: {args.issues:,}")
+    for mode in ('pandas', 'streaming'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.excel_export', '--issues', str(args.issues), '--mode', mode],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<10} {result['seconds']:>8.2f}s | peak RSS {result['peak_rss_mb']:>7.1f} MB | "
+              f"export growth {result['export_rss_growth_mb']:>7.1f} MB | {result['file_bytes']:,} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: per-issue IssueSummary extraction vs. columnar flattening
+in JiraDataAggregator.create_summary_report
+
+    python -m benchmarks.flatten --issues 100000
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import pandas as pd
+
+from jira_data_aggregator import JiraConfig, JiraDataAggregator
+from benchmarks.synthetic import make_issues
+
+@dataclass
+class IssueSummary:
+    """Data structure for issue summary metrics"""
+    key: str
+    summary: str
+    assignee: str
+    feature_link: str
+    estimated_hours: float
+    remaining_hours: float
+    spent_hours: float
+    status: str
+    priority: str
+    issue_type: str
+    created: str
+    updated: str
+
+def extract_issue_summary(aggregator: JiraDataAggregator, issue: Dict[str, Any]) -> IssueSummary:
+    """The previous JiraDataAggregator.extract_issue_summary, kept for comparison"""
+    fields = issue.get('fields', {})
+    
+    # Extract assignee
+    assignee = fields.get('assignee')
+    assignee_name = assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
+    
+    # Time values in seconds, convert to hours
+    estimated_seconds = (
+        fields.get('timeoriginalestimate', 0) or 
+        fields.get('aggregatetimeoriginalestimate', 0) or 0
+    )
+    remaining_seconds = (
+        fields.get('timeestimate', 0) or 
+        fields.get('aggregatetimeestimate', 0) or 0
+    )
+    spent_seconds = (
+        fields.get('timespent', 0) or 
+        fields.get('aggregatetimespent', 0) or 0
+    )
+    
+    # Convert seconds to hours
+    estimated_hours = estimated_seconds / 3600 if estimated_seconds else 0
+    remaining_hours = remaining_seconds / 3600 if remaining_seconds else 0
+    spent_hours = spent_seconds / 3600 if spent_seconds else 0
+    
+    # Extract feature link (Epic Link or related issues)
+    feature_link = aggregator._extract_feature_link(fields)
+    
+    return IssueSummary(
+        key=issue.get('key', ''),
+        summary=fields.get('summary', ''),
+        assignee=assignee_name,
+        feature_link=feature_link,
+        estimated_hours=estimated_hours,
+        remaining_hours=remaining_hours,
+        spent_hours=spent_hours,
+        status=fields.get('status', {}).get('name', ''),
+        priority=fields.get('priority', {}).get('name', ''),
+        issue_type=fields.get('issuetype', {}).get('name', ''),
+        created=fields.get('created', ''),
+        updated=fields.get('updated', '')
+    )
+
+def per_issue_report(aggregator: JiraDataAggregator, issues) -> pd.DataFrame:
+    """The previous implementation: IssueSummary per issue, then dicts, then a DataFrame"""
+    summaries = [extract_issue_summary(aggregator, issue) for issue in issues]
+    return pd.DataFrame([
+        {
+            'Issue Key': summary.key,
+            'Summary': summary.summary,
+            'Assignee': summary.assignee,
+            'Feature Link': summary.feature_link,
+            'Estimated Hours': summary.estimated_hours,
+            'Remaining Hours': summary.remaining_hours,
+            'Spent Hours': summary.spent_hours,
+            'Status': summary.status,
+            'Priority': summary.priority,
+            'Issue Type': summary.issue_type,
+            'Created': summary.created,
+            'Updated': summary.updated
+        }
+        for summary in summaries
+    ])
+
+def best_of(repeat: int, func, *args):
+    """Best wall time over `repeat` runs, plus the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark issue flattening')
+    parser.add_argument('--issues', type=int, default=100_000, help='Number of synthetic issues')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation (best is reported)')
+    args = parser.parse_args()
+    
+    aggregator = JiraDataAggregator(JiraConfig('https://example.invalid', 'bench', 'bench'))
+    issues = make_issues(args.issues)
+    
+    per_issue_time, expected = best_of(args.repeat, per_issue_report, aggregator, issues)
+    columnar_time, actual = best_of(args.repeat, aggregator.create_summary_report, issues)
+    
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    
+    print(f"Issues:      {args.issues:,}")
+    print(f"Per-issue:   {per_issue_time:.3f}s")
+    print(f"Columnar:    {columnar_time:.3f}s")
+    print(f"Speedup:     {per_issue_time / columnar_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
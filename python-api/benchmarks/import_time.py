@@ -0,0 +1,76 @@
+"""
+Benchmark: cold start of the CLI entry points
+
+    python -m benchmarks.import_time --repeat 5
+
+Imports each module in a fresh interpreter (python -X importtime) and reports
+its import time, the wall time of the whole process and which heavy
+libraries it loaded. Exits with status 1 if a module expected to start
+without pandas/numpy/openpyxl loads them.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'pyarrow')
+
+# Modules cron jobs and field inspection load without building DataFrames
+LIGHT_MODULES = (
+    'jira_config', 'jira_http', 'field_projection', 'field_inspector', 'feature_resolver',
+    'issue_store', 'worklog_store', 'worklog_fetcher', 'report_export', 'run_metrics',
+    'jira_data_aggregator', 'async_jira_aggregator'
+)
+
+# Every code path of these builds DataFrames, so they import pandas up front
+DATAFRAME_MODULES = ('excel_data_aggregator', 'gemini_jira_data_aggregator')
+
+def import_once(module: str) -> Tuple[float, float, List[str]]:
+    """Import time and process wall time in seconds, plus the heavy modules loaded"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            check=True, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    
+    # Lines read "import time: self [us] | cumulative | name"; the module's own line holds its total
+    cumulative: Optional[int] = None
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1])
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return (cumulative or 0) / 1e6, wall, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI module import times')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per module (best is reported)')
+    parser.add_argument('modules', nargs='*', help='Modules to import (default: the entry points)')
+    args = parser.parse_args()
+    
+    modules = args.modules or list(LIGHT_MODULES + DATAFRAME_MODULES)
+    
+    # Interpreter startup alone, for reference
+    baseline = min(import_once('sys')[1] for _ in range(args.repeat))
+    print(f"Interpreter startup: {baseline * 1000:.0f} ms\n")
+    print(f"{'Module':<30} {'Import':>9} {'Process':>9}  Heavy modules loaded")
+    
+    unexpected = []
+    for module in modules:
+        runs = [import_once(module) for _ in range(args.repeat)]
+        import_seconds = min(run[0] for run in runs)
+        wall = min(run[1] for run in runs)
+        loaded = runs[-1][2]
+        print(f"{module:<30} {import_seconds * 1000:>6.0f} ms {wall * 1000:>6.0f} ms  {', '.join(loaded) or '-'}")
+        if loaded and module in LIGHT_MODULES:
+            unexpected.append(module)
+    
+    if unexpected:
+        print(f"\nLoaded heavy modules at import: {', '.join(unexpected)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
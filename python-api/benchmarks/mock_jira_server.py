@@ -0,0 +1,264 @@
+"""
+Mock JIRA server
+A local stand-in for the JIRA Cloud REST API, serving a SyntheticJira
+dataset so fetching, aggregation and export can be measured without a live
+instance:
+
+    python -m benchmarks.mock_jira_server --issues 100000 --port 8080 --latency 0.05
+
+Serves /rest/api/3/search (any JQL matches the whole dataset except
+`key in (...)`, which looks issues up), /field, /myself and
+/issue/{key}/worklog, with configurable latency, a page-size cap and a
+share of 429 responses. In benchmarks use it in-process:
+
+    with MockJiraServer(SyntheticJira(10_000), latency=0.02) as server:
+        aggregator = JiraDataAggregator(server.jira_config(workers=8))
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import SyntheticJira
+
+KEY_IN_PATTERN = re.compile(r'^\s*(?:key|issuekey)\s+in\s*\(([^)]*)\)', re.IGNORECASE)
+WORKLOG_PATH_PATTERN = re.compile(r'^/rest/api/3/issue/([^/]+)/worklog$')
+
+class _Server(ThreadingHTTPServer):
+    # The socketserver default listen backlog of 5 makes bursts of parallel
+    # connections wait for SYN retransmits (a second or more each)
+    request_queue_size = 1024
+    daemon_threads = True
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like JIRA
+    # Headers and body go out as separate writes; with Nagle's algorithm the
+    # body waits for the client's delayed ACK (~40 ms per response)
+    disable_nagle_algorithm = True
+    mock: 'MockJiraServer'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        self.mock.handle(self, url.path, params)
+
+class MockJiraServer:
+    """Threaded HTTP server answering JIRA REST calls from a SyntheticJira dataset"""
+    
+    def __init__(self, dataset: SyntheticJira, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, page_cap: int = 100,
+                 throttle_rate: float = 0.0, retry_after: float = 1.0,
+                 worklog_page_cap: int = 5000, compress: bool = True, seed: int = 0):
+        self.dataset = dataset
+        self.latency = latency  # Seconds added to every response
+        self.jitter = jitter  # Up to this many further seconds, uniformly random
+        self.page_cap = page_cap  # Search results per page, whatever maxResults asks for
+        self.throttle_rate = throttle_rate  # Share of requests answered with 429
+        self.retry_after = retry_after
+        self.worklog_page_cap = worklog_page_cap
+        self.compress = compress  # gzip responses when the client accepts it
+        self.stats = {'requests': 0, 'throttled': 0, 'bytes_sent': 0, 'issues_served': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        
+        handler = type('Handler', (_Handler,), {'mock': self})
+        self.httpd = _Server((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def jira_config(self, **overrides):
+        """A JiraConfig pointing at this server"""
+        from jira_data_aggregator import JiraConfig
+        
+        settings = {'base_url': self.url, 'username': 'bench', 'api_token': 'bench',
+                    'epic_link_field': self.dataset.epic_link_field}
+        settings.update(overrides)
+        return JiraConfig(**settings)
+    
+    def start(self) -> 'MockJiraServer':
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+    
+    def handle(self, request: BaseHTTPRequestHandler, path: str, params: Dict[str, str]):
+        """Answer one request: delay, maybe throttle, then route"""
+        self._count('requests')
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            throttled = self._rng.random() < self.throttle_rate
+        if delay:
+            time.sleep(delay)
+        
+        if throttled:
+            self._count('throttled')
+            self._send(request, 429, {'errorMessages': ['Rate limit exceeded']},
+                       {'Retry-After': f"{self.retry_after:g}"})
+            return
+        
+        worklog_match = WORKLOG_PATH_PATTERN.match(path)
+        if path == '/rest/api/3/search':
+            status, body = self.search(params)
+        elif worklog_match:
+            status, body = self.issue_worklogs(worklog_match.group(1), params)
+        elif path == '/rest/api/3/field':
+            status, body = 200, self.fields()
+        elif path == '/rest/api/3/myself':
+            status, body = 200, {'accountId': 'bench', 'displayName': 'Benchmark User', 'timeZone': 'UTC'}
+        else:
+            status, body = 404, {'errorMessages': [f"No mock for {path}"]}
+        self._send(request, status, body)
+    
+    def _send(self, request: BaseHTTPRequestHandler, status: int, body: Any,
+              headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(body, separators=(',', ':')).encode()
+        gzipped = self.compress and 'gzip' in request.headers.get('Accept-Encoding', '')
+        if gzipped:
+            payload = gzip.compress(payload, compresslevel=6)
+        
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json;charset=UTF-8')
+        request.send_header('Content-Length', str(len(payload)))
+        if gzipped:
+            request.send_header('Content-Encoding', 'gzip')
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+        self._count('bytes_sent', len(payload))
+    
+    def search(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        """/rest/api/3/search with startAt/maxResults paging and field filtering"""
+        start_at = int(params.get('startAt', 0))
+        max_results = min(int(params.get('maxResults', 50)), self.page_cap)
+        requested = params.get('fields', '*navigable')
+        fields = None if requested in ('*all', '*navigable') else [
+            name.strip() for name in requested.split(',') if name.strip() and not name.startswith('-')
+        ]
+        
+        key_match = KEY_IN_PATTERN.match(params.get('jql', ''))
+        if key_match:
+            keys = [key.strip().strip('"\'') for key in key_match.group(1).split(',') if key.strip()]
+            found = {key: self.dataset.issue(key, fields) for key in keys}
+            missing = [key for key, issue in found.items() if issue is None]
+            if missing and params.get('validateQuery', 'strict') == 'strict':
+                return 400, {'errorMessages': [
+                    f"An issue with key '{missing[0]}' does not exist for field 'key'."
+                ]}
+            matches = [issue for issue in found.values() if issue is not None]
+            issues = matches[start_at:start_at + max_results]
+            total = len(matches)
+        else:
+            issues = self.dataset.issues(start_at, start_at + max_results, fields)
+            total = self.dataset.issue_count
+        
+        self._count('issues_served', len(issues))
+        return 200, {'startAt': start_at, 'maxResults': max_results, 'total': total, 'issues': issues}
+    
+    def issue_worklogs(self, key: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        """/rest/api/3/issue/{key}/worklog with startAt/maxResults paging"""
+        if self.dataset.issue(key, []) is None:
+            return 404, {'errorMessages': ['Issue does not exist or you do not have permission to see it.']}
+        
+        worklogs = self.dataset.worklogs(key)
+        start_at = int(params.get('startAt', 0))
+        max_results = min(int(params.get('maxResults', 5000)), self.worklog_page_cap)
+        return 200, {
+            'startAt': start_at,
+            'maxResults': max_results,
+            'total': len(worklogs),
+            'worklogs': worklogs[start_at:start_at + max_results]
+        }
+    
+    def fields(self) -> Any:
+        """/rest/api/3/field: the system fields the aggregator reads plus the Epic Link"""
+        system = [
+            ('summary', 'Summary', 'string'), ('status', 'Status', 'status'),
+            ('assignee', 'Assignee', 'user'), ('priority', 'Priority', 'priority'),
+            ('issuetype', 'Issue Type', 'issuetype'), ('created', 'Created', 'datetime'),
+            ('updated', 'Updated', 'datetime'), ('parent', 'Parent', 'issuelink'),
+            ('issuelinks', 'Linked Issues', 'array'), ('worklog', 'Log Work', 'array'),
+            ('timetracking', 'Time tracking', 'timetracking'),
+            ('timeoriginalestimate', 'Original Estimate', 'number'),
+            ('timeestimate', 'Remaining Estimate', 'number'),
+            ('timespent', 'Time Spent', 'number'),
+            ('aggregatetimeoriginalestimate', 'Σ Original Estimate', 'number'),
+            ('aggregatetimeestimate', 'Σ Remaining Estimate', 'number'),
+            ('aggregatetimespent', 'Σ Time Spent', 'number')
+        ]
+        definitions = [
+            {'id': field_id, 'key': field_id, 'name': name, 'custom': False, 'schema': {'type': field_type}}
+            for field_id, name, field_type in system
+        ]
+        definitions.append({
+            'id': self.dataset.epic_link_field,
+            'key': self.dataset.epic_link_field,
+            'name': 'Epic Link',
+            'custom': True,
+            'schema': {'type': 'any', 'custom': 'com.pyxis.greenhopper.jira:gh-epic-link'}
+        })
+        return definitions
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic JIRA instance for benchmarks')
+    parser.add_argument('--issues', type=int, default=100_000, help='Issues matching every search (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0, help='Dataset seed')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many further random seconds per response')
+    parser.add_argument('--page-cap', type=int, default=100, help='Search results per page at most (default: 100)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of requests answered with 429 (e.g. 0.02)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429 responses')
+    parser.add_argument('--no-compress', action='store_true', help='Never gzip responses')
+    args = parser.parse_args()
+    
+    server = MockJiraServer(
+        SyntheticJira(args.issues, args.seed), args.host, args.port, args.latency, args.jitter,
+        args.page_cap, args.throttle_rate, args.retry_after, compress=not args.no_compress, seed=args.seed
+    )
+    print(f"Mock JIRA with {args.issues:,} issues at {server.url} (Ctrl+C to stop)")
+    print(f"  JIRA_BASE_URL={server.url} JIRA_USERNAME=bench JIRA_API_TOKEN=bench "
+          f"python jira_data_aggregator.py --use-env --console-only", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\nServed {server.stats['requests']:,} requests ({server.stats['throttled']:,} throttled), "
+              f"{server.stats['issues_served']:,} issues, {server.stats['bytes_sent'] / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+End-to-end benchmark suite for the aggregator pipeline
+
+    python -m benchmarks bench --sizes 1000,10000,50000
+    python -m benchmarks bench --baseline benchmarks/baseline.json
+    python -m benchmarks compare bench_results.json benchmarks/baseline.json
+
+Times each stage separately at every size: fetch (JiraDataAggregator.fetch_issues
+against the mock JIRA server), extract (create_summary_report), aggregate
+(create_aggregated_summary), export (export_to_excel) and excel
+(ExcelDataAggregator.build_detailed_df on the exported report). Each size
+runs in its own subprocess so peak RSS is measured independently. Results
+are written as JSON; with a baseline, stages slower than the threshold are
+reported and the exit status is 1.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from benchmarks.excel_export import peak_rss_mb
+
+STAGES = ('fetch', 'extract', 'aggregate', 'export', 'excel')
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+DEFAULT_OUTPUT = 'bench_results.json'
+DEFAULT_THRESHOLD = 0.25  # Relative slowdown that counts as a regression
+DEFAULT_MIN_SECONDS = 0.02  # Smaller absolute differences are noise
+
+def timed(repeat: int, func, *args):
+    """Best wall time over `repeat` runs and the peak RSS growth of the first, plus the last result"""
+    best = float('inf')
+    rss_before = peak_rss_mb()
+    growth = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+        if growth is None:
+            growth = peak_rss_mb() - rss_before
+    return best, growth, result
+
+@contextlib.contextmanager
+def mock_jira(size: int, latency: float):
+    """
+    Mock JIRA server in a subprocess, so generating responses does not
+    compete with the client being measured for the GIL; yields its URL
+    """
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.mock_jira_server', '--issues', str(size),
+         '--port', '0', '--latency', str(latency)],
+        stdout=subprocess.PIPE, text=True
+    )
+    try:
+        # First line: "Mock JIRA with N issues at http://host:port (...)"
+        yield server.stdout.readline().split(' at ')[1].split()[0]
+    finally:
+        server.terminate()
+        server.wait()
+
+def run_size(size: int, stages: List[str], repeat: int, workers: int, latency: float) -> List[Dict[str, Any]]:
+    """Run the pipeline once per stage at one data size (in the child process)"""
+    from excel_data_aggregator import ExcelDataAggregator
+    from jira_data_aggregator import JiraConfig, JiraDataAggregator
+    
+    results = []
+    
+    def record(stage: str, seconds: float, growth: float, **extra):
+        results.append({
+            'size': size,
+            'stage': stage,
+            'seconds': round(seconds, 6),
+            'issues_per_second': round(size / seconds, 1) if seconds else None,
+            'rss_growth_mb': round(growth, 1),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            **extra
+        })
+    
+    with mock_jira(size, latency) as url:
+        aggregator = JiraDataAggregator(JiraConfig(url, 'bench', 'bench', workers=workers))
+        # The session is shared per configuration, so count only this run's requests
+        before = dict(aggregator.session.stats)
+        # Every stage after fetch needs its input, so fetch always runs
+        seconds, growth, issues = timed(repeat if 'fetch' in stages else 1, aggregator.fetch_issues, 'project = PROJ')
+        if 'fetch' in stages:
+            stats = {name: value - before[name] for name, value in aggregator.session.stats.items()}
+            record('fetch', seconds, growth, requests=stats['requests'] // repeat,
+                   bytes_received=stats['bytes'] // repeat)
+    
+    seconds, growth, detailed_df = timed(repeat, aggregator.create_summary_report, issues)
+    if 'extract' in stages:
+        record('extract', seconds, growth)
+    del issues
+    
+    seconds, growth, summary_df = timed(repeat, aggregator.create_aggregated_summary, detailed_df)
+    if 'aggregate' in stages:
+        record('aggregate', seconds, growth)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, 'report.xlsx')
+        if 'export' in stages or 'excel' in stages:
+            seconds, growth, _ = timed(repeat if 'export' in stages else 1,
+                                       aggregator.export_to_excel, detailed_df, summary_df, report)
+            if 'export' in stages:
+                record('export', seconds, growth, file_bytes=os.path.getsize(report))
+        
+        if 'excel' in stages:
+            excel = ExcelDataAggregator(report, sheet_name='Detailed Issues')
+            # The Excel aggregator reports progress on stdout
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                seconds, growth, _ = timed(repeat, excel.build_detailed_df)
+            record('excel', seconds, growth)
+    
+    return results
+
+def run_suite(sizes: List[int], stages: List[str], repeat: int, workers: int, latency: float) -> Dict[str, Any]:
+    """Run every size in its own subprocess and collect the results"""
+    results = []
+    for size in sizes:
+        print(f"Benchmarking {size:,} issues...", file=sys.stderr)
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.suite', '--child', str(size), '--stages', ','.join(stages),
+             '--repeat', str(repeat), '--workers', str(workers), '--latency', str(latency)],
+            check=True, stdout=subprocess.PIPE, text=True
+        ).stdout
+        results.extend(json.loads(output.strip().splitlines()[-1]))
+    
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'repeat': repeat, 'workers': workers, 'latency': latency},
+        'results': results
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            min_seconds: float = DEFAULT_MIN_SECONDS) -> List[Dict[str, Any]]:
+    """
+    Pair up (size, stage) results with the baseline; a stage regresses when
+    it is more than `threshold` slower and by more than `min_seconds`
+    """
+    previous = {(r['size'], r['stage']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        before = previous.get((result['size'], result['stage']))
+        if before is None:
+            continue
+        ratio = result['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+        rows.append({
+            'size': result['size'],
+            'stage': result['stage'],
+            'baseline_seconds': before['seconds'],
+            'seconds': result['seconds'],
+            'ratio': ratio,
+            'regressed': ratio > 1 + threshold and result['seconds'] - before['seconds'] > min_seconds
+        })
+    return rows
+
+def print_results(suite: Dict[str, Any]):
+    print(f"{'Size':>9} {'Stage':<10} {'Seconds':>9} {'Issues/s':>11} {'RSS growth':>11} {'Peak RSS':>10}")
+    for r in suite['results']:
+        rate = f"{r['issues_per_second']:,.0f}" if r['issues_per_second'] else '-'
+        print(f"{r['size']:>9,} {r['stage']:<10} {r['seconds']:>9.3f} {rate:>11} "
+              f"{r['rss_growth_mb']:>8.1f} MB {r['peak_rss_mb']:>7.1f} MB")
+
+def print_comparison(rows: List[Dict[str, Any]], threshold: float) -> bool:
+    """Print the comparison table; True if any stage regressed"""
+    if not rows:
+        print("\nNo stages in common with the baseline")
+        return False
+    
+    print(f"\nCompared with baseline (regression threshold {threshold:.0%}):")
+    print(f"{'Size':>9} {'Stage':<10} {'Baseline':>9} {'Current':>9} {'Change':>8}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regressed'] else ''
+        print(f"{row['size']:>9,} {row['stage']:<10} {row['baseline_seconds']:>9.3f} {row['seconds']:>9.3f} "
+              f"{(row['ratio'] - 1) * 100:>+7.1f}%{flag}")
+    
+    regressions = [row for row in rows if row['regressed']]
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed")
+    return bool(regressions)
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+def write_json(path: str, data: Dict[str, Any]):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def add_bench_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='Comma-separated issue counts (default: %(default)s)')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stages (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage (best is reported)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent page requests for fetch (default: 8)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Mock JIRA response latency in seconds')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT, help='Results JSON file (default: %(default)s)')
+    parser.add_argument('--baseline', '-b', help='Baseline results JSON to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the results to --baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slowdown reported as a regression (default: %(default)s)')
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help='Ignore slowdowns smaller than this many seconds (default: %(default)s)')
+
+def bench(args: argparse.Namespace) -> int:
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f"Unknown stages: {', '.join(sorted(unknown))} (choose from {', '.join(STAGES)})", file=sys.stderr)
+        return 2
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    
+    suite = run_suite(sizes, stages, args.repeat, args.workers, args.latency)
+    print_results(suite)
+    write_json(args.output, suite)
+    print(f"\nResults written to {args.output}")
+    
+    if args.baseline and args.update_baseline:
+        write_json(args.baseline, suite)
+        print(f"Baseline updated: {args.baseline}")
+    elif args.baseline:
+        rows = compare(suite, load_json(args.baseline), args.threshold, args.min_seconds)
+        if print_comparison(rows, args.threshold):
+            return 1
+    return 0
+
+def main():
+    # Child process: benchmark one size and report as JSON
+    parser = argparse.ArgumentParser(description=argparse.SUPPRESS)
+    parser.add_argument('--child', type=int, required=True)
+    parser.add_argument('--stages', required=True)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    print(json.dumps(run_size(args.child, args.stages.split(','), args.repeat, args.workers, args.latency)))
+
+if __name__ == "__main__":
+    main()
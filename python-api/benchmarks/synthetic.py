@@ -0,0 +1,319 @@
+"""
+Synthetic JIRA data
+Generates raw search-API issue JSON shaped like a real instance for benchmarks:
+make_issues builds a flat list in memory for single-stage benchmarks, and
+SyntheticJira generates a whole instance (hierarchy, links, worklogs) on
+demand for the mock JIRA server
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional
+
+def time_seconds(rng: random.Random) -> Optional[int]:
+    """A time tracking value in seconds; half are empty (None when never set, 0 when cleared)"""
+    return rng.choice([None, 0, rng.randrange(1, 80) * 1800, rng.randrange(1, 80) * 1800])
+
+def make_issues(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate `count` raw issues with a realistic mix of missing values"""
+    rng = random.Random(seed)
+    assignees = [f"Developer {i}" for i in range(200)]
+    epics = [f"EPIC-{i}" for i in range(count // 50 + 1)]
+    statuses = ['To Do', 'In Progress', 'In Review', 'Done']
+    priorities = ['Lowest', 'Low', 'Medium', 'High', 'Highest']
+    issue_types = ['Story', 'Task', 'Bug', 'Sub-task']
+    
+    issues = []
+    for i in range(count):
+        epic = rng.choice(epics) if rng.random() < 0.8 else None
+        links = []
+        if epic is None and rng.random() < 0.5:
+            links.append({
+                'type': {'name': 'Relates'},
+                'outwardIssue': {
+                    'key': rng.choice(epics),
+                    'fields': {'issuetype': {'name': 'Epic'}}
+                }
+            })
+        
+        issues.append({
+            'key': f"PROJ-{i + 1}",
+            'fields': {
+                'summary': f"Synthetic issue {i + 1}",
+                'status': {'name': rng.choice(statuses)},
+                'assignee': {'displayName': rng.choice(assignees)} if rng.random() < 0.9 else None,
+                'priority': {'name': rng.choice(priorities)},
+                'issuetype': {'name': rng.choice(issue_types)},
+                'created': '2024-01-15T09:00:00.000+0000',
+                'updated': '2024-01-20T15:30:00.000+0000',
+                'timeoriginalestimate': time_seconds(rng),
+                'timeestimate': time_seconds(rng),
+                'timespent': time_seconds(rng),
+                'aggregatetimeoriginalestimate': time_seconds(rng),
+                'aggregatetimeestimate': time_seconds(rng),
+                'aggregatetimespent': time_seconds(rng),
+                'customfield_10014': epic,
+                'issuelinks': links
+            }
+        })
+    
+    return issues
+
+# Issue link types as configured on a typical instance: (name, inward, outward)
+LINK_TYPES = [
+    ('Blocks', 'is blocked by', 'blocks'),
+    ('Relates', 'relates to', 'relates to'),
+    ('Cloners', 'is cloned by', 'clones'),
+    ('Duplicate', 'is duplicated by', 'duplicates')
+]
+
+STATUSES = [('To Do', 'new'), ('In Progress', 'indeterminate'), ('In Review', 'indeterminate'), ('Done', 'done')]
+PRIORITIES = ['Lowest', 'Low', 'Medium', 'High', 'Highest']
+
+class SyntheticJira:
+    """
+    A deterministic, lazily generated JIRA instance for load tests.
+    
+    The query result is PROJ-1..PROJ-<issue_count>; its stories, tasks and
+    bugs belong to EPIC-n issues (through `parent`, the classic Epic Link
+    field or only an issue link), which in turn mostly sit under FEAT-n
+    features, and about one in seven results is a sub-task of an earlier
+    result. Assignees follow a Zipf-like skew, issue links and worklogs a
+    long tail (some issues exceed the 20 worklogs JIRA embeds in search
+    results). Every issue is built from its own seed when requested, so
+    1M-issue datasets need no memory up front and repeat exactly.
+    """
+    
+    def __init__(self, issue_count: int, seed: int = 0, epic_link_field: str = 'customfield_10014',
+                 base_url: str = 'https://example.invalid'):
+        self.issue_count = issue_count
+        self.seed = seed
+        self.epic_link_field = epic_link_field
+        self.base_url = base_url
+        self.epic_count = max(issue_count // 50, 1)
+        self.feature_count = max(issue_count // 2000, 1)
+        
+        assignee_count = max(issue_count // 200, 20)
+        self.assignees = [
+            {'accountId': f"user-{i}", 'displayName': f"Developer {i}", 'active': True, 'timeZone': 'UTC'}
+            for i in range(assignee_count)
+        ]
+        # Zipf-like: a few people carry many issues, most carry a handful
+        cumulative = 0.0
+        self._assignee_weights = []
+        for rank in range(assignee_count):
+            cumulative += 1 / (rank + 1) ** 1.1
+            self._assignee_weights.append(cumulative)
+        
+        self._start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self._span_minutes = 2 * 365 * 24 * 60  # Issues are created over two years
+    
+    # Independent random streams per issue, so generating one field group
+    # never shifts the values of another
+    STREAMS = ('fields', 'type', 'hierarchy', 'status', 'worklogs', 'links')
+    PREFIXES = ('PROJ', 'EPIC', 'FEAT')
+    
+    def _rng(self, prefix: str, number: int, stream: str) -> random.Random:
+        code = (self.seed * len(self.STREAMS) + self.STREAMS.index(stream)) * len(self.PREFIXES) + self.PREFIXES.index(prefix)
+        return random.Random(code * 100_000_007 + number)
+    
+    def keys(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Keys of the query result, in search order"""
+        stop = self.issue_count if stop is None else min(stop, self.issue_count)
+        return [f"PROJ-{n}" for n in range(start + 1, stop + 1)]
+    
+    def issues(self, start: int = 0, stop: Optional[int] = None, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Search results for offsets [start, stop), limited to `fields` (None = all)"""
+        return [self.issue(key, fields) for key in self.keys(start, stop)]
+    
+    def issue(self, key: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """An issue in search-result shape, or None if the key does not exist"""
+        prefix, _, number = key.partition('-')
+        if not number.isdigit():
+            return None
+        number = int(number)
+        limit = {'PROJ': self.issue_count, 'EPIC': self.epic_count, 'FEAT': self.feature_count}.get(prefix, 0)
+        if not 1 <= number <= limit:
+            return None
+        
+        return {
+            'id': str(self._issue_id(prefix, number)),
+            'key': key,
+            'self': f"{self.base_url}/rest/api/3/issue/{self._issue_id(prefix, number)}",
+            'fields': self._fields(prefix, number, fields)
+        }
+    
+    def _issue_id(self, prefix: str, number: int) -> int:
+        return {'PROJ': 100_000_000, 'EPIC': 10_000_000, 'FEAT': 1_000_000}[prefix] + number
+    
+    def _issue_type(self, prefix: str, number: int) -> str:
+        if prefix != 'PROJ':
+            return 'Epic' if prefix == 'EPIC' else 'Feature'
+        roll = self._rng(prefix, number, 'type').random()
+        # The first results cannot be sub-tasks: they need an earlier parent
+        if roll < 0.15 and number > 10:
+            return 'Sub-task'
+        return 'Story' if roll < 0.6 else 'Task' if roll < 0.85 else 'Bug'
+    
+    def _status(self, prefix: str, number: int):
+        return self._rng(prefix, number, 'status').choice(STATUSES)
+    
+    def _stub(self, key: str) -> Dict[str, Any]:
+        """Linked-issue summary as embedded in `parent` and issue links"""
+        prefix, _, number = key.partition('-')
+        number = int(number)
+        status, category = self._status(prefix, number)
+        issue_type = self._issue_type(prefix, number)
+        issue_id = self._issue_id(prefix, number)
+        return {
+            'id': str(issue_id),
+            'key': key,
+            'self': f"{self.base_url}/rest/api/3/issue/{issue_id}",
+            'fields': {
+                'summary': f"{issue_type} {key} summary text",
+                'status': {
+                    'self': f"{self.base_url}/rest/api/3/status/{STATUSES.index((status, category)) + 1}",
+                    'name': status,
+                    'id': str(STATUSES.index((status, category)) + 1),
+                    'statusCategory': {'key': category, 'colorName': 'blue-gray', 'name': status}
+                },
+                'priority': {'self': f"{self.base_url}/rest/api/3/priority/3", 'name': 'Medium', 'id': '3'},
+                'issuetype': {
+                    'self': f"{self.base_url}/rest/api/3/issuetype/{len(issue_type)}",
+                    'id': str(len(issue_type)),
+                    'name': issue_type,
+                    'subtask': issue_type == 'Sub-task',
+                    'iconUrl': f"{self.base_url}/images/icons/issuetypes/{issue_type.lower()}.svg",
+                    'hierarchyLevel': {'Sub-task': -1, 'Epic': 1, 'Feature': 2}.get(issue_type, 0)
+                }
+            }
+        }
+    
+    def _fields(self, prefix: str, number: int, wanted: Optional[List[str]]) -> Dict[str, Any]:
+        """Build only the wanted fields (None = all); links and worklogs dominate the cost"""
+        def wants(name: str) -> bool:
+            return wanted is None or name in wanted
+        
+        rng = self._rng(prefix, number, 'fields')
+        issue_type = self._issue_type(prefix, number)
+        status, category = self._status(prefix, number)
+        created = self._start + timedelta(minutes=self._span_minutes * number // max(self.issue_count, 1))
+        updated = created + timedelta(days=rng.randrange(0, 60), minutes=rng.randrange(0, 1440))
+        
+        assigned = rng.random() < 0.9
+        fields = {
+            'summary': f"{issue_type} {prefix}-{number}: synthetic work item",
+            'status': {'name': status, 'statusCategory': {'key': category}},
+            'assignee': rng.choices(self.assignees, cum_weights=self._assignee_weights)[0] if assigned else None,
+            'priority': {'name': rng.choice(PRIORITIES)},
+            'issuetype': {'name': issue_type, 'subtask': issue_type == 'Sub-task'},
+            'created': created.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+            'updated': updated.strftime('%Y-%m-%dT%H:%M:%S.000+0000'),
+            'timeoriginalestimate': time_seconds(rng),
+            'timeestimate': time_seconds(rng),
+            'timespent': time_seconds(rng),
+            'aggregatetimeoriginalestimate': time_seconds(rng),
+            'aggregatetimeestimate': time_seconds(rng),
+            'aggregatetimespent': time_seconds(rng)
+        }
+        fields['timetracking'] = {
+            'originalEstimateSeconds': fields['timeoriginalestimate'] or 0,
+            'remainingEstimateSeconds': fields['timeestimate'] or 0,
+            'timeSpentSeconds': fields['timespent'] or 0
+        }
+        
+        parent, epic_link, epic_only_link = self._hierarchy(prefix, number, issue_type)
+        fields['parent'] = self._stub(parent) if parent and wants('parent') else None
+        fields[self.epic_link_field] = epic_link
+        
+        if wants('issuelinks'):
+            link_rng = self._rng(prefix, number, 'links')
+            links = [self._link(link_rng, 'Relates', epic_only_link)] if epic_only_link else []
+            # Long tail of ordinary links: most issues have none, a few have many
+            if link_rng.random() < 0.45:
+                for _ in range(min(1 + int(link_rng.expovariate(0.5)), 25)):
+                    target = f"PROJ-{link_rng.randrange(self.issue_count) + 1}"
+                    links.append(self._link(link_rng, link_rng.choice(LINK_TYPES)[0], target))
+            fields['issuelinks'] = links
+        
+        if wants('worklog'):
+            worklogs = self.worklogs(f"{prefix}-{number}")
+            fields['worklog'] = {'startAt': 0, 'maxResults': 20, 'total': len(worklogs), 'worklogs': worklogs[:20]}
+        
+        if wanted is not None:
+            fields = {name: value for name, value in fields.items() if name in wanted}
+        return fields
+    
+    def _hierarchy(self, prefix: str, number: int, issue_type: str):
+        """(parent key, classic Epic Link, epic reachable only through an issue link)"""
+        rng = self._rng(prefix, number, 'hierarchy')
+        if prefix == 'FEAT':
+            return None, None, None
+        if prefix == 'EPIC':
+            return (f"FEAT-{rng.randrange(self.feature_count) + 1}" if rng.random() < 0.8 else None), None, None
+        if issue_type == 'Sub-task':
+            # Walk back to the nearest earlier result that can carry sub-tasks
+            candidate = number - 1 - rng.randrange(min(number - 1, 200))
+            while candidate > 1 and self._issue_type('PROJ', candidate) == 'Sub-task':
+                candidate -= 1
+            return f"PROJ-{candidate}", None, None
+        
+        epic = f"EPIC-{rng.randrange(self.epic_count) + 1}"
+        roll = rng.random()
+        if roll < 0.45:
+            return epic, None, None  # Team-managed and migrated projects
+        if roll < 0.75:
+            return None, epic, None  # Classic Epic Link only
+        if roll < 0.85:
+            return None, None, epic
+        return None, None, None
+    
+    def _link(self, rng: random.Random, type_name: str, target: str) -> Dict[str, Any]:
+        name, inward, outward = next(t for t in LINK_TYPES if t[0] == type_name)
+        link_id = rng.randrange(10_000_000)
+        return {
+            'id': str(link_id),
+            'self': f"{self.base_url}/rest/api/3/issueLink/{link_id}",
+            'type': {
+                'id': str(LINK_TYPES.index((name, inward, outward)) + 10000),
+                'name': name,
+                'inward': inward,
+                'outward': outward,
+                'self': f"{self.base_url}/rest/api/3/issueLinkType/{LINK_TYPES.index((name, inward, outward)) + 10000}"
+            },
+            'outwardIssue' if rng.random() < 0.5 else 'inwardIssue': self._stub(target)
+        }
+    
+    def worklogs(self, key: str) -> List[Dict[str, Any]]:
+        """Every worklog of an issue, oldest first"""
+        prefix, _, number = key.partition('-')
+        if prefix != 'PROJ' or not number.isdigit() or not 1 <= int(number) <= self.issue_count:
+            return []
+        number = int(number)
+        rng = self._rng(prefix, number, 'worklogs')
+        # 30% of issues have no worklogs; the rest a long tail around six
+        count = 0 if rng.random() < 0.3 else min(1 + int(rng.expovariate(1 / 6)), 300)
+        created = self._start + timedelta(minutes=self._span_minutes * number // max(self.issue_count, 1))
+        issue_id = self._issue_id(prefix, number)
+        
+        worklogs = []
+        for index in range(count):
+            author = rng.choices(self.assignees, cum_weights=self._assignee_weights)[0]
+            started = created + timedelta(days=rng.randrange(0, 90), hours=rng.randrange(8, 18))
+            stamp = started.strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+            worklog_id = issue_id * 1000 + index
+            minutes = rng.randrange(1, 33) * 15
+            worklogs.append({
+                'self': f"{self.base_url}/rest/api/3/issue/{issue_id}/worklog/{worklog_id}",
+                'id': str(worklog_id),
+                'issueId': str(issue_id),
+                'author': author,
+                'updateAuthor': author,
+                'started': stamp,
+                'created': stamp,
+                'updated': stamp,
+                'timeSpent': f"{minutes}m",
+                'timeSpentSeconds': minutes * 60
+            })
+        worklogs.sort(key=lambda worklog: worklog['started'])
+        return worklogs
@@ -0,0 +1,59 @@
+"""
+Benchmark: per-row week bucketing (the previous analyze_time_tracking) vs.
+the vectorised time buckets and pivot in gemini_jira_data_aggregator
+
+    python -m benchmarks.time_buckets --people 500 --days 365
+"""
+
+import argparse
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.flatten import best_of
+from gemini_jira_data_aggregator import analyze_time_tracking, pivot_time_tracking
+
+def legacy_analyze_time_tracking(df: pd.DataFrame) -> pd.DataFrame:
+    """The previous implementation, kept for comparison"""
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Week Start'] = df['Date'].apply(lambda x: x - timedelta(days=x.weekday()))
+    grouped_df = df.groupby(['Feature Link', 'Assignee', 'Week Start'])['Time Logged (Hours)'].sum().reset_index()
+    return grouped_df.sort_values(by=['Feature Link', 'Assignee', 'Week Start'])
+
+def make_worklogs(people: int, days: int, per_day: int = 2, features: int = 200, seed: int = 0) -> pd.DataFrame:
+    """Worklog rows shaped like fetch_jira_worklogs output"""
+    rng = np.random.default_rng(seed)
+    rows = people * days * per_day
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, days, rows), unit='D')
+    return pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Feature Link': [f'FEAT-{i}' for i in rng.integers(0, features, rows)],
+        'Assignee': [f'User {i}' for i in rng.integers(0, people, rows)],
+        'Time Logged (Hours)': rng.integers(1, 17, rows) / 4
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark time bucketing in the worklog analysis')
+    parser.add_argument('--people', type=int, default=500, help='Number of assignees')
+    parser.add_argument('--days', type=int, default=365, help='Days of worklogs')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation (best is reported)')
+    args = parser.parse_args()
+    
+    worklogs = make_worklogs(args.people, args.days)
+    
+    legacy_time, expected = best_of(args.repeat, legacy_analyze_time_tracking, worklogs)
+    vectorised_time, actual = best_of(args.repeat, analyze_time_tracking, worklogs)
+    pivot_time, pivot = best_of(args.repeat, pivot_time_tracking, actual)
+    
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True))
+    
+    print(f"Worklogs:    {len(worklogs):,} ({args.people} people x {args.days} days)")
+    print(f"Per-row:     {legacy_time:.3f}s")
+    print(f"Vectorised:  {vectorised_time:.3f}s")
+    print(f"Speedup:     {legacy_time / vectorised_time:.2f}x")
+    print(f"Pivot:       {pivot_time:.3f}s ({pivot.shape[0]} assignees x {pivot.shape[1] - 2} weeks)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Column Mapping
+Maps Excel export headers to the aggregator's issue fields. Mappings are
+detected from common header names, cached on disk per header layout
+(fingerprint) so repeat loads of the same export skip detection, and can
+be pinned with an explicit mapping file.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Sequence
+
+# Common column name patterns per field, most specific first
+MAPPING_PATTERNS = {
+    'key': ['key', 'issue key', 'ticket', 'jira key', 'issue id', 'id', 'issue'],
+    'summary': ['summary', 'title', 'description', 'issue summary', 'subject'],
+    'assignee': ['assignee', 'assigned to', 'owner', 'developer', 'responsible'],
+    'status': ['status', 'state', 'current status', 'issue status'],
+    'priority': ['priority', 'importance', 'urgency'],
+    'issue_type': ['issue type', 'type', 'issuetype', 'category', 'kind'],
+    'estimated_hours': [
+        'estimated hours', 'original estimate', 'estimate', 'planned hours',
+        'time estimate', 'estimated time', 'original time estimate', 'effort estimate'
+    ],
+    'remaining_hours': [
+        'remaining hours', 'remaining estimate', 'time remaining', 'hours remaining',
+        'remaining time', 'time left', 'remaining effort'
+    ],
+    'spent_hours': [
+        'spent hours', 'time spent', 'logged time', 'hours spent', 'actual time',
+        'work logged', 'time logged', 'hours logged'
+    ],
+    'feature_link': [
+        'feature link', 'epic link', 'parent', 'epic', 'feature', 'epic key',
+        'parent epic', 'parent key', 'feature key', 'linked epic'
+    ]
+}
+
+# Words that make a header describe something other than the issue itself,
+# e.g. "Sprint ID" is not the issue key and "Epic Status" is not its status
+OTHER_ENTITY_WORDS = {'sprint', 'epic', 'parent', 'feature', 'project', 'component', 'version', 'board', 'linked'}
+
+def _words(text: str) -> List[str]:
+    return re.findall(r'[a-z0-9]+', str(text).lower())
+
+def _contains_words(words: List[str], pattern: List[str]) -> bool:
+    size = len(pattern)
+    return any(words[i:i + size] == pattern for i in range(len(words) - size + 1))
+
+def detect_column_mappings(columns: Sequence[str]) -> Dict[str, str]:
+    """
+    Detect a field -> column mapping from headers. Exact header matches are
+    assigned first, then whole-word matches in pattern order; each column is
+    used for at most one field.
+    """
+    header_words = [_words(column) for column in columns]
+    mapping = {}
+    claimed = set()
+    
+    # Pass 1: headers equal to a pattern, e.g. "ID" or "Epic Link"
+    for field, patterns in MAPPING_PATTERNS.items():
+        for pattern in patterns:
+            pattern_words = _words(pattern)
+            match = next((i for i, words in enumerate(header_words)
+                          if words == pattern_words and i not in claimed), None)
+            if match is not None:
+                mapping[field] = columns[match]
+                claimed.add(match)
+                break
+    
+    # Pass 2: headers containing a pattern as whole words, e.g. "Time Spent (h)"
+    for field, patterns in MAPPING_PATTERNS.items():
+        if field in mapping:
+            continue
+        for pattern in patterns:
+            pattern_words = _words(pattern)
+            match = next((
+                i for i, words in enumerate(header_words)
+                if i not in claimed
+                and _contains_words(words, pattern_words)
+                and not (set(words) - set(pattern_words)) & OTHER_ENTITY_WORDS
+            ), None)
+            if match is not None:
+                mapping[field] = columns[match]
+                claimed.add(match)
+                break
+    
+    # Keep the field order of MAPPING_PATTERNS
+    return {field: mapping[field] for field in MAPPING_PATTERNS if field in mapping}
+
+def header_fingerprint(columns: Sequence[str]) -> str:
+    """Stable hash of a header row (names and order)"""
+    header = json.dumps([str(column) for column in columns], ensure_ascii=False)
+    return hashlib.sha256(header.encode('utf-8')).hexdigest()[:16]
+
+def load_mapping_file(path: str, columns: Sequence[str]) -> Dict[str, str]:
+    """
+    Read an explicit mapping file, e.g. {"key": "Issue", "spent_hours": "Logged"}.
+    Only the listed fields are mapped; every column must exist in the header.
+    """
+    with open(path, 'r') as f:
+        mapping = json.load(f)
+    
+    if not isinstance(mapping, dict):
+        raise ValueError(f"Mapping file {path} must contain a JSON object of field -> column")
+    
+    unknown_fields = [field for field in mapping if field not in MAPPING_PATTERNS]
+    if unknown_fields:
+        raise ValueError(f"Unknown fields in mapping file {path}: {unknown_fields} "
+                         f"(expected some of {list(MAPPING_PATTERNS)})")
+    
+    missing_columns = [column for column in mapping.values() if column not in columns]
+    if missing_columns:
+        raise ValueError(f"Columns from mapping file {path} not found in sheet: {missing_columns}")
+    
+    return mapping
+
+class ColumnMappingCache:
+    """JSON file of detected mappings keyed by header fingerprint"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                # A corrupt cache only costs a re-detection
+                self.entries = {}
+    
+    def get(self, columns: Sequence[str]) -> Optional[Dict[str, str]]:
+        """Cached mapping for this exact header, if any"""
+        entry = self.entries.get(header_fingerprint(columns))
+        if entry is None or entry.get('columns') != [str(column) for column in columns]:
+            return None
+        return entry['mapping']
+    
+    def put(self, columns: Sequence[str], mapping: Dict[str, str], save: bool = True):
+        """Remember a mapping for this header and, unless save=False, write the cache file"""
+        self.entries[header_fingerprint(columns)] = {
+            'columns': [str(column) for column in columns],
+            'mapping': mapping
+        }
+        if save:
+            self.save()
+    
+    def save(self):
+        """Write the cache file; raises OSError if it cannot be written"""
+        # Write atomically so concurrent runs never see a half-written file
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
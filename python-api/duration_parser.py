@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Duration Parser
+Converts time-tracking values from Excel exports into hours. Handles plain
+numbers (hours), clock values ("8:30"), single units ("8h", "1.5d", "1w",
+"30m") and JIRA's composite display format ("1w 2d 4h 30m"), each with an
+optional leading sign ("-2h" for a correction). Whole columns are parsed with
+one regex pass over their distinct values.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HOURS_PER_DAY = 8.0
+DEFAULT_HOURS_PER_WEEK = 40.0
+
+# Values treated as "no time logged"
+NULL_TOKENS = {'', 'null', 'none', 'n/a', 'na', 'nan', '-'}
+
+_NUMBER = r'\d+(?:\.\d+)?|\.\d+'
+
+DURATION_PATTERN = re.compile(rf"""
+    ^\s*(?P<sign>[-+])?(?:
+        (?P<clock_hours>\d+):(?P<clock_minutes>\d{{1,2}})(?::(?P<clock_seconds>\d{{1,2}}))?
+      | (?P<plain>{_NUMBER})
+      | (?=[\d.])
+        (?:(?P<weeks>{_NUMBER})\s*(?:weeks?|wks?|w)[\s,]*)?
+        (?:(?P<days>{_NUMBER})\s*(?:days?|d)[\s,]*)?
+        (?:(?P<hours>{_NUMBER})\s*(?:hours?|hrs?|h)[\s,]*)?
+        (?:(?P<minutes>{_NUMBER})\s*(?:minutes?|mins?|m))?
+    )\s*$
+""", re.VERBOSE | re.IGNORECASE)
+
+def parse_duration_series(values: pd.Series,
+                          hours_per_day: float = DEFAULT_HOURS_PER_DAY,
+                          hours_per_week: float = DEFAULT_HOURS_PER_WEEK) -> pd.Series:
+    """
+    Hours for every value of a Series. Missing and null-like values give 0;
+    values that are not a recognised duration give NaN so callers can
+    report them.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(float).fillna(0.0)
+    
+    # Parse each distinct value once and broadcast the results back
+    codes, distinct = pd.factorize(values)
+    if len(distinct) == 0:
+        return pd.Series(0.0, index=values.index)
+    
+    distinct = pd.Series(distinct, dtype=object)
+    parsed = pd.to_numeric(distinct, errors='coerce').astype(float)
+    text = distinct[parsed.isna()].astype(str).str.strip().str.lower()
+    if not text.empty:
+        parsed[text.index] = _parse_text(text, hours_per_day, hours_per_week)
+    
+    # Code -1 marks missing values
+    hours = np.append(parsed.to_numpy(), 0.0)[codes]
+    return pd.Series(hours, index=values.index)
+
+def _parse_text(text: pd.Series, hours_per_day: float, hours_per_week: float) -> pd.Series:
+    """Vectorised regex parse of lower-cased, stripped strings"""
+    parts = text.str.extract(DURATION_PATTERN)
+    sign = np.where(parts.pop('sign') == '-', -1.0, 1.0)
+    parts = parts.astype(float)
+    
+    clock = (
+        parts['clock_hours']
+        + parts['clock_minutes'] / 60
+        + parts['clock_seconds'].fillna(0) / 3600
+    )
+    units = parts[['weeks', 'days', 'hours', 'minutes']]
+    composite = (
+        units['weeks'].fillna(0) * hours_per_week
+        + units['days'].fillna(0) * hours_per_day
+        + units['hours'].fillna(0)
+        + units['minutes'].fillna(0) / 60
+    ).where(units.notna().any(axis=1))
+    
+    hours = clock.fillna(parts['plain']).fillna(composite) * sign
+    return hours.where(~text.isin(NULL_TOKENS), 0.0)
+
+@lru_cache(maxsize=4096)
+def _parse_text_cached(text: str, hours_per_day: float, hours_per_week: float) -> Optional[float]:
+    if text in NULL_TOKENS:
+        return 0.0
+    
+    match = DURATION_PATTERN.match(text)
+    if not match:
+        return None
+    
+    sign = -1.0 if match.group('sign') == '-' else 1.0
+    parts = {name: float(value) for name, value in match.groupdict().items()
+             if value is not None and name != 'sign'}
+    if 'clock_hours' in parts:
+        return sign * (parts['clock_hours'] + parts['clock_minutes'] / 60 + parts.get('clock_seconds', 0) / 3600)
+    if 'plain' in parts:
+        return sign * parts['plain']
+    if not parts:
+        return None
+    return sign * (
+        parts.get('weeks', 0) * hours_per_week
+        + parts.get('days', 0) * hours_per_day
+        + parts.get('hours', 0)
+        + parts.get('minutes', 0) / 60
+    )
+
+def parse_duration(value,
+                   hours_per_day: float = DEFAULT_HOURS_PER_DAY,
+                   hours_per_week: float = DEFAULT_HOURS_PER_WEEK) -> Optional[float]:
+    """Hours for a single value (0 for missing values, None if unrecognised)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_text_cached(str(value).strip().lower(), hours_per_day, hours_per_week)
@@ -5,19 +5,47 @@ Processes JIRA data from Excel files and creates aggregated summaries
 Similar functionality to jira_data_aggregator.py but works with Excel input
 """
 
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 import argparse
+import contextlib
+import glob
+import io
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Iterator, List, Dict, Optional, Sequence, Tuple
 import warnings
+from report_export import REPORT_FORMATS, write_report
+from duration_parser import (
+    DEFAULT_HOURS_PER_DAY, DEFAULT_HOURS_PER_WEEK, parse_duration, parse_duration_series
+)
+from column_mapping import ColumnMappingCache, detect_column_mappings, header_fingerprint, load_mapping_file
+from aggregation import REPORT_ROLLUPS, RunningSummary, finest_grain, grouping_sets, summarize
+from stage_profiler import StageProfiler, add_profile_arguments
 
 # Suppress pandas warnings for cleaner output
 warnings.filterwarnings('ignore', category=UserWarning)
 
+# Unparseable cells reported individually per time column and chunk
+MAX_ROW_WARNINGS = 20
+
+# Provenance columns added to Detailed Issues in batch mode
+SOURCE_COLUMNS = ['Source File', 'Source Sheet', 'Source Modified']
+
+# Column mapping cache file name, created next to the Excel file by default
+DEFAULT_MAPPING_CACHE = 'column_mapping_cache.json'
+
+# Column order of the Detailed Issues table
+DETAIL_COLUMNS = [
+    'Issue Key', 'Summary', 'Assignee', 'Feature Link', 'Estimated Hours',
+    'Remaining Hours', 'Spent Hours', 'Completion %', 'Status', 'Priority', 'Issue Type'
+]
+
 @dataclass
 class ExcelIssueSummary:
     """Data structure for Excel issue summary"""
@@ -36,96 +64,137 @@ class ExcelIssueSummary:
 class ExcelDataAggregator:
     """Aggregates JIRA issue data from Excel files"""
     
-    def __init__(self, excel_file: str, sheet_name: Optional[str] = None):
+    def __init__(self, excel_file: str, sheet_name: Optional[str] = None, chunk_size: int = 10000,
+                 hours_per_day: float = DEFAULT_HOURS_PER_DAY, hours_per_week: float = DEFAULT_HOURS_PER_WEEK,
+                 mapping_file: Optional[str] = None, mapping_cache: Optional[str] = None):
         """
         Initialize with Excel file path
         
         Args:
             excel_file: Path to Excel file containing JIRA data
             sheet_name: Specific sheet name to read (optional)
+            chunk_size: Rows read and processed at a time
+            hours_per_day: Hours in a "1d" duration (JIRA working day)
+            hours_per_week: Hours in a "1w" duration (JIRA working week)
+            mapping_file: JSON file of field -> column used instead of detection
+            mapping_cache: JSON file caching detected mappings per header layout
         """
         self.excel_file = excel_file
         self.sheet_name = sheet_name
+        self.chunk_size = chunk_size
+        self.hours_per_day = hours_per_day
+        self.hours_per_week = hours_per_week
+        self.mapping_file = mapping_file
+        self.mapping_cache = mapping_cache
+        self.write_mapping_cache = True  # Batch workers leave writing the cache to the parent
+        self.detected_mappings: List[Tuple[List[str], Dict[str, str]]] = []  # (header, mapping) detected this run
         self.raw_data = None
-        self.processed_issues = []
+        self.detailed_df = None
+        self.generated_keys = None  # True for rows whose Issue Key was numbered, not read
+        self.running_summary = None
+        self._processed_issues = None
         
     def load_excel_data(self) -> pd.DataFrame:
-        """Load data from Excel file"""
+        """Load the whole sheet into one DataFrame"""
+        df = pd.concat(list(self.iter_excel_chunks()))
+        print(f"📊 Loaded {len(df)} rows with {len(df.columns)} columns")
+        return df
+    
+    def iter_excel_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield the sheet as DataFrames of at most chunk_size rows.
+        .xlsx/.xlsm workbooks are opened once in openpyxl read-only mode and
+        streamed row by row, so only one chunk is in memory at a time. Fully
+        blank rows are skipped; the index is each row's position below the
+        header counting them, as pandas.read_excel would number it.
+        """
         try:
             if not os.path.exists(self.excel_file):
                 raise FileNotFoundError(f"Excel file not found: {self.excel_file}")
             
             print(f"📊 Loading data from: {self.excel_file}")
             
-            # Try to read the Excel file
+            if os.path.splitext(self.excel_file)[1].lower() not in ('.xlsx', '.xlsm'):
+                # Legacy formats are not supported by openpyxl; load them in one go
+                df = pd.read_excel(self.excel_file, sheet_name=self.sheet_name or 0)
+                print(f"📋 Using sheet: {self.sheet_name or 'first sheet'}")
+                yield df
+                return
+            
+            workbook = load_workbook(self.excel_file, read_only=True, data_only=True)
+        except Exception as e:
+            print(f"❌ Error loading Excel file: {e}")
+            raise
+        
+        try:
             if self.sheet_name:
-                df = pd.read_excel(self.excel_file, sheet_name=self.sheet_name)
+                worksheet = workbook[self.sheet_name]
                 print(f"📋 Reading sheet: {self.sheet_name}")
             else:
-                # Read first sheet or all sheets
-                excel_file = pd.ExcelFile(self.excel_file)
-                sheet_names = excel_file.sheet_names
-                print(f"📋 Available sheets: {', '.join(sheet_names)}")
+                print(f"📋 Available sheets: {', '.join(workbook.sheetnames)}")
                 
                 # Use first sheet by default
-                df = pd.read_excel(self.excel_file, sheet_name=sheet_names[0])
-                print(f"📋 Using sheet: {sheet_names[0]}")
+                worksheet = workbook[workbook.sheetnames[0]]
+                print(f"📋 Using sheet: {workbook.sheetnames[0]}")
             
-            print(f"📊 Loaded {len(df)} rows with {len(df.columns)} columns")
-            return df
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            columns = header_names(header)
+            width = len(columns)
             
-        except Exception as e:
-            print(f"❌ Error loading Excel file: {e}")
-            raise
+            chunk = []
+            positions = []
+            yielded = False
+            for position, row in enumerate(rows):
+                # Skip fully blank rows (common at the end of exported sheets)
+                if all(value is None for value in row):
+                    continue
+                chunk.append(tuple(row[:width]) + (None,) * (width - len(row)))
+                positions.append(position)
+                
+                if len(chunk) >= self.chunk_size:
+                    yield pd.DataFrame(chunk, columns=columns, index=positions)
+                    yielded = True
+                    chunk = []
+                    positions = []
+            
+            if chunk or not yielded:
+                yield pd.DataFrame(chunk, columns=columns, index=pd.Index(positions, dtype='int64'))
+        finally:
+            workbook.close()
     
     def detect_column_mappings(self, df: pd.DataFrame) -> Dict[str, str]:
         """
         Automatically detect column mappings from Excel headers
         Handles various common column naming conventions
         """
-        columns = [col.lower().strip() for col in df.columns]
-        
-        # Common column name patterns
-        mapping_patterns = {
-            'key': ['key', 'issue key', 'ticket', 'jira key', 'issue id', 'id'],
-            'summary': ['summary', 'title', 'description', 'issue summary', 'subject'],
-            'assignee': ['assignee', 'assigned to', 'owner', 'developer', 'responsible'],
-            'status': ['status', 'state', 'current status', 'issue status'],
-            'priority': ['priority', 'importance', 'urgency'],
-            'issue_type': ['issue type', 'type', 'issuetype', 'category', 'kind'],
-            'estimated_hours': [
-                'estimated hours', 'original estimate', 'estimate', 'planned hours',
-                'time estimate', 'estimated time', 'original time estimate', 'effort estimate'
-            ],
-            'remaining_hours': [
-                'remaining hours', 'remaining estimate', 'time remaining', 'hours remaining',
-                'remaining time', 'time left', 'remaining effort'
-            ],
-            'spent_hours': [
-                'spent hours', 'time spent', 'logged time', 'hours spent', 'actual time',
-                'work logged', 'time logged', 'hours logged'
-            ],
-            'feature_link': [
-                'feature link', 'epic link', 'parent', 'epic', 'feature', 'epic key',
-                'parent epic', 'parent key', 'feature key', 'linked epic'
-            ]
-        }
-        
-        detected_mapping = {}
-        
-        for field, patterns in mapping_patterns.items():
-            for pattern in patterns:
-                matches = [col for col in columns if pattern in col.lower()]
-                if matches:
-                    # Use the first match, preferring exact matches
-                    exact_matches = [col for col in matches if col == pattern]
-                    if exact_matches:
-                        detected_mapping[field] = df.columns[columns.index(exact_matches[0])]
-                    else:
-                        detected_mapping[field] = df.columns[columns.index(matches[0])]
-                    break
-        
-        return detected_mapping
+        return detect_column_mappings(list(df.columns))
+    
+    def resolve_column_mappings(self, df: pd.DataFrame) -> Dict[str, str]:
+        """
+        Column mapping for a sheet: the explicit mapping file if given, else
+        the cached mapping for this header layout, else detection (which is
+        then cached)
+        """
+        columns = list(df.columns)
+        
+        if self.mapping_file:
+            print(f"🗂️  Using column mapping file: {self.mapping_file}")
+            return load_mapping_file(self.mapping_file, columns)
+        
+        cache = ColumnMappingCache(self.mapping_cache) if self.mapping_cache else None
+        if cache is not None:
+            mapping = cache.get(columns)
+            if mapping is not None:
+                print(f"🗂️  Using cached column mapping ({header_fingerprint(columns)})")
+                return mapping
+        
+        mapping = self.detect_column_mappings(df)
+        self.detected_mappings.append((columns, mapping))
+        if cache is not None and self.write_mapping_cache:
+            cache.put(columns, mapping, save=False)
+            save_mapping_cache(cache)
+        return mapping
     
     def print_column_mapping(self, mapping: Dict[str, str], df: pd.DataFrame):
         """Print detected column mappings for user verification"""
@@ -147,65 +216,61 @@ class ExcelDataAggregator:
         print("-" * 50)
     
     def process_excel_data(self) -> List[ExcelIssueSummary]:
-        """Process Excel data into issue summaries"""
-        
-        # Load data
-        df = self.load_excel_data()
-        
-        # Detect column mappings
-        mapping = self.detect_column_mappings(df)
-        self.print_column_mapping(mapping, df)
-        
-        # Validate required columns
-        required_fields = ['key', 'summary']
-        missing_required = [field for field in required_fields if field not in mapping]
-        
-        if missing_required:
-            print(f"❌ Missing required columns: {missing_required}")
-            print("Available columns:", list(df.columns))
-            raise ValueError(f"Required columns not found: {missing_required}")
-        
-        print(f"\n🔄 Processing {len(df)} issues...")
-        
-        processed_issues = []
-        
-        for idx, row in df.iterrows():
-            try:
-                # Extract basic fields
-                key = str(row.get(mapping.get('key', ''), f'ISSUE-{idx+1}')).strip()
-                summary = str(row.get(mapping.get('summary', ''), 'No Summary')).strip()
-                
-                # Extract assignee
-                assignee = row.get(mapping.get('assignee', ''), 'Unassigned')
-                if pd.isna(assignee) or str(assignee).strip() == '':
-                    assignee = 'Unassigned'
-                else:
-                    assignee = str(assignee).strip()
-                
-                # Extract feature link
-                feature_link = row.get(mapping.get('feature_link', ''), 'No Feature Link')
-                if pd.isna(feature_link) or str(feature_link).strip() == '':
-                    feature_link = 'No Feature Link'
-                else:
-                    feature_link = str(feature_link).strip()
-                
-                # Extract time tracking (handle various formats)
-                estimated_hours = self._parse_time_value(row.get(mapping.get('estimated_hours', ''), 0))
-                remaining_hours = self._parse_time_value(row.get(mapping.get('remaining_hours', ''), 0))
-                spent_hours = self._parse_time_value(row.get(mapping.get('spent_hours', ''), 0))
+        """
+        Process Excel data into issue summaries. Use build_detailed_df for
+        the same rows as a DataFrame without building an object per row.
+        """
+        self.build_detailed_df()
+        return self.processed_issues
+    
+    def build_detailed_df(self) -> pd.DataFrame:
+        """
+        Process Excel data into the detailed issue table (DETAIL_COLUMNS).
+        The sheet is read and processed one chunk at a time with whole-column
+        operations; each processed chunk is also folded into the running
+        Feature Link x Assignee summary.
+        """
+        mapping = None
+        frames = []
+        generated = []
+        self.running_summary = RunningSummary()
+        
+        for df in self.iter_excel_chunks():
+            if mapping is None:
+                # Resolve column mappings from the header (first chunk)
+                mapping = self.resolve_column_mappings(df)
+                self.print_column_mapping(mapping, df)
                 
-                # Calculate completion percentage
-                completion_percent = 0.0
-                if estimated_hours > 0:
-                    completion_percent = (spent_hours / estimated_hours) * 100
+                # Validate required columns
+                required_fields = ['key', 'summary']
+                missing_required = [field for field in required_fields if field not in mapping]
                 
-                # Extract other fields
-                status = str(row.get(mapping.get('status', ''), 'Unknown')).strip()
-                priority = str(row.get(mapping.get('priority', ''), 'Medium')).strip()
-                issue_type = str(row.get(mapping.get('issue_type', ''), 'Story')).strip()
+                if missing_required:
+                    print(f"❌ Missing required columns: {missing_required}")
+                    print("Available columns:", list(df.columns))
+                    raise ValueError(f"Required columns not found: {missing_required}")
                 
-                # Create issue summary
-                issue_summary = ExcelIssueSummary(
+                print(f"\n🔄 Processing issues in chunks of {self.chunk_size}...")
+            
+            chunk_df = self._process_chunk(df, mapping)
+            frames.append(chunk_df)
+            generated.append(self._text_column(df, mapping['key'], None).isna())
+            self.running_summary.add(chunk_df)
+        
+        self.detailed_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=DETAIL_COLUMNS)
+        self.generated_keys = pd.concat(generated, ignore_index=True) if generated else pd.Series(dtype=bool)
+        self._processed_issues = None
+        print(f"✅ Successfully processed {len(self.detailed_df)} issues")
+        return self.detailed_df
+    
+    @property
+    def processed_issues(self) -> List[ExcelIssueSummary]:
+        """Processed rows as ExcelIssueSummary objects (built on first access)"""
+        if self._processed_issues is None:
+            if self.detailed_df is None:
+                return []
+            self._processed_issues = [
+                ExcelIssueSummary(
                     key=key,
                     summary=summary,
                     assignee=assignee,
@@ -218,99 +283,93 @@ class ExcelDataAggregator:
                     issue_type=issue_type,
                     completion_percent=completion_percent
                 )
-                
-                processed_issues.append(issue_summary)
-                
-            except Exception as e:
-                print(f"⚠️  Warning: Error processing row {idx+1}: {e}")
-                continue
+                for (key, summary, assignee, feature_link, estimated_hours, remaining_hours,
+                     spent_hours, completion_percent, status, priority, issue_type)
+                in self.detailed_df[DETAIL_COLUMNS].itertuples(index=False, name=None)
+            ]
+        return self._processed_issues
+    
+    def _process_chunk(self, df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
+        """Process one chunk of rows into detailed issue rows, column by column"""
+        # Rows without a key are numbered by their position in the sheet
+        default_keys = pd.Series([f'ISSUE-{idx+1}' for idx in df.index], index=df.index)
+        
+        estimated_hours = self._hours_column(df, mapping.get('estimated_hours'))
+        remaining_hours = self._hours_column(df, mapping.get('remaining_hours'))
+        spent_hours = self._hours_column(df, mapping.get('spent_hours'))
+        
+        # Calculate completion percentage
+        with np.errstate(divide='ignore', invalid='ignore'):
+            completion_percent = np.where(estimated_hours > 0, spent_hours / estimated_hours * 100, 0.0)
+        
+        return pd.DataFrame({
+            'Issue Key': self._text_column(df, mapping.get('key'), default_keys),
+            'Summary': self._text_column(df, mapping.get('summary'), 'No Summary'),
+            'Assignee': self._text_column(df, mapping.get('assignee'), 'Unassigned'),
+            'Feature Link': self._text_column(df, mapping.get('feature_link'), 'No Feature Link'),
+            'Estimated Hours': estimated_hours,
+            'Remaining Hours': remaining_hours,
+            'Spent Hours': spent_hours,
+            'Completion %': completion_percent,
+            'Status': self._text_column(df, mapping.get('status'), 'Unknown'),
+            'Priority': self._text_column(df, mapping.get('priority'), 'Medium'),
+            'Issue Type': self._text_column(df, mapping.get('issue_type'), 'Story')
+        }, index=df.index)
+    
+    @staticmethod
+    def _text_column(df: pd.DataFrame, column: Optional[str], default) -> pd.Series:
+        """Stripped text values of a column, with the default for missing or blank cells"""
+        if column is None:
+            return pd.Series(default, index=df.index, dtype=object)
+        
+        values = df[column]
+        present = values.notna()
+        text = values.where(~present, values.astype(str).str.strip())
+        return text.where(present & (text != ''), default)
+    
+    def _hours_column(self, df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+        """
+        Hours from a time column (see duration_parser). Cells that cannot be
+        parsed count as 0 and are reported with their row number.
+        """
+        if column is None:
+            return pd.Series(0.0, index=df.index)
+        
+        hours = parse_duration_series(df[column], self.hours_per_day, self.hours_per_week)
+        
+        failed = hours.isna()
+        if failed.any():
+            for idx, value in df.loc[failed, column].head(MAX_ROW_WARNINGS).items():
+                print(f"⚠️  Warning: Error processing row {idx+1}: cannot parse {column} value {value!r}, using 0")
+            if failed.sum() > MAX_ROW_WARNINGS:
+                print(f"⚠️  Warning: {failed.sum() - MAX_ROW_WARNINGS} more unparseable {column} values")
         
-        print(f"✅ Successfully processed {len(processed_issues)} issues")
-        self.processed_issues = processed_issues
-        return processed_issues
+        return hours.fillna(0.0)
     
     def _parse_time_value(self, value) -> float:
         """Parse time value from various formats (hours, seconds, text)"""
-        if pd.isna(value) or value == '' or value is None:
-            return 0.0
-        
-        try:
-            # If it's already a number, assume it's hours
-            if isinstance(value, (int, float)):
-                return float(value)
-            
-            # Convert string to number
-            str_value = str(value).strip().lower()
-            
-            # Handle empty or 'null' values
-            if str_value in ['', 'null', 'none', 'n/a', '-']:
-                return 0.0
-            
-            # Parse time formats
-            if 'h' in str_value:
-                # Format like "8h", "8.5h", "8 hours"
-                return float(str_value.replace('h', '').replace('hours', '').replace('hour', '').strip())
-            elif 'd' in str_value:
-                # Format like "1d", "1.5d" (assume 8 hours per day)
-                return float(str_value.replace('d', '').replace('days', '').replace('day', '').strip()) * 8
-            elif 'w' in str_value:
-                # Format like "1w" (assume 40 hours per week)
-                return float(str_value.replace('w', '').replace('weeks', '').replace('week', '').strip()) * 40
-            elif ':' in str_value:
-                # Format like "8:30" (hours:minutes)
-                parts = str_value.split(':')
-                hours = float(parts[0])
-                minutes = float(parts[1]) / 60 if len(parts) > 1 else 0
-                return hours + minutes
-            else:
-                # Try to parse as plain number
-                return float(str_value)
-                
-        except (ValueError, TypeError):
-            # If parsing fails, return 0
-            return 0.0
+        hours = self._try_parse_time_value(value)
+        # If parsing fails, return 0
+        return 0.0 if hours is None else hours
+    
+    def _try_parse_time_value(self, value) -> Optional[float]:
+        """Parse a time value into hours, or None if it is not a recognised format"""
+        return parse_duration(value, self.hours_per_day, self.hours_per_week)
+    
+    def summary_grain(self) -> pd.DataFrame:
+        """Unrounded Feature Link x Assignee totals, the grain every summary is rolled up from"""
+        if self.detailed_df is None or self.detailed_df.empty:
+            raise ValueError("No processed issues available. Run build_detailed_df() first.")
+        
+        if self.running_summary is not None and self.running_summary.issue_count == len(self.detailed_df):
+            # Totals were accumulated chunk by chunk during processing
+            return self.running_summary.to_frame()
+        return finest_grain(self.detailed_df)
     
     def create_aggregated_summary(self) -> pd.DataFrame:
         """Create aggregated summary grouped by feature link and assignee"""
-        
-        if not self.processed_issues:
-            raise ValueError("No processed issues available. Run process_excel_data() first.")
-        
-        # Convert to DataFrame for easier aggregation
-        data = []
-        for issue in self.processed_issues:
-            data.append({
-                'Feature Link': issue.feature_link,
-                'Assignee': issue.assignee,
-                'Estimated Hours': issue.estimated_hours,
-                'Remaining Hours': issue.remaining_hours,
-                'Spent Hours': issue.spent_hours,
-                'Issue Key': issue.key,
-                'Status': issue.status,
-                'Priority': issue.priority,
-                'Issue Type': issue.issue_type
-            })
-        
-        df = pd.DataFrame(data)
-        
         # Group by Feature Link and Assignee
-        summary_df = df.groupby(['Feature Link', 'Assignee']).agg({
-            'Estimated Hours': 'sum',
-            'Remaining Hours': 'sum',
-            'Spent Hours': 'sum',
-            'Issue Key': 'count'
-        }).round(2)
-        
-        summary_df.rename(columns={'Issue Key': 'Issue Count'}, inplace=True)
-        
-        # Calculate completion percentages
-        summary_df['Completion %'] = (
-            (summary_df['Spent Hours'] / summary_df['Estimated Hours'] * 100)
-            .fillna(0)
-            .round(1)
-        )
-        
-        summary_df = summary_df.reset_index()
+        summary_df = summarize(self.summary_grain()).reset_index()
         return summary_df
     
     def print_console_summary(self, summary_df: pd.DataFrame):
@@ -365,73 +424,217 @@ class ExcelDataAggregator:
         for assignee, totals in assignee_totals.head(5).iterrows():
             print(f"  👤 {assignee:<20} | Spent: {totals['Spent Hours']:>6.1f}h | Issues: {totals['Issue Count']:>3}")
     
-    def export_to_excel(self, output_file: str):
-        """Export aggregated data to Excel with multiple sheets"""
-        
-        if not self.processed_issues:
-            raise ValueError("No processed issues available. Run process_excel_data() first.")
-        
-        print(f"\n📊 Exporting to Excel: {output_file}")
-        
-        # Create detailed DataFrame
-        detailed_data = []
-        for issue in self.processed_issues:
-            detailed_data.append({
-                'Issue Key': issue.key,
-                'Summary': issue.summary,
-                'Assignee': issue.assignee,
-                'Feature Link': issue.feature_link,
-                'Estimated Hours': issue.estimated_hours,
-                'Remaining Hours': issue.remaining_hours,
-                'Spent Hours': issue.spent_hours,
-                'Completion %': issue.completion_percent,
-                'Status': issue.status,
-                'Priority': issue.priority,
-                'Issue Type': issue.issue_type
-            })
-        
-        detailed_df = pd.DataFrame(detailed_data)
-        summary_df = self.create_aggregated_summary()
-        
-        # Create additional summary views
-        feature_summary = detailed_df.groupby('Feature Link').agg({
-            'Estimated Hours': 'sum',
-            'Remaining Hours': 'sum',
-            'Spent Hours': 'sum',
-            'Issue Key': 'count'
-        }).round(2)
-        feature_summary.rename(columns={'Issue Key': 'Issue Count'}, inplace=True)
-        feature_summary['Completion %'] = (
-            (feature_summary['Spent Hours'] / feature_summary['Estimated Hours'] * 100)
-            .fillna(0)
-            .round(1)
-        )
+    def export_to_excel(self, output_file: str, streaming: bool = False):
+        """
+        Export aggregated data to Excel with multiple sheets
         
-        assignee_summary = detailed_df.groupby('Assignee').agg({
-            'Estimated Hours': 'sum',
-            'Remaining Hours': 'sum',
-            'Spent Hours': 'sum',
-            'Issue Key': 'count'
-        }).round(2)
-        assignee_summary.rename(columns={'Issue Key': 'Issue Count'}, inplace=True)
-        assignee_summary['Completion %'] = (
-            (assignee_summary['Spent Hours'] / assignee_summary['Estimated Hours'] * 100)
-            .fillna(0)
-            .round(1)
-        )
+        Args:
+            output_file: Path of the workbook to write
+            streaming: Write rows in openpyxl write-only mode (for large reports)
+        """
+        self.export_report(output_file, 'xlsx', streaming)
+    
+    def export_report(self, output: str, fmt: str = 'xlsx', streaming: bool = False) -> List[str]:
+        """
+        Export aggregated data as an Excel workbook or as columnar files
+        
+        Args:
+            output: Workbook path for xlsx, directory for parquet/feather/csv
+            fmt: One of xlsx, parquet, feather, csv
+            streaming: Write xlsx rows in openpyxl write-only mode (for large reports)
+        """
+        
+        if self.detailed_df is None or self.detailed_df.empty:
+            raise ValueError("No processed issues available. Run build_detailed_df() first.")
+        
+        print(f"\n📊 Exporting {fmt} report: {output}")
+        
+        detailed_df = self.detailed_df
+        grain = self.summary_grain()
+        summary_df = summarize(grain).reset_index()
+        
+        # Feature-only and assignee-only views are rolled up from the unrounded
+        # grain; only the written tables are rounded
+        rollups = grouping_sets(grain, REPORT_ROLLUPS)
         
-        # Write to Excel with multiple sheets
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            summary_df.to_excel(writer, sheet_name='Summary by Feature & Assignee', index=False)
-            detailed_df.to_excel(writer, sheet_name='Detailed Issues', index=False)
-            feature_summary.to_excel(writer, sheet_name='Summary by Feature')
-            assignee_summary.to_excel(writer, sheet_name='Summary by Assignee')
+        # Write the four report tables
+        paths = write_report(output, [
+            ('Summary by Feature & Assignee', summary_df, False),
+            ('Detailed Issues', detailed_df, False),
+            ('Summary by Feature', rollups['Summary by Feature'], True),
+            ('Summary by Assignee', rollups['Summary by Assignee'], True)
+        ], fmt, streaming)
         
-        print(f"✅ Excel export completed with 4 sheets")
+        if fmt == 'xlsx':
+            print(f"✅ Excel export completed with 4 sheets")
+        else:
+            print(f"✅ Export completed with {len(paths)} {fmt} files")
         
         # Show file info
-        file_size = os.path.getsize(output_file)
+        file_size = sum(os.path.getsize(path) for path in paths)
         print(f"📁 File size: {file_size:,} bytes")
+        return paths
+
+def list_sheets(excel_file: str) -> List[str]:
+    """Sheet names of a workbook, in workbook order"""
+    if os.path.splitext(excel_file)[1].lower() in ('.xlsx', '.xlsm'):
+        workbook = load_workbook(excel_file, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    with pd.ExcelFile(excel_file) as workbook:
+        return list(workbook.sheet_names)
+
+def header_names(header: Sequence[Any]) -> List[str]:
+    """
+    Column names for a header row as pandas.read_excel gives them: blank cells
+    become "Unnamed: i" and repeats are numbered name, name.1, name.2, ...
+    """
+    names = [str(name).strip() if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+    # Numbered names skip any name the header already has, e.g. a literal "Key.1"
+    taken = set(names)
+    counts: Dict[str, int] = {}
+    unique_names = []
+    for name in names:
+        unique = name
+        if name in counts:
+            while unique in taken:
+                counts[name] += 1
+                unique = f"{name}.{counts[name]}"
+            taken.add(unique)
+        else:
+            counts[name] = 0
+        unique_names.append(unique)
+    return unique_names
+
+def save_mapping_cache(cache: ColumnMappingCache):
+    """Write the column mapping cache; a cache that cannot be written only costs re-detection"""
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write column mapping cache {cache.path}: {e}")
+
+def _process_source(excel_file: str, sheet_name: Optional[str], options: dict):
+    """
+    Process one sheet in a worker process. The per-sheet output is captured
+    rather than interleaved with other workers; returns the detailed rows,
+    which of them have numbered placeholder keys, the column mappings
+    detected (for the parent to cache) and the warnings printed while
+    processing, or the error that stopped the sheet.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            aggregator = ExcelDataAggregator(excel_file, sheet_name, **options)
+            aggregator.write_mapping_cache = False
+            detailed_df = aggregator.build_detailed_df()
+            error = None
+        except Exception as e:
+            detailed_df, error = None, str(e)
+    
+    # Unparseable cells and similar per-row problems are reported with a warning sign
+    sheet_warnings = [line for line in output.getvalue().splitlines() if line.startswith('⚠️')]
+    if error is not None:
+        return None, None, [], sheet_warnings, error
+    return detailed_df, aggregator.generated_keys, aggregator.detected_mappings, sheet_warnings, None
+
+class ExcelBatchAggregator(ExcelDataAggregator):
+    """
+    Aggregates many workbooks (and optionally every sheet of each) into one
+    report. Sheets are processed in a process pool; the merged Detailed
+    Issues rows carry their source file and sheet, and issues found in
+    several sources are kept once, from the most recently modified file.
+    """
+    
+    def __init__(self, excel_files: List[str], all_sheets: bool = False, workers: Optional[int] = None,
+                 sheet_name: Optional[str] = None, chunk_size: int = 10000, **options):
+        """
+        Initialize with the workbooks to merge
+        
+        Args:
+            excel_files: Paths of the Excel files containing JIRA data
+            all_sheets: Read every sheet of each workbook instead of one
+            workers: Worker processes (default: one per CPU)
+            sheet_name, chunk_size, **options: As for ExcelDataAggregator
+        """
+        super().__init__(None, sheet_name, chunk_size, **options)
+        self.excel_files = excel_files
+        self.all_sheets = all_sheets
+        self.workers = workers or os.cpu_count() or 1
+        self.options = dict(options, chunk_size=chunk_size)
+    
+    def list_sources(self) -> List[Tuple[str, Optional[str]]]:
+        """(file, sheet) pairs to process, oldest file first"""
+        files = sorted(self.excel_files, key=lambda path: (os.path.getmtime(path), path))
+        if not self.all_sheets:
+            return [(path, self.sheet_name) for path in files]
+        return [(path, sheet) for path in files for sheet in list_sheets(path)]
+    
+    def build_detailed_df(self) -> pd.DataFrame:
+        """
+        Process every source into one detailed issue table with
+        Source File / Source Sheet provenance columns
+        """
+        sources = self.list_sources()
+        print(f"🔄 Processing {len(sources)} sheets from {len(self.excel_files)} files "
+              f"with {self.workers} workers...")
+        
+        frames = []
+        generated = []
+        self.detected_mappings = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(_process_source, path, sheet, self.options)
+                for path, sheet in sources
+            ]
+            # Results are collected in source order so the newest file wins below
+            for (path, sheet), future in zip(sources, futures):
+                detailed_df, generated_keys, detected, sheet_warnings, error = future.result()
+                self.detected_mappings.extend(detected)
+                label = f"{path} [{sheet or 'first sheet'}]"
+                
+                for warning in sheet_warnings:
+                    print(f"  {label}: {warning}")
+                if error is not None:
+                    print(f"⚠️  Warning: Skipping {label}: {error}")
+                    continue
+                
+                print(f"  ✅ {label}: {len(detailed_df)} issues")
+                frames.append(detailed_df.assign(**{
+                    'Source File': path,
+                    'Source Sheet': sheet or '',
+                    'Source Modified': datetime.fromtimestamp(os.path.getmtime(path))
+                }))
+                generated.append(generated_keys)
+        
+        # Workers only read the mapping cache; new mappings are written once, here
+        if self.mapping_cache and self.detected_mappings:
+            cache = ColumnMappingCache(self.mapping_cache)
+            for columns, mapping in self.detected_mappings:
+                cache.put(columns, mapping, save=False)
+            save_mapping_cache(cache)
+        
+        if frames:
+            merged = pd.concat(frames, ignore_index=True)
+            placeholders = pd.concat(generated, ignore_index=True)
+            # Keep the last (most recently modified) occurrence of each issue. Rows
+            # without a key are numbered per sheet (ISSUE-n), so those numbers say
+            # nothing about identity across sheets and such rows are all kept
+            older = merged['Issue Key'].where(~placeholders).duplicated(keep='last') & ~placeholders
+            self.detailed_df = merged[~older].reset_index(drop=True)
+            self.generated_keys = placeholders[~older].reset_index(drop=True)
+            duplicates = int(older.sum())
+            if duplicates:
+                print(f"🔁 Dropped {duplicates} older copies of issues found in several sources")
+        else:
+            self.detailed_df = pd.DataFrame(columns=DETAIL_COLUMNS + SOURCE_COLUMNS)
+            self.generated_keys = pd.Series(dtype=bool)
+        
+        self.running_summary = None
+        self._processed_issues = None
+        print(f"✅ Successfully processed {len(self.detailed_df)} issues")
+        return self.detailed_df
 
 def main():
     """Main function"""
@@ -444,29 +647,80 @@ Examples:
   python excel_data_aggregator.py issues.xlsx --sheet "JIRA Export"
   python excel_data_aggregator.py issues.xlsx --output report.xlsx
   python excel_data_aggregator.py issues.xlsx --console-only
+  python excel_data_aggregator.py issues.xlsx --streaming-export
+  python excel_data_aggregator.py big_export.xlsx --chunk-size 50000
+  python excel_data_aggregator.py issues.xlsx --format parquet --output snapshot/
+  python excel_data_aggregator.py issues.xlsx --mapping-file columns.json
+  python excel_data_aggregator.py --glob 'drops/*.xlsx' --all-sheets --workers 8
+  python excel_data_aggregator.py big_export.xlsx --console-only --profile run.prof --trace-memory
         """
     )
     
-    parser.add_argument('excel_file', help='Path to Excel file containing JIRA data')
+    parser.add_argument('excel_file', nargs='?', help='Path to Excel file containing JIRA data')
     parser.add_argument('--sheet', '-s', help='Specific sheet name to read')
-    parser.add_argument('--output', '-o', help='Output Excel filename')
+    parser.add_argument('--glob', '-g', action='append', default=[], help='Merge every Excel file matching this pattern (repeatable)')
+    parser.add_argument('--all-sheets', action='store_true', help='Read every sheet of each workbook')
+    parser.add_argument('--workers', '-w', type=int, help='Worker processes for --glob/--all-sheets (default: one per CPU)')
+    parser.add_argument('--output', '-o', help='Output Excel filename (directory for parquet/feather/csv)')
+    parser.add_argument('--format', '-f', choices=REPORT_FORMATS, default='xlsx', help='Report output format (default: xlsx)')
     parser.add_argument('--console-only', action='store_true', help='Only print to console, no Excel export')
+    parser.add_argument('--hours-per-day', type=float, default=DEFAULT_HOURS_PER_DAY, help='Hours in a "1d" duration (default: 8)')
+    parser.add_argument('--hours-per-week', type=float, default=DEFAULT_HOURS_PER_WEEK, help='Hours in a "1w" duration (default: 40)')
+    parser.add_argument('--mapping-file', help='JSON file of field -> column to use instead of detecting the mapping')
+    parser.add_argument('--mapping-cache', help=f'Column mapping cache file (default: {DEFAULT_MAPPING_CACHE} next to the Excel file)')
+    parser.add_argument('--no-mapping-cache', action='store_true', help='Always detect column mappings, without reading or writing the cache')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Rows read and processed per chunk (default: 10000)')
+    parser.add_argument('--streaming-export', action='store_true', help='Write the Excel report in write-only streaming mode (faster, lower memory, unstyled)')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
+    if not args.excel_file and not args.glob:
+        parser.error('an Excel file or --glob is required')
+    if args.all_sheets and args.sheet:
+        parser.error('--sheet cannot be combined with --all-sheets')
+    
+    profiler = StageProfiler(args.profile, args.trace_memory)
     try:
-        # Initialize aggregator
-        aggregator = ExcelDataAggregator(args.excel_file, args.sheet)
-        
-        # Process data
-        issues = aggregator.process_excel_data()
+        excel_files = [args.excel_file] if args.excel_file else []
+        for pattern in args.glob:
+            excel_files.extend(sorted(glob.glob(pattern, recursive=True)))
+        if not excel_files:
+            raise FileNotFoundError(f"No Excel files match {', '.join(args.glob)}")
+        
+        if args.no_mapping_cache:
+            mapping_cache = None
+        else:
+            mapping_cache = args.mapping_cache or os.path.join(
+                os.path.dirname(os.path.abspath(excel_files[0])), DEFAULT_MAPPING_CACHE
+            )
+        
+        options = dict(
+            hours_per_day=args.hours_per_day,
+            hours_per_week=args.hours_per_week,
+            mapping_file=args.mapping_file,
+            mapping_cache=mapping_cache
+        )
         
-        if not issues:
+        # Initialize aggregator
+        if args.glob or args.all_sheets:
+            aggregator = ExcelBatchAggregator(
+                excel_files, args.all_sheets, args.workers, args.sheet, args.chunk_size, **options
+            )
+        else:
+            aggregator = ExcelDataAggregator(args.excel_file, args.sheet, args.chunk_size, **options)
+        
+        # Process data (reading the workbook and extracting issues)
+        with profiler.stage('extract'):
+            detailed_df = aggregator.build_detailed_df()
+        
+        if detailed_df.empty:
             print("❌ No issues found in Excel file")
             return
         
         # Create summary
-        summary_df = aggregator.create_aggregated_summary()
+        with profiler.stage('aggregate'):
+            summary_df = aggregator.create_aggregated_summary()
         
         # Print console output
         aggregator.print_console_summary(summary_df)
@@ -476,17 +730,22 @@ Examples:
             if args.output:
                 output_file = args.output
             else:
-                base_name = os.path.splitext(os.path.basename(args.excel_file))[0]
+                base_name = os.path.splitext(os.path.basename(args.excel_file))[0] if not args.glob else 'batch'
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                output_file = f"{base_name}_aggregated_{timestamp}.xlsx"
+                output_file = f"{base_name}_aggregated_{timestamp}"
+                if args.format == 'xlsx':
+                    output_file += '.xlsx'
             
-            aggregator.export_to_excel(output_file)
+            with profiler.stage('export'):
+                aggregator.export_report(output_file, args.format, args.streaming_export)
         
         print(f"\n🎉 Processing completed successfully!")
         
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
+    finally:
+        profiler.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+JIRA Feature Resolver
+Resolves the feature of each issue through the issue hierarchy rather than
+only its own Epic Link: the `parent` field, the Epic Link field and epic or
+feature issue links are followed upwards (sub-task -> story -> epic ->
+feature/initiative). Parents missing from the local index are collected
+across a whole page of results and fetched in bulk `key in (...)` queries,
+level by level; the resulting key -> (parent, issue type) index is kept in a
+SQLite cache with a TTL so later runs only fetch what expired.
+"""
+
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+from field_projection import KEY_BATCH_SIZE, LINK_FIELD
+
+logger = logging.getLogger(__name__)
+
+# New-style hierarchy field: sub-task -> parent, story -> epic, epic -> feature
+PARENT_FIELD = 'parent'
+
+# Issue types (matched case-insensitively as substrings) that count as features;
+# the highest matching ancestor is used, so an epic under a feature resolves to the feature
+DEFAULT_FEATURE_TYPES = ('epic', 'feature')
+
+DEFAULT_HIERARCHY_CACHE = 'jira_hierarchy_cache.sqlite'
+DEFAULT_HIERARCHY_TTL_HOURS = 24.0
+
+NO_FEATURE_LINK = 'No Feature Link'
+
+# Issue link types naming an issue's epic or feature. 'relates' is symmetric,
+# so it is only used for an issue's own Feature Link, never to climb the hierarchy
+HIERARCHY_LINK_TYPES = ('epic-story', 'feature-story')
+FEATURE_LINK_TYPES = HIERARCHY_LINK_TYPES + ('relates',)
+
+# (parent key, issue type name); the parent is None at the top of the hierarchy
+Node = Tuple[Optional[str], str]
+
+class HierarchyCache:
+    """Persists issue key -> (parent key, issue type) in SQLite, expiring entries after a TTL"""
+    
+    def __init__(self, path: str, ttl_hours: float = DEFAULT_HIERARCHY_TTL_HOURS):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS hierarchy (
+                key TEXT PRIMARY KEY,
+                parent TEXT,
+                issue_type TEXT NOT NULL,
+                fetched REAL NOT NULL
+            );
+        """)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+    
+    def load(self) -> Dict[str, Node]:
+        """Every entry younger than the TTL; expired entries are dropped"""
+        cutoff = time.time() - self.ttl_seconds
+        with self.conn:
+            self.conn.execute('DELETE FROM hierarchy WHERE fetched < ?', (cutoff,))
+        rows = self.conn.execute('SELECT key, parent, issue_type FROM hierarchy')
+        return {key: (parent, issue_type) for key, parent, issue_type in rows}
+    
+    def put(self, nodes: Dict[str, Node]):
+        """Store or refresh entries"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO hierarchy (key, parent, issue_type, fetched) VALUES (?, ?, ?, ?)',
+                [(key, parent, issue_type, now) for key, (parent, issue_type) in nodes.items()]
+            )
+
+class FeatureResolver:
+    """Feature Link per issue from the issue hierarchy, using the aggregator's session"""
+    
+    def __init__(self, aggregator, cache: Optional[HierarchyCache] = None,
+                 feature_types: Sequence[str] = DEFAULT_FEATURE_TYPES):
+        self.aggregator = aggregator
+        self.cache = cache
+        self.feature_types = tuple(t.lower() for t in feature_types)
+        self.index: Dict[str, Node] = cache.load() if cache else {}
+        self.fetched = 0  # Ancestors fetched from JIRA (cache misses)
+        
+        epic_link_field = aggregator.config.epic_link_field
+        self.node_fields = ','.join(filter(None, ['issuetype', PARENT_FIELD, epic_link_field, LINK_FIELD]))
+    
+    def node(self, fields: Dict[str, Any]) -> Node:
+        """An issue's parent (parent field, else Epic Link or epic-story/feature-story link) and type"""
+        parent = (fields.get(PARENT_FIELD) or {}).get('key')
+        if not parent:
+            link = self.aggregator._extract_feature_link(fields, HIERARCHY_LINK_TYPES)
+            parent = link if link != NO_FEATURE_LINK else None
+        return parent, (fields.get('issuetype') or {}).get('name', '')
+    
+    def resolve(self, issues: List[Dict[str, Any]]) -> List[str]:
+        """
+        Feature Link of each issue: its highest ancestor of a feature type,
+        else its own Epic Link or linked epic as before
+        """
+        nodes = {issue.get('key', ''): self.node(issue.get('fields') or {}) for issue in issues}
+        # Issues in the result are often the parents of others (sub-tasks, epics)
+        self._add(nodes)
+        self.fetch_ancestors(parent for parent, _ in nodes.values() if parent)
+        
+        memo: Dict[str, Optional[str]] = {}
+        features = []
+        for issue in issues:
+            parent, _ = nodes[issue.get('key', '')]
+            features.append(self._feature_of(parent, memo) if parent else None)
+        
+        # A projected search left out the links of issues with a parent;
+        # fetch them for the issues whose chain found no feature
+        unresolved = [issue for issue, feature in zip(issues, features) if feature is None]
+        self.aggregator.complete_issue_links(unresolved, skip_parented=False)
+        return [
+            feature or self.aggregator._extract_feature_link(issue.get('fields') or {})
+            for issue, feature in zip(issues, features)
+        ]
+    
+    def fetch_ancestors(self, keys: Iterable[str]):
+        """Fetch every ancestor of `keys` missing from the index, one hierarchy level per round"""
+        pending = {key for key in keys if key not in self.index}
+        while pending:
+            nodes = self._fetch_nodes(sorted(pending))
+            # Keys JIRA did not return (deleted, moved or not visible) end the walk
+            nodes.update({key: (None, '') for key in pending if key not in nodes})
+            self._add(nodes)
+            self.fetched += len(pending)
+            pending = {parent for parent, _ in nodes.values() if parent and parent not in self.index}
+    
+    def _add(self, nodes: Dict[str, Node]):
+        self.index.update(nodes)
+        if self.cache:
+            self.cache.put(nodes)
+    
+    def _fetch_nodes(self, keys: List[str]) -> Dict[str, Node]:
+        """Fetch the hierarchy fields of issues by key, batches in parallel"""
+        url = f"{self.aggregator.config.base_url}/rest/api/3/search"
+        key_iter = iter(keys)
+        batches = list(iter(lambda: list(islice(key_iter, KEY_BATCH_SIZE)), []))
+        
+        def fetch(batch: List[str]) -> List[Dict[str, Any]]:
+            params = {
+                'jql': f"key in ({','.join(batch)})",
+                'fields': self.node_fields,
+                'maxResults': len(batch),
+                # Unknown keys would otherwise fail the whole batch
+                'validateQuery': 'warn'
+            }
+            response = self.aggregator.session.get(url, params=params)
+            response.raise_for_status()
+            return response.json().get('issues', [])
+        
+        nodes = {}
+        with ThreadPoolExecutor(max_workers=max(self.aggregator.config.workers, 1)) as executor:
+            try:
+                for issues in executor.map(fetch, batches):
+                    for issue in issues:
+                        nodes[issue['key']] = self.node(issue.get('fields') or {})
+            except requests.RequestException as e:
+                logger.error(f"Error fetching parent issues: {e}")
+                raise
+        return nodes
+    
+    def _feature_of(self, key: str, memo: Dict[str, Optional[str]]) -> Optional[str]:
+        """Highest issue of a feature type at or above `key`"""
+        if key in memo:
+            return memo[key]
+        # Placeholder guards against cycles in malformed hierarchies
+        memo[key] = None
+        
+        parent, issue_type = self.index.get(key, (None, ''))
+        above = self._feature_of(parent, memo) if parent else None
+        issue_type = issue_type.lower()
+        memo[key] = above or (key if any(t in issue_type for t in self.feature_types) else None)
+        return memo[key]
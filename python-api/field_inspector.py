@@ -7,19 +7,16 @@ Utility to discover available fields in your JIRA instance
 import requests
 import json
 import sys
-from jira_data_aggregator import JiraConfig
+from jira_config import JiraConfig
+from jira_http import get_session
+from field_projection import LINK_FIELD, FieldProjection, field_sizes
 
 class JiraFieldInspector:
     """Utility class to inspect JIRA fields and custom fields"""
     
     def __init__(self, config: JiraConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.auth = (config.username, config.api_token)
-        self.session.headers.update({
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        })
+        self.session = get_session(config)
     
     def get_all_fields(self):
         """Get all available fields in JIRA instance"""
@@ -33,29 +30,80 @@ class JiraFieldInspector:
             print(f"Error fetching fields: {e}")
             return []
     
-    def get_sample_issue_fields(self, jql: str = None):
+    def get_sample_issue_fields(self, jql: str = None, fields: str = '*all'):
         """Get fields from a sample issue to see actual data structure"""
+        try:
+            _, issues = self._search_sample(jql, fields, 1)
+            if issues:
+                return issues[0].get('fields', {})
+            return {}
+        except requests.RequestException as e:
+            print(f"Error fetching sample issue: {e}")
+            return {}
+    
+    def _search_sample(self, jql: str, fields: str, max_results: int):
+        """Search a sample of issues, returning the response size in bytes and the issues"""
         if jql is None:
             jql = "ORDER BY created DESC"
         
         url = f"{self.config.base_url}/rest/api/3/search"
         params = {
             'jql': jql,
-            'maxResults': 1,
-            'fields': '*all'
+            'maxResults': max_results,
+            'fields': fields
         }
         
+        response = self.session.get(url, params=params)
+        response.raise_for_status()
+        return len(response.content), response.json().get('issues', [])
+    
+    def print_projection_report(self, jql: str = None, sample_size: int = 100):
+        """
+        Compare the payload of the report's projected search fields with the
+        unprojected field list on a sample of issues, and show which fields
+        take up the most of it
+        """
+        print("\n" + "=" * 50)
+        print("SEARCH PAYLOAD BY FIELD PROJECTION")
+        print("=" * 50)
+        
+        projection = FieldProjection(self.config.epic_link_field)
+        unprojected = FieldProjection(self.config.epic_link_field, enabled=False)
+        
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('issues'):
-                return data['issues'][0].get('fields', {})
-            return {}
+            full_bytes, issues = self._search_sample(jql, unprojected.search_fields(), sample_size)
+            projected_bytes, projected = self._search_sample(jql, projection.search_fields(), sample_size)
         except requests.RequestException as e:
-            print(f"Error fetching sample issue: {e}")
-            return {}
+            print(f"Error fetching sample issues: {e}")
+            return
+        
+        if not issues or not projected:
+            print("No sample issues found")
+            return
+        
+        # Issues without an Epic Link still need their links, fetched separately
+        links = {issue['key']: (issue.get('fields') or {}).get(LINK_FIELD) for issue in issues}
+        needing_links = [issue['key'] for issue in projected if projection.needs_links(issue)]
+        link_bytes = sum(len(json.dumps(links.get(key) or [])) for key in needing_links)
+        
+        full_per_issue = full_bytes / len(issues)
+        projected_per_issue = (projected_bytes + link_bytes) / len(projected)
+        saved = full_per_issue - projected_per_issue
+        
+        print(f"Sample size:              {len(issues)} issues")
+        print(f"Epic Link field:          {projection.epic_link_field or '(none, issuelinks always requested)'}")
+        print(f"Unprojected fields:       {full_per_issue:,.0f} bytes per issue")
+        print(f"Projected fields:         {projected_per_issue:,.0f} bytes per issue "
+              f"({len(needing_links)} issues need a separate link lookup)")
+        print(f"Saved:                    {saved:,.0f} bytes per issue "
+              f"({saved / full_per_issue * 100 if full_per_issue else 0:.0f}%)")
+        
+        print("\n📦 PAYLOAD SHARE BY FIELD (unprojected)")
+        print("-" * 40)
+        sizes = field_sizes(issues)
+        total = sum(sizes.values()) or 1
+        for field, size in sizes.items():
+            print(f"  {field:<30} | {size / len(issues):>8,.0f} bytes/issue | {size / total * 100:>5.1f}%")
     
     def print_field_summary(self):
         """Print a summary of all available fields"""
@@ -120,13 +168,13 @@ class JiraFieldInspector:
             if any(keyword in field_name_lower for keyword in epic_keywords):
                 print(f"  {field['id']:<25} | {field['name']}")
     
-    def print_sample_issue_structure(self, jql: str = None):
+    def print_sample_issue_structure(self, jql: str = None, fields: str = '*all'):
         """Print the structure of a sample issue"""
         print("\n" + "=" * 50)
         print("SAMPLE ISSUE FIELD STRUCTURE")
         print("=" * 50)
         
-        sample_fields = self.get_sample_issue_fields(jql)
+        sample_fields = self.get_sample_issue_fields(jql, fields)
         if not sample_fields:
             print("No sample issue found")
             return
@@ -196,6 +244,9 @@ def main():
     parser = argparse.ArgumentParser(description='JIRA Field Inspector')
     parser.add_argument('--config', '-c', help='Configuration file path', default='config.json')
     parser.add_argument('--sample-jql', help='JQL query to get sample issue')
+    parser.add_argument('--sample-fields', default='*all', help='Fields to request for the sample issue (default: *all)')
+    parser.add_argument('--projection-report', action='store_true', help='Compare search payload sizes with and without field projection')
+    parser.add_argument('--sample-size', type=int, default=100, help='Issues sampled for --projection-report (default: 100)')
     parser.add_argument('--use-env', action='store_true', help='Use environment variables')
     
     args = parser.parse_args()
@@ -213,7 +264,10 @@ def main():
         inspector.print_field_summary()
         
         # Print sample issue structure
-        inspector.print_sample_issue_structure(args.sample_jql)
+        inspector.print_sample_issue_structure(args.sample_jql, args.sample_fields)
+        
+        if args.projection_report:
+            inspector.print_projection_report(args.sample_jql, args.sample_size)
         
     except Exception as e:
         print(f"Error: {e}")
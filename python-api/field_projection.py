@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+JIRA Field Projection
+Works out the smallest set of search fields the report extraction reads.
+issuelinks is usually most of a search payload but is only needed to find
+the feature of issues without an Epic Link, so with an Epic Link field
+configured the search leaves it out and only the issues whose Epic Link is
+empty are re-queried for their links. Also measures per-field payload sizes
+so the saving can be reported.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+# Fields read by JiraDataAggregator.create_summary_report; the issue key is
+# always returned by the search API and needs no field
+REPORT_FIELDS = (
+    'summary', 'status', 'assignee', 'priority', 'issuetype', 'created', 'updated',
+    'timeoriginalestimate', 'aggregatetimeoriginalestimate',
+    'timeestimate', 'aggregatetimeestimate',
+    'timespent', 'aggregatetimespent'
+)
+
+LINK_FIELD = 'issuelinks'
+
+# Epic Link (commonly used for feature links)
+DEFAULT_EPIC_LINK_FIELD = 'customfield_10014'
+
+# Requested by every search before projection; timetracking is never read
+UNPROJECTED_FIELDS = REPORT_FIELDS + ('timetracking', LINK_FIELD)
+
+# Issue keys per `key in (...)` query when fetching missing links
+KEY_BATCH_SIZE = 100
+
+class FieldProjection:
+    """Search field list for the configured extraction"""
+    
+    def __init__(self, epic_link_field: Optional[str] = DEFAULT_EPIC_LINK_FIELD, enabled: bool = True):
+        self.epic_link_field = epic_link_field or None
+        self.enabled = enabled
+        self.parent_field: Optional[str] = None  # Set when features are resolved through `parent`
+    
+    @property
+    def defers_links(self) -> bool:
+        """True if issuelinks is left out of searches and fetched per issue when needed"""
+        return self.enabled and self.epic_link_field is not None
+    
+    def search_fields(self, additional_fields: Optional[List[str]] = None) -> str:
+        """Comma-separated field list for a report search"""
+        fields = list(REPORT_FIELDS if self.enabled else UNPROJECTED_FIELDS)
+        if self.epic_link_field:
+            fields.append(self.epic_link_field)
+        if self.parent_field:
+            fields.append(self.parent_field)
+        if not self.defers_links:
+            fields.append(LINK_FIELD)
+        if additional_fields:
+            fields.extend(additional_fields)
+        
+        # Drop duplicates but keep a stable order, so identical searches share URLs
+        return ','.join(dict.fromkeys(fields))
+    
+    def needs_links(self, issue: Dict[str, Any], skip_parented: bool = True) -> bool:
+        """
+        True if an issue's feature can only be found through its issue links.
+        When features are resolved through `parent`, issues with a parent are
+        skipped unless skip_parented is False: the resolver asks for their
+        links only if no feature is found above them.
+        """
+        fields = issue.get('fields') or {}
+        if skip_parented and self.parent_field and fields.get(self.parent_field):
+            return False
+        return self.defers_links and not fields.get(self.epic_link_field) and LINK_FIELD not in fields
+
+def field_sizes(issues: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Serialized JSON bytes per field, summed over issues, largest first"""
+    sizes: Dict[str, int] = {}
+    for issue in issues:
+        for field, value in (issue.get('fields') or {}).items():
+            sizes[field] = sizes.get(field, 0) + len(json.dumps(value, separators=(',', ':')))
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
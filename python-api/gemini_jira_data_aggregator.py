@@ -1,102 +1,203 @@
+import argparse
 import pandas as pd
-from datetime import datetime, timedelta
-from jira import JIRA # Make sure to install this: pip install jira
+from jira_data_aggregator import JiraConfig, JiraDataAggregator
+from worklog_fetcher import WorklogFetcher
+from worklog_store import WorklogStore
+from stage_profiler import StageProfiler, add_profile_arguments
 
 # --- JIRA API Configuration ---
 # IMPORTANT: Replace with your Jira instance details and credentials
 JIRA_SERVER = 'YOUR_JIRA_INSTANCE_URL' # e.g., 'https://yourcompany.atlassian.net'
 JIRA_USERNAME = 'YOUR_JIRA_USERNAME'   # e.g., 'your.email@example.com'
 JIRA_API_TOKEN = 'YOUR_JIRA_API_TOKEN' # Generate this in your Jira account settings
+JIRA_WORKERS = 8 # Concurrent requests for search pages and worklog pages
 
-def fetch_jira_worklogs(jql_query, max_results=1000):
+# Time buckets for analyze_time_tracking
+GRANULARITIES = ('day', 'week', 'month', 'sprint')
+PERIOD_COLUMNS = {'day': 'Day', 'week': 'Week Start', 'month': 'Month Start', 'sprint': 'Sprint Start'}
+SPRINT_START = '2024-01-01' # First day of any sprint; sprints repeat every SPRINT_LENGTH_DAYS
+SPRINT_LENGTH_DAYS = 14
+SHEET_NAMES = {
+    'Day': 'Daily Time Analysis',
+    'Week Start': 'Weekly Time Analysis',
+    'Month Start': 'Monthly Time Analysis',
+    'Sprint Start': 'Sprint Time Analysis'
+}
+
+# Local worklog store used by --incremental
+WORKLOG_STORE = 'jira_worklog_store.sqlite'
+
+def connect_to_jira():
+    """
+    Creates the Jira client and checks the credentials.
+    """
+    config = JiraConfig(JIRA_SERVER, JIRA_USERNAME, JIRA_API_TOKEN, workers=JIRA_WORKERS)
+    jira = JiraDataAggregator(config)
+    if not jira.test_connection():
+        raise ConnectionError(f"Could not connect to Jira server: {JIRA_SERVER}")
+    print(f"Successfully connected to Jira server: {JIRA_SERVER}")
+    return jira
+
+def fetch_jira_worklogs(jql_query, max_results=None):
     """
     Fetches worklog data from Jira based on a JQL query.
+    Every matching issue is fetched (search pagination) unless max_results
+    limits it, and issues with more worklogs than Jira embeds in search
+    results have their full worklog fetched page by page.
     """
     try:
         # Authenticate with Jira
-        jira_options = {'server': JIRA_SERVER}
-        jira = JIRA(options=jira_options, basic_auth=(JIRA_USERNAME, JIRA_API_TOKEN))
-        print(f"Successfully connected to Jira server: {JIRA_SERVER}")
+        fetcher = WorklogFetcher(connect_to_jira())
 
-        # Search for issues using the provided JQL query
-        # We need to expand 'worklog' to get the time logged details
-        issues = jira.search_issues(jql_query, expand='changelog,worklog', maxResults=max_results)
-        print(f"Found {len(issues)} issues matching the JQL query.")
+        # Collect the worklog rows column by column
+        dates, feature_links, assignees, seconds = [], [], [], []
+        issue_count = 0
 
-        all_worklog_data = []
+        for issue, worklogs in fetcher.iter_worklogs(jql_query, fields=['assignee']):
+            if max_results is not None and issue_count >= max_results:
+                break
+            issue_count += 1
 
-        for issue in issues:
             # Extract Feature Link (assuming it's the issue key or a custom field)
-            # For simplicity, we'll use issue.key as 'Feature Link'.
-            # If 'Feature Link' is a custom field, you'd access it like issue.fields.customfield_XXXXX
-            feature_link = issue.key
+            # For simplicity, we'll use the issue key as 'Feature Link'.
+            # If 'Feature Link' is a custom field, add it to fields= above and read it from issue['fields']
+            feature_link = issue['key']
 
             # Extract Assignee
-            assignee_name = issue.fields.assignee.displayName if issue.fields.assignee else 'Unassigned'
+            assignee = issue['fields'].get('assignee')
+            assignee_name = assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
 
             # Iterate through worklogs for each issue
-            for worklog in issue.fields.worklog.worklogs:
-                # Jira stores time spent in seconds
-                time_spent_seconds = worklog.timeSpentSeconds
-                time_logged_hours = round(time_spent_seconds / 3600, 2) # Convert seconds to hours
-
-                # Worklog creation date
-                worklog_date = datetime.strptime(worklog.started[:10], '%Y-%m-%d') # Extract YYYY-MM-DD
-
-                all_worklog_data.append({
-                    'Date': worklog_date.strftime('%Y-%m-%d'),
-                    'Feature Link': feature_link,
-                    'Assignee': assignee_name,
-                    'Time Logged (Hours)': time_logged_hours
-                })
+            for worklog in worklogs:
+                # Worklog start date (YYYY-MM-DD); Jira stores time spent in seconds
+                dates.append(worklog['started'][:10])
+                feature_links.append(feature_link)
+                assignees.append(assignee_name)
+                seconds.append(worklog.get('timeSpentSeconds', 0))
+
+        print(f"Found {issue_count} issues matching the JQL query "
+              f"({fetcher.truncated_issues} needed their full worklog fetched).")
+
         print("Worklog data extracted from Jira issues.")
-        return pd.DataFrame(all_worklog_data)
+        return pd.DataFrame({
+            'Date': dates,
+            'Feature Link': feature_links,
+            'Assignee': assignees,
+            'Time Logged (Hours)': (pd.Series(seconds, dtype=float) / 3600).round(2) # Convert seconds to hours
+        })
 
     except Exception as e:
         print(f"An error occurred while fetching data from Jira: {e}")
         return pd.DataFrame() # Return an empty DataFrame on error
 
-def analyze_time_tracking(df):
+def sync_jira_worklogs(jql_query, store_path=WORKLOG_STORE, full_refresh=False):
+    """
+    Syncs the worklogs of the issues matching a JQL query into a local store,
+    fetching only worklogs added, changed or deleted since the last run, and
+    returns them in the same shape as fetch_jira_worklogs.
+    """
+    try:
+        fetcher = WorklogFetcher(connect_to_jira())
+
+        with WorklogStore(store_path) as store:
+            fetcher.sync(store, jql_query, full_refresh)
+            df = store.load_worklogs(jql_query)
+
+        print(f"Worklog store '{store_path}' holds {len(df)} worklogs for the JQL query.")
+        return df
+
+    except Exception as e:
+        print(f"An error occurred while syncing worklogs from Jira: {e}")
+        return pd.DataFrame() # Return an empty DataFrame on error
+
+def add_time_buckets(df, granularity='week', sprint_start=SPRINT_START, sprint_length=SPRINT_LENGTH_DAYS):
+    """
+    Adds a period start column ('Day', 'Week Start', 'Month Start' or
+    'Sprint Start') computed for the whole 'Date' column at once.
+    Weeks start on Monday; sprints are fixed-length cycles counted from
+    sprint_start. Returns the new DataFrame and the period column name.
+    """
+    # Dates arrive as 'YYYY-MM-DD' strings; an explicit format avoids per-row inference
+    dates = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+
+    if granularity == 'day':
+        periods = dates
+    elif granularity == 'week':
+        # This sets the date to the beginning of the week (Monday)
+        periods = dates - pd.to_timedelta(dates.dt.weekday, unit='D')
+    elif granularity == 'month':
+        periods = dates.dt.to_period('M').dt.start_time
+    elif granularity == 'sprint':
+        anchor = pd.Timestamp(sprint_start)
+        sprint_index = (dates - anchor).dt.days // sprint_length
+        periods = anchor + pd.to_timedelta(sprint_index * sprint_length, unit='D')
+    else:
+        raise ValueError(f"Unknown granularity: {granularity} (expected one of {GRANULARITIES})")
+
+    period_column = PERIOD_COLUMNS[granularity]
+    return df.assign(**{'Date': dates, period_column: periods}), period_column
+
+def analyze_time_tracking(df, granularity='week', sprint_start=SPRINT_START, sprint_length=SPRINT_LENGTH_DAYS):
     """
     Performs time tracking analysis, grouping by Feature Link and Assignee,
-    and summing time logged on a weekly basis.
+    and summing time logged per day, week (default), month or sprint.
     """
     if df.empty:
         print("No data to analyze. Please check your Jira connection or JQL query.")
         return pd.DataFrame()
 
-    # Convert 'Date' column to datetime objects
-    df['Date'] = pd.to_datetime(df['Date'])
+    df, period_column = add_time_buckets(df, granularity, sprint_start, sprint_length)
 
-    # Create a 'Week Start' column to group by week
-    # This sets the date to the beginning of the week (Monday)
-    df['Week Start'] = df['Date'].apply(lambda x: x - timedelta(days=x.weekday()))
+    # Group by 'Feature Link', 'Assignee' and the period, then sum 'Time Logged'
+    # (groupby sorts the keys, so the result is already ordered for readability)
+    grouped_df = df.groupby(['Feature Link', 'Assignee', period_column])['Time Logged (Hours)'].sum().reset_index()
+
+    return grouped_df
 
-    # Group by 'Feature Link', 'Assignee', and 'Week Start', then sum 'Time Logged'
-    grouped_df = df.groupby(['Feature Link', 'Assignee', 'Week Start'])['Time Logged (Hours)'].sum().reset_index()
+def pivot_time_tracking(grouped_df):
+    """
+    Wide view of an analyze_time_tracking result: one row per assignee, one
+    column per period, plus a Total column.
+    """
+    if grouped_df.empty:
+        return pd.DataFrame()
 
-    # Sort the results for better readability
-    grouped_df = grouped_df.sort_values(by=['Feature Link', 'Assignee', 'Week Start'])
+    period_column = grouped_df.columns[2]
+    pivot_df = grouped_df.pivot_table(
+        index='Assignee',
+        columns=period_column,
+        values='Time Logged (Hours)',
+        aggfunc='sum',
+        fill_value=0
+    )
+    pivot_df.columns = [period.strftime('%Y-%m-%d') for period in pivot_df.columns]
+    pivot_df['Total'] = pivot_df.sum(axis=1)
 
-    return grouped_df
+    return pivot_df.round(2).reset_index()
 
-def export_to_excel(df, filename="TimeTrackingAnalysis_Jira.xlsx"):
+def export_to_excel(df, filename="TimeTrackingAnalysis_Jira.xlsx", pivot_df=None):
     """
     Exports the DataFrame to an Excel file with proper formatting.
+    If pivot_df (from pivot_time_tracking) is given it is written to a
+    second 'Hours by Assignee' sheet.
     """
     if df.empty:
         print("No data to export to Excel.")
         return
 
+    # e.g. 'Weekly Time Analysis' for the 'Week Start' column
+    period_column = df.columns[2]
+    sheet_name = SHEET_NAMES.get(period_column, 'Time Analysis')
+
     try:
         # Create a Pandas Excel writer using XlsxWriter as the engine.
         with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
             # Write the DataFrame to a specific sheet
-            df.to_excel(writer, sheet_name='Weekly Time Analysis', index=False)
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
 
             # Get the xlsxwriter workbook and worksheet objects.
             workbook = writer.book
-            worksheet = writer.sheets['Weekly Time Analysis']
+            worksheet = writer.sheets[sheet_name]
 
             # Add some formatting
             header_format = workbook.add_format({
@@ -114,9 +215,20 @@ def export_to_excel(df, filename="TimeTrackingAnalysis_Jira.xlsx"):
             # Set column widths for better readability
             worksheet.set_column('A:A', 20) # Feature Link (increased width)
             worksheet.set_column('B:B', 20) # Assignee (increased width)
-            worksheet.set_column('C:C', 15) # Week Start
+            worksheet.set_column('C:C', 15) # Period start (Week Start by default)
             worksheet.set_column('D:D', 20) # Time Logged (Hours)
 
+            if pivot_df is not None and not pivot_df.empty:
+                pivot_df.to_excel(writer, sheet_name='Hours by Assignee', index=False)
+                pivot_sheet = writer.sheets['Hours by Assignee']
+
+                for col_num, value in enumerate(pivot_df.columns.values):
+                    pivot_sheet.write(0, col_num, value, header_format)
+
+                pivot_sheet.set_column(0, 0, 20) # Assignee
+                pivot_sheet.set_column(1, len(pivot_df.columns) - 1, 12) # One column per period
+                pivot_sheet.freeze_panes(1, 1)
+
         print(f"Successfully created '{filename}'")
     except Exception as e:
         print(f"An error occurred while exporting to Excel: {e}")
@@ -130,22 +242,48 @@ if __name__ == "__main__":
     # "issuetype = Story AND statusCategory = 'Done'"
     JQL_QUERY = "project = 'YOUR_PROJECT_KEY' AND worklogDate >= '2024-01-01' ORDER BY updated DESC"
 
-    # 1. Fetch data from Jira
-    print("Fetching time tracking data from Jira...")
-    jira_data_df = fetch_jira_worklogs(JQL_QUERY)
-    if not jira_data_df.empty:
-        print("Data fetched successfully from Jira.")
-        # print(jira_data_df.head()) # Uncomment to see the raw Jira data
-
-        # 2. Analyze the data
-        print("Analyzing time tracking data...")
-        analyzed_df = analyze_time_tracking(jira_data_df)
-        print("Analysis complete.")
-        # print(analyzed_df.head()) # Uncomment to see the analyzed data
-
-        # 3. Export to Excel
-        print("Exporting analyzed data to Excel...")
-        export_to_excel(analyzed_df, "TimeTrackingAnalysis_Jira.xlsx")
-        print("Process finished.")
-    else:
-        print("No data retrieved from Jira. Excel file will not be generated.")
+    parser = argparse.ArgumentParser(description='Time tracking analysis from Jira worklogs')
+    parser.add_argument('--jql', default=JQL_QUERY, help='JQL query selecting the issues to analyze')
+    parser.add_argument('--output', '-o', default='TimeTrackingAnalysis_Jira.xlsx', help='Excel output filename')
+    parser.add_argument('--granularity', '-g', choices=GRANULARITIES, default='week', help='Time bucket for the analysis (default: week)')
+    parser.add_argument('--sprint-start', default=SPRINT_START, help=f'First day of any sprint, for --granularity sprint (default: {SPRINT_START})')
+    parser.add_argument('--sprint-length', type=int, default=SPRINT_LENGTH_DAYS, help=f'Sprint length in days (default: {SPRINT_LENGTH_DAYS})')
+    parser.add_argument('--pivot', action='store_true', help='Add an assignee x period sheet to the Excel output')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch worklogs changed since the last run and merge them into the local store')
+    parser.add_argument('--store', default=WORKLOG_STORE, help=f'Local worklog store path for --incremental (default: {WORKLOG_STORE})')
+    parser.add_argument('--full-refresh', action='store_true', help='With --incremental, discard the stored worklogs for the query and fetch everything')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    # Per-stage cProfile/tracemalloc reports when --profile or --trace-memory is given
+    profiler = StageProfiler(args.profile, args.trace_memory)
+
+    try:
+        # 1. Fetch data from Jira (search pages, worklog pages and building the DataFrame)
+        print("Fetching time tracking data from Jira...")
+        with profiler.stage('fetch'):
+            if args.incremental:
+                jira_data_df = sync_jira_worklogs(args.jql, args.store, args.full_refresh)
+            else:
+                jira_data_df = fetch_jira_worklogs(args.jql)
+        if not jira_data_df.empty:
+            print("Data fetched successfully from Jira.")
+            # print(jira_data_df.head()) # Uncomment to see the raw Jira data
+
+            # 2. Analyze the data
+            print("Analyzing time tracking data...")
+            with profiler.stage('aggregate'):
+                analyzed_df = analyze_time_tracking(jira_data_df, args.granularity, args.sprint_start, args.sprint_length)
+                pivot_df = pivot_time_tracking(analyzed_df) if args.pivot else None
+            print("Analysis complete.")
+            # print(analyzed_df.head()) # Uncomment to see the analyzed data
+
+            # 3. Export to Excel
+            print("Exporting analyzed data to Excel...")
+            with profiler.stage('export'):
+                export_to_excel(analyzed_df, args.output, pivot_df)
+            print("Process finished.")
+        else:
+            print("No data retrieved from Jira. Excel file will not be generated.")
+    finally:
+        profiler.finish()
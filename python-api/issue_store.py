@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Local JIRA Issue Store
+SQLite-backed cache of raw issue JSON used for incremental syncs.
+Remembers the high-water `updated` timestamp per JQL query so later runs
+only need to fetch issues that changed since the previous sync.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+# JIRA returns timestamps like 2024-01-20T15:30:00.000+0000
+JIRA_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+def parse_jira_datetime(value: str) -> Optional[datetime]:
+    """Parse a JIRA timestamp into an aware datetime (None if unparseable)"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, JIRA_DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+class IssueStore:
+    """Persists fetched issues and per-query `updated` watermarks in SQLite"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                key TEXT PRIMARY KEY,
+                updated TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS query_issues (
+                jql TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (jql, key)
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                jql TEXT PRIMARY KEY,
+                updated TEXT NOT NULL
+            );
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def get_watermark(self, jql: str) -> Optional[datetime]:
+        """Return the latest `updated` timestamp stored for a query (UTC)"""
+        row = self.conn.execute(
+            'SELECT updated FROM watermarks WHERE jql = ?', (jql,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def reset(self, jql: str):
+        """Forget everything stored for a query so the next sync is a full fetch"""
+        with self.conn:
+            self.conn.execute('DELETE FROM watermarks WHERE jql = ?', (jql,))
+            self.conn.execute('DELETE FROM query_issues WHERE jql = ?', (jql,))
+
+    def merge(self, jql: str, issues: List[Dict[str, Any]], removed_keys: List[str] = None):
+        """
+        Upsert fetched issues for a query, drop issues that no longer match
+        it and advance the query watermark to the newest `updated` seen
+        """
+        watermark = self.get_watermark(jql)
+
+        with self.conn:
+            for issue in issues:
+                updated = issue.get('fields', {}).get('updated', '')
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO issues (key, updated, data) VALUES (?, ?, ?)',
+                    (issue['key'], updated, json.dumps(issue, separators=(',', ':')))
+                )
+                self.conn.execute(
+                    'INSERT OR IGNORE INTO query_issues (jql, key) VALUES (?, ?)',
+                    (jql, issue['key'])
+                )
+
+                updated_at = parse_jira_datetime(updated)
+                if updated_at and (watermark is None or updated_at > watermark):
+                    watermark = updated_at.astimezone(timezone.utc)
+
+            if removed_keys:
+                self.conn.executemany(
+                    'DELETE FROM query_issues WHERE jql = ? AND key = ?',
+                    [(jql, key) for key in removed_keys]
+                )
+
+            if watermark is not None:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO watermarks (jql, updated) VALUES (?, ?)',
+                    (jql, watermark.isoformat())
+                )
+
+    def load_issues(self, jql: str) -> List[Dict[str, Any]]:
+        """Return all stored issues currently matching a query"""
+        rows = self.conn.execute(
+            'SELECT i.data FROM issues i JOIN query_issues q ON q.key = i.key '
+            'WHERE q.jql = ? ORDER BY i.key',
+            (jql,)
+        )
+        return [json.loads(data) for (data,) in rows]
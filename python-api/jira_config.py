@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+JIRA Configuration
+Connection and fetch settings shared by the JIRA clients, read from a JSON
+config file or JIRA_* environment variables. Kept free of pandas so field
+inspection and other lightweight tools start quickly.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+from field_projection import DEFAULT_EPIC_LINK_FIELD
+
+@dataclass
+class JiraConfig:
+    """Configuration for JIRA API connection"""
+    base_url: str
+    username: str
+    api_token: str
+    default_jql: str = 'project IS NOT EMPTY AND status != "Done"'
+    max_results: int = 1000
+    workers: int = 1  # Concurrent search page requests (1 = sequential)
+    max_retries: int = 5  # Retries per request on throttling and transient errors
+    pool_size: int = 0  # HTTP connections kept open per host (0 = max(workers, 10))
+    keep_alive: bool = True  # Reuse connections between requests
+    compress: bool = True  # Ask JIRA for gzip-compressed responses
+    connect_timeout: float = 10.0  # Seconds to establish a connection
+    read_timeout: float = 60.0  # Seconds to wait for response data
+    epic_link_field: str = DEFAULT_EPIC_LINK_FIELD  # Custom field holding the Epic Link ('' if none)
+    field_projection: bool = True  # Request only the fields the report reads
+    
+    @classmethod
+    def from_file(cls, config_path: str = 'config.json'):
+        """Load configuration from JSON file"""
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(f"Configuration file {config_path} not found")
+        
+        with open(config_path, 'r') as f:
+            config_data = json.load(f)
+        
+        return cls(**config_data)
+    
+    @classmethod
+    def from_env(cls):
+        """Load configuration from environment variables"""
+        return cls(
+            base_url=os.getenv('JIRA_BASE_URL', ''),
+            username=os.getenv('JIRA_USERNAME', ''),
+            api_token=os.getenv('JIRA_API_TOKEN', ''),
+            default_jql=os.getenv('JIRA_DEFAULT_JQL', 'project IS NOT EMPTY AND status != "Done"'),
+            max_results=int(os.getenv('JIRA_MAX_RESULTS', '1000')),
+            workers=int(os.getenv('JIRA_WORKERS', '1')),
+            max_retries=int(os.getenv('JIRA_MAX_RETRIES', '5')),
+            pool_size=int(os.getenv('JIRA_POOL_SIZE', '0')),
+            keep_alive=os.getenv('JIRA_KEEP_ALIVE', '1').lower() not in ('0', 'false', 'no'),
+            compress=os.getenv('JIRA_COMPRESS', '1').lower() not in ('0', 'false', 'no'),
+            connect_timeout=float(os.getenv('JIRA_CONNECT_TIMEOUT', '10')),
+            read_timeout=float(os.getenv('JIRA_READ_TIMEOUT', '60')),
+            epic_link_field=os.getenv('JIRA_EPIC_LINK_FIELD', DEFAULT_EPIC_LINK_FIELD),
+            field_projection=os.getenv('JIRA_FIELD_PROJECTION', '1').lower() not in ('0', 'false', 'no')
+        )
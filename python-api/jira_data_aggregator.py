@@ -5,17 +5,35 @@ Fetches data via REST API and creates summaries grouped by feature link and assi
 """
 
 import requests
-import json
-import pandas as pd
-from datetime import datetime, timedelta
+import re
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 import sys
 import argparse
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Any
 import logging
-from dataclasses import dataclass
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
 import os
 from pathlib import Path
+from issue_store import IssueStore
+from jira_config import JiraConfig
+from jira_http import RetryingSession, get_session
+from field_projection import KEY_BATCH_SIZE, LINK_FIELD, FieldProjection
+from feature_resolver import (
+    FEATURE_LINK_TYPES, DEFAULT_FEATURE_TYPES, DEFAULT_HIERARCHY_CACHE, DEFAULT_HIERARCHY_TTL_HOURS, PARENT_FIELD,
+    FeatureResolver, HierarchyCache
+)
+from report_export import REPORT_FORMATS, write_report
+from run_metrics import NO_METRICS, RunMetrics
+from stage_profiler import NO_PROFILER, StageProfiler, add_profile_arguments
+
+# pandas and numpy (with aggregation) are imported by the methods building
+# DataFrames, so fetching, the config and the CLI start without them
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Configure logging
 logging.basicConfig(
@@ -24,64 +42,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
-class JiraConfig:
-    """Configuration for JIRA API connection"""
-    base_url: str
-    username: str
-    api_token: str
-    default_jql: str = 'project IS NOT EMPTY AND status != "Done"'
-    max_results: int = 1000
-    
-    @classmethod
-    def from_file(cls, config_path: str = 'config.json'):
-        """Load configuration from JSON file"""
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"Configuration file {config_path} not found")
-        
-        with open(config_path, 'r') as f:
-            config_data = json.load(f)
-        
-        return cls(**config_data)
-    
-    @classmethod
-    def from_env(cls):
-        """Load configuration from environment variables"""
-        return cls(
-            base_url=os.getenv('JIRA_BASE_URL', ''),
-            username=os.getenv('JIRA_USERNAME', ''),
-            api_token=os.getenv('JIRA_API_TOKEN', ''),
-            default_jql=os.getenv('JIRA_DEFAULT_JQL', 'project IS NOT EMPTY AND status != "Done"'),
-            max_results=int(os.getenv('JIRA_MAX_RESULTS', '1000'))
-        )
-
-@dataclass
-class IssueSummary:
-    """Data structure for issue summary metrics"""
-    key: str
-    summary: str
-    assignee: str
-    feature_link: str
-    estimated_hours: float
-    remaining_hours: float
-    spent_hours: float
-    status: str
-    priority: str
-    issue_type: str
-    created: str
-    updated: str
-
 class JiraDataAggregator:
     """Main class for fetching and aggregating JIRA data"""
     
     def __init__(self, config: JiraConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.auth = (config.username, config.api_token)
-        self.session.headers.update({
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        })
+        self._session: Optional[RetryingSession] = None
+        self.projection = FieldProjection(config.epic_link_field, config.field_projection)
+        self.link_lookups = 0  # Issues whose links were fetched separately
+        self.feature_resolver: Optional[FeatureResolver] = None
+        self.metrics = NO_METRICS
+        self.profiler = NO_PROFILER
+        self._user_timezone = None
+        # Last summary built and the unrounded grain it came from, for rollups
+        self._summary_grain: Optional[tuple] = None
+    
+    @property
+    def session(self) -> RetryingSession:
+        """Shared requests session for the configuration (see get_session), created on first use"""
+        if self._session is None:
+            self._session = get_session(self.config)
+        return self._session
         
     def test_connection(self) -> bool:
         """Test JIRA API connection"""
@@ -95,123 +76,250 @@ class JiraDataAggregator:
             logger.error(f"JIRA connection failed: {e}")
             return False
     
+    def set_metrics(self, metrics: RunMetrics):
+        """
+        Record stage timings and per-request metrics into `metrics`. The
+        session is shared per configuration (see get_session), so its requests
+        from other clients of the same configuration are recorded there too.
+        """
+        self.metrics = metrics
+        self.session.metrics = metrics
+    
+    def set_profiler(self, profiler: StageProfiler):
+        """Profile the stages the aggregator times itself (resolve_features, the per-page streaming stages)"""
+        self.profiler = profiler
+    
+    def set_feature_resolver(self, resolver: Optional[FeatureResolver]):
+        """
+        Resolve Feature Links through the issue hierarchy (parent, Epic Link,
+        epic/feature links) instead of each issue's own Epic Link only
+        """
+        self.feature_resolver = resolver
+        self.projection.parent_field = PARENT_FIELD if resolver else None
+    
     def fetch_issues(self, jql: Optional[str] = None, additional_fields: List[str] = None) -> List[Dict[str, Any]]:
         """Fetch issues from JIRA using JQL query"""
-        if jql is None:
-            jql = self.config.default_jql
-            
-        # Essential fields for time tracking and grouping
-        base_fields = [
-            'key', 'summary', 'status', 'assignee', 'priority', 'issuetype',
-            'created', 'updated', 'timetracking', 'timeoriginalestimate',
-            'timeestimate', 'timespent', 'aggregatetimeoriginalestimate',
-            'aggregatetimeestimate', 'aggregatetimespent', 'issuelinks',
-            'customfield_10014'  # Epic Link (commonly used for feature links)
-        ]
+        all_issues = []
+        for issues in self.iter_report_pages(jql, additional_fields):
+            all_issues.extend(issues)
+        
+        logger.info(f"Total issues fetched: {len(all_issues)}")
+        return all_issues
+    
+    def iter_report_pages(self, jql: Optional[str] = None, additional_fields: List[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of issues carrying every field the report reads: the
+        projected search fields, plus issuelinks for issues without an Epic Link
+        """
+        for issues in self.iter_issue_pages(jql, self._search_fields(additional_fields)):
+            self.complete_issue_links(issues)
+            yield issues
+    
+    def complete_issue_links(self, issues: List[Dict[str, Any]], skip_parented: bool = True):
+        """
+        Add issuelinks to the issues a projected search returned without an
+        Epic Link, fetched with `key in (...)` queries for just that field
+        (see FieldProjection.needs_links for skip_parented)
+        """
+        missing = {issue['key']: issue for issue in issues
+                   if self.projection.needs_links(issue, skip_parented)}
+        if not missing:
+            return
         
-        if additional_fields:
-            base_fields.extend(additional_fields)
+        keys = iter(missing)
+        for batch in iter(lambda: list(islice(keys, KEY_BATCH_SIZE)), []):
+            for page in self.iter_issue_pages(f"key in ({','.join(batch)})", LINK_FIELD):
+                for linked in page:
+                    issue = missing.get(linked.get('key'))
+                    if issue is not None:
+                        issue.setdefault('fields', {})[LINK_FIELD] = (linked.get('fields') or {}).get(LINK_FIELD) or []
         
-        fields = ','.join(set(base_fields))
+        self.link_lookups += len(missing)
+    
+    def _fetch_all(self, jql: str, fields: str) -> List[Dict[str, Any]]:
+        """Page through every search result for a JQL query"""
+        all_issues = []
+        for issues in self.iter_issue_pages(jql, fields):
+            all_issues.extend(issues)
+                
+        logger.info(f"Total issues fetched: {len(all_issues)}")
+        return all_issues
+    
+    def iter_issue_pages(self, jql: Optional[str] = None, fields: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield search results one page at a time, in offset order.
+        Only a bounded number of pages is held at once, so callers that fold
+        each page into running totals never hold the full result set.
+        """
+        if jql is None:
+            jql = self.config.default_jql
+        if fields is None:
+            fields = self._search_fields()
         
         url = f"{self.config.base_url}/rest/api/3/search"
+        max_results = min(self.config.max_results, 100)  # JIRA API limit per request
+        
+        if self.config.workers > 1:
+            yield from self._iter_pages_parallel(url, jql, fields, max_results)
+            return
         
-        all_issues = []
         start_at = 0
-        max_results = min(self.config.max_results, 100)  # JIRA API limit per request
+        fetched = 0
         
         while True:
-            params = {
-                'jql': jql,
-                'fields': fields,
-                'maxResults': max_results,
-                'startAt': start_at
-            }
-            
             try:
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                issues = data.get('issues', [])
-                
-                if not issues:
-                    break
-                    
-                all_issues.extend(issues)
-                
-                if len(issues) < max_results:
-                    break
-                    
-                start_at += max_results
-                logger.info(f"Fetched {len(all_issues)} issues so far...")
-                
+                data = self._fetch_search_page(url, jql, fields, start_at, max_results)
             except requests.RequestException as e:
-                logger.error(f"Error fetching issues: {e}")
+                # The session has already retried; stopping beats reporting on a truncated issue list
+                logger.error(f"Error fetching issues at offset {start_at}: {e}")
+                raise
+            
+            issues = data.get('issues', [])
+            
+            if not issues:
+                break
+            
+            yield issues
+            fetched += len(issues)
+            
+            if len(issues) < max_results:
                 break
                 
-        logger.info(f"Total issues fetched: {len(all_issues)}")
-        return all_issues
+            start_at += max_results
+            logger.info(f"Fetched {fetched} issues so far...")
+    
+    def _search_fields(self, additional_fields: List[str] = None) -> str:
+        """Build the comma-separated field list requested from the search API"""
+        return self.projection.search_fields(additional_fields)
     
-    def extract_issue_summary(self, issue: Dict[str, Any]) -> IssueSummary:
-        """Extract summary data from JIRA issue"""
-        fields = issue.get('fields', {})
-        
-        # Extract assignee
-        assignee = fields.get('assignee')
-        assignee_name = assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
-        
-        # Extract time tracking information
-        time_tracking = fields.get('timetracking', {})
-        
-        # Time values in seconds, convert to hours
-        estimated_seconds = (
-            fields.get('timeoriginalestimate', 0) or 
-            fields.get('aggregatetimeoriginalestimate', 0) or 0
-        )
-        remaining_seconds = (
-            fields.get('timeestimate', 0) or 
-            fields.get('aggregatetimeestimate', 0) or 0
-        )
-        spent_seconds = (
-            fields.get('timespent', 0) or 
-            fields.get('aggregatetimespent', 0) or 0
-        )
-        
-        # Convert seconds to hours
-        estimated_hours = estimated_seconds / 3600 if estimated_seconds else 0
-        remaining_hours = remaining_seconds / 3600 if remaining_seconds else 0
-        spent_hours = spent_seconds / 3600 if spent_seconds else 0
-        
-        # Extract feature link (Epic Link or related issues)
-        feature_link = self._extract_feature_link(fields)
-        
-        return IssueSummary(
-            key=issue.get('key', ''),
-            summary=fields.get('summary', ''),
-            assignee=assignee_name,
-            feature_link=feature_link,
-            estimated_hours=estimated_hours,
-            remaining_hours=remaining_hours,
-            spent_hours=spent_hours,
-            status=fields.get('status', {}).get('name', ''),
-            priority=fields.get('priority', {}).get('name', ''),
-            issue_type=fields.get('issuetype', {}).get('name', ''),
-            created=fields.get('created', ''),
-            updated=fields.get('updated', '')
-        )
+    def _fetch_search_page(self, url: str, jql: str, fields: str, start_at: int, max_results: int) -> Dict[str, Any]:
+        """Fetch a single page of search results starting at the given offset"""
+        params = {
+            'jql': jql,
+            'fields': fields,
+            'maxResults': max_results,
+            'startAt': start_at
+        }
+        response = self.session.get(url, params=params)
+        response.raise_for_status()
+        with self.metrics.stage('json_decode'):
+            return response.json()
     
-    def _extract_feature_link(self, fields: Dict[str, Any]) -> str:
+    def _iter_pages_parallel(self, url: str, jql: str, fields: str, max_results: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Fetch the first page to learn the result total, then request the
+        remaining pages concurrently, yielding them in offset order
+        """
+        first_page = self._fetch_search_page(url, jql, fields, 0, max_results)
+        issues = first_page.get('issues', [])
+        total = first_page.get('total', len(issues))
+        # JIRA may cap the page size below what was requested
+        page_size = first_page.get('maxResults') or max_results
+        
+        if not issues:
+            return
+        
+        yield issues
+        fetched = len(issues)
+        
+        if total <= fetched:
+            return
+        
+        workers = self.config.workers
+        offsets = iter(range(page_size, total, page_size))
+        logger.info(f"Fetching remaining {total - fetched} issues with {workers} workers...")
+        
+        def fetch(start_at: int) -> Dict[str, Any]:
+            return self._fetch_search_page(url, jql, fields, start_at, page_size)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded window of requests in flight; results are consumed in submission order
+            pending = deque(executor.submit(fetch, start_at) for start_at in islice(offsets, workers * 2))
+            
+            while pending:
+                try:
+                    data = pending.popleft().result()
+                except requests.RequestException as e:
+                    # A page lost after its retries leaves a hole in the offsets, so the whole query fails
+                    logger.error(f"Error fetching issues: {e}")
+                    raise
+                
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.append(executor.submit(fetch, next_offset))
+                
+                issues = data.get('issues', [])
+                yield issues
+                fetched += len(issues)
+                logger.info(f"Fetched {fetched} of {total} issues so far...")
+    
+    def fetch_issues_incremental(self, store: IssueStore, jql: Optional[str] = None,
+                                 additional_fields: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Sync the local issue store with issues updated since the last run of
+        this JQL query, then return every stored issue matching it
+        """
+        if jql is None:
+            jql = self.config.default_jql
+        
+        watermark = store.get_watermark(jql)
+        
+        if watermark is None:
+            logger.info("No previous sync for this query, fetching all issues...")
+            store.reset(jql)
+            store.merge(jql, self.fetch_issues(jql, additional_fields))
+        else:
+            since = self._format_jql_datetime(watermark)
+            filter_jql, order_by = self._split_order_by(jql)
+            updated_clause = f'updated >= "{since}"'
+            
+            logger.info(f"Fetching issues updated since {since}...")
+            changed_jql = f"({filter_jql}) AND {updated_clause}" if filter_jql else updated_clause
+            changed = self.fetch_issues(f"{changed_jql} {order_by}".strip(), additional_fields)
+            
+            # Issues that changed but no longer match the query (e.g. moved to Done)
+            removed = []
+            if filter_jql:
+                dropped = self._fetch_all(f"{updated_clause} AND NOT ({filter_jql})", 'key')
+                removed = [issue['key'] for issue in dropped]
+            
+            store.merge(jql, changed, removed)
+            logger.info(f"Incremental sync: {len(changed)} issues changed, {len(removed)} no longer match")
+        
+        return store.load_issues(jql)
+    
+    @staticmethod
+    def _split_order_by(jql: str):
+        """Split a JQL query into its filter and ORDER BY clause"""
+        match = re.search(r'\bORDER\s+BY\b', jql, re.IGNORECASE)
+        if not match:
+            return jql.strip(), ''
+        return jql[:match.start()].strip(), jql[match.start():].strip()
+    
+    def _format_jql_datetime(self, moment: datetime) -> str:
+        """Format a timestamp for JQL, which compares dates in the user's profile time zone"""
+        if self._user_timezone is None:
+            try:
+                response = self.session.get(f"{self.config.base_url}/rest/api/3/myself")
+                response.raise_for_status()
+                self._user_timezone = ZoneInfo(response.json().get('timeZone') or 'UTC')
+            except (requests.RequestException, ValueError, KeyError):
+                self._user_timezone = timezone.utc
+        
+        # JQL dates have minute precision; truncating keeps the boundary issue included
+        return moment.astimezone(self._user_timezone).strftime('%Y/%m/%d %H:%M')
+    
+    def _extract_feature_link(self, fields: Dict[str, Any], link_types: Sequence[str] = FEATURE_LINK_TYPES) -> str:
         """Extract feature link from various JIRA fields"""
         # Try Epic Link first (customfield_10014 is common)
-        epic_link = fields.get('customfield_10014')
+        epic_link = fields.get(self.config.epic_link_field) if self.config.epic_link_field else None
         if epic_link:
             return epic_link
             
         # Try issue links for features/epics
         issue_links = fields.get('issuelinks', [])
         for link in issue_links:
-            if link.get('type', {}).get('name', '').lower() in ['epic-story', 'feature-story', 'relates']:
+            if link.get('type', {}).get('name', '').lower() in link_types:
                 # Check inward link
                 inward_issue = link.get('inwardIssue')
                 if inward_issue:
@@ -228,102 +336,151 @@ class JiraDataAggregator:
         
         return 'No Feature Link'
     
-    def create_summary_report(self, issues: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Create aggregated summary report grouped by feature link and assignee"""
-        issue_summaries = [self.extract_issue_summary(issue) for issue in issues]
-        
-        # Convert to DataFrame
-        df = pd.DataFrame([
-            {
-                'Issue Key': summary.key,
-                'Summary': summary.summary,
-                'Assignee': summary.assignee,
-                'Feature Link': summary.feature_link,
-                'Estimated Hours': summary.estimated_hours,
-                'Remaining Hours': summary.remaining_hours,
-                'Spent Hours': summary.spent_hours,
-                'Status': summary.status,
-                'Priority': summary.priority,
-                'Issue Type': summary.issue_type,
-                'Created': summary.created,
-                'Updated': summary.updated
-            }
-            for summary in issue_summaries
-        ])
-        
-        return df
+    def resolve_feature_links(self, issues: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Feature Links resolved through the issue hierarchy, as their own
+        stage since resolving may fetch parents from JIRA; None without a resolver
+        """
+        if self.feature_resolver is None:
+            return None
+        with self.profiler.stage('resolve_features'), self.metrics.stage('resolve_features'):
+            return self.feature_resolver.resolve(issues)
+    
+    def create_summary_report(self, issues: List[Dict[str, Any]],
+                              feature_links: Optional[List[str]] = None) -> 'pd.DataFrame':
+        """
+        Create the detailed issue report, one row per issue.
+        Columns are pulled out of the raw search JSON in bulk and the time
+        fields are converted to hours as whole arrays. Pass the result of
+        resolve_feature_links as `feature_links` to skip resolving them here.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        all_fields = [issue.get('fields') or {} for issue in issues]
+        
+        def names(field: str, attribute: str = 'name', default: str = '') -> List[str]:
+            # Nested objects such as status/assignee may be missing or null
+            return [
+                (fields.get(field) or {}).get(attribute, default) or default
+                for fields in all_fields
+            ]
+        
+        def hours(direct: str, aggregate: str) -> np.ndarray:
+            # Prefer the issue's own value and fall back to the aggregate (subtasks included)
+            direct_seconds = np.array([fields.get(direct) for fields in all_fields], dtype=float)
+            aggregate_seconds = np.array([fields.get(aggregate) for fields in all_fields], dtype=float)
+            seconds = np.where(direct_seconds > 0, direct_seconds, aggregate_seconds)
+            return np.nan_to_num(seconds, nan=0.0) / 3600
+        
+        if feature_links is None and self.feature_resolver is not None:
+            feature_links = self.feature_resolver.resolve(issues)
+        elif feature_links is None:
+            feature_links = [self._extract_feature_link(fields) for fields in all_fields]
+        
+        return pd.DataFrame({
+            'Issue Key': [issue.get('key', '') for issue in issues],
+            'Summary': [fields.get('summary', '') for fields in all_fields],
+            'Assignee': names('assignee', 'displayName', 'Unassigned'),
+            'Feature Link': feature_links,
+            'Estimated Hours': hours('timeoriginalestimate', 'aggregatetimeoriginalestimate'),
+            'Remaining Hours': hours('timeestimate', 'aggregatetimeestimate'),
+            'Spent Hours': hours('timespent', 'aggregatetimespent'),
+            'Status': names('status'),
+            'Priority': names('priority'),
+            'Issue Type': names('issuetype'),
+            'Created': [fields.get('created', '') for fields in all_fields],
+            'Updated': [fields.get('updated', '') for fields in all_fields]
+        })
     
-    def create_aggregated_summary(self, df: pd.DataFrame) -> pd.DataFrame:
+    def create_aggregated_summary(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
         """Create aggregated summary grouped by Feature Link and Assignee"""
-        # Group by Feature Link and Assignee
-        grouped = df.groupby(['Feature Link', 'Assignee']).agg({
-            'Estimated Hours': 'sum',
-            'Remaining Hours': 'sum',
-            'Spent Hours': 'sum',
-            'Issue Key': 'count'  # Count of issues
-        }).round(2)
-        
-        # Rename the count column
-        grouped.rename(columns={'Issue Key': 'Issue Count'}, inplace=True)
-        
-        # Calculate completion percentage
-        grouped['Completion %'] = (
-            (grouped['Spent Hours'] / grouped['Estimated Hours'] * 100)
-            .fillna(0)
-            .round(1)
-        )
+        from aggregation import finest_grain
         
-        # Reset index to make Feature Link and Assignee regular columns
-        grouped = grouped.reset_index()
+        return self._summarize(finest_grain(df))
+    
+    def _summarize(self, grain: 'pd.DataFrame') -> 'pd.DataFrame':
+        """Summary table of a grain; the grain is kept for export_report's rollups"""
+        from aggregation import summarize
         
-        return grouped
+        # Reset index to make Feature Link and Assignee regular columns
+        summary_df = summarize(grain).reset_index()
+        self._summary_grain = (summary_df, grain)
+        return summary_df
+    
+    def aggregate_streaming(self, jql: Optional[str] = None) -> 'pd.DataFrame':
+        """
+        Fetch and aggregate in one pass: each page is flattened and folded
+        into running Feature Link x Assignee totals, then discarded, so
+        memory stays flat regardless of how many issues match. Waiting for
+        each page is timed as the fetch stage, so stages do not overlap.
+        """
+        with self.profiler.stage('import'), self.metrics.stage('import'):
+            # Loads pandas, which the first page's extract would otherwise pay for
+            from aggregation import RunningSummary
+        
+        running = RunningSummary()
+        pages = self.iter_report_pages(jql)
+        while True:
+            with self.profiler.stage('fetch'), self.metrics.stage('fetch'):
+                issues = next(pages, None)
+            if issues is None:
+                break
+            feature_links = self.resolve_feature_links(issues)
+            with self.profiler.stage('extract'), self.metrics.stage('extract'):
+                detailed_df = self.create_summary_report(issues, feature_links)
+            with self.profiler.stage('aggregate'), self.metrics.stage('aggregate'):
+                running.add(detailed_df)
+        
+        logger.info(f"Total issues aggregated: {running.issue_count}")
+        return self._summarize(running.to_frame())
+    
+    def export_to_excel(self, detailed_df: Optional['pd.DataFrame'], summary_df: 'pd.DataFrame',
+                        filename: str = None, streaming: bool = False):
+        """
+        Export detailed and summary data to Excel with multiple sheets.
+        Pass detailed_df=None (streaming runs) to skip the Detailed Issues sheet;
+        streaming=True writes rows in openpyxl write-only mode for large reports.
+        """
+        self.export_report(detailed_df, summary_df, filename, 'xlsx', streaming)
     
-    def export_to_excel(self, detailed_df: pd.DataFrame, summary_df: pd.DataFrame, filename: str = None):
-        """Export detailed and summary data to Excel with multiple sheets"""
-        if filename is None:
+    def export_report(self, detailed_df: Optional['pd.DataFrame'], summary_df: 'pd.DataFrame',
+                      output: str = None, fmt: str = 'xlsx', streaming: bool = False) -> List[str]:
+        """
+        Export detailed and summary tables as an Excel workbook (fmt='xlsx')
+        or as one parquet/feather/csv file per table in the `output` directory
+        """
+        from aggregation import REPORT_ROLLUPS, finest_grain, grouping_sets, summary_grain
+        
+        if output is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"jira_summary_{timestamp}.xlsx"
+            output = f"jira_summary_{timestamp}" + ('.xlsx' if fmt == 'xlsx' else '')
         
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            # Summary sheet
-            summary_df.to_excel(writer, sheet_name='Summary by Feature & Assignee', index=False)
-            
+        # Summary sheet
+        sheets = [('Summary by Feature & Assignee', summary_df, False)]
+        
+        if detailed_df is not None:
             # Detailed issues sheet
-            detailed_df.to_excel(writer, sheet_name='Detailed Issues', index=False)
-            
-            # Feature-only summary
-            feature_summary = detailed_df.groupby('Feature Link').agg({
-                'Estimated Hours': 'sum',
-                'Remaining Hours': 'sum',
-                'Spent Hours': 'sum',
-                'Issue Key': 'count'
-            }).round(2)
-            feature_summary.rename(columns={'Issue Key': 'Issue Count'}, inplace=True)
-            feature_summary['Completion %'] = (
-                (feature_summary['Spent Hours'] / feature_summary['Estimated Hours'] * 100)
-                .fillna(0)
-                .round(1)
-            )
-            feature_summary.to_excel(writer, sheet_name='Summary by Feature')
-            
-            # Assignee-only summary
-            assignee_summary = detailed_df.groupby('Assignee').agg({
-                'Estimated Hours': 'sum',
-                'Remaining Hours': 'sum',
-                'Spent Hours': 'sum',
-                'Issue Key': 'count'
-            }).round(2)
-            assignee_summary.rename(columns={'Issue Key': 'Issue Count'}, inplace=True)
-            assignee_summary['Completion %'] = (
-                (assignee_summary['Spent Hours'] / assignee_summary['Estimated Hours'] * 100)
-                .fillna(0)
-                .round(1)
-            )
-            assignee_summary.to_excel(writer, sheet_name='Summary by Assignee')
+            sheets.append(('Detailed Issues', detailed_df, False))
+        
+        # Feature-only and assignee-only summaries are rolled up from the
+        # unrounded Feature x Assignee grain rather than re-grouping every issue
+        if self._summary_grain is not None and self._summary_grain[0] is summary_df:
+            grain = self._summary_grain[1]
+        elif detailed_df is not None:
+            grain = finest_grain(detailed_df)
+        else:
+            # Only the rounded totals of a summary built elsewhere are available
+            grain = summary_grain(summary_df)
+        rollups = grouping_sets(grain, REPORT_ROLLUPS)
+        sheets.extend((sheet_name, rollup_df, True) for sheet_name, rollup_df in rollups.items())
         
-        logger.info(f"Data exported to {filename}")
+        paths = write_report(output, sheets, fmt, streaming)
         
-    def print_summary_console(self, summary_df: pd.DataFrame):
+        logger.info(f"Data exported to {output}")
+        return paths
+        
+    def print_summary_console(self, summary_df: 'pd.DataFrame'):
         """Print summary to console in a formatted way"""
         print("\n" + "="*80)
         print("JIRA ISSUE SUMMARY - GROUPED BY FEATURE LINK AND ASSIGNEE")
@@ -372,12 +529,32 @@ def main():
     parser = argparse.ArgumentParser(description='JIRA Data Aggregator')
     parser.add_argument('--config', '-c', help='Configuration file path', default='config.json')
     parser.add_argument('--jql', '-j', help='JQL query to filter issues')
-    parser.add_argument('--output', '-o', help='Output Excel filename')
+    parser.add_argument('--output', '-o', help='Output Excel filename (directory for parquet/feather/csv)')
+    parser.add_argument('--format', '-f', choices=REPORT_FORMATS, default='xlsx', help='Report output format (default: xlsx)')
     parser.add_argument('--console-only', action='store_true', help='Only print to console, no Excel export')
     parser.add_argument('--use-env', action='store_true', help='Use environment variables for configuration')
+    parser.add_argument('--workers', '-w', type=int, help='Number of concurrent page requests (overrides config)')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch issues updated since the last run and merge them into the local store')
+    parser.add_argument('--store', help='Local issue store path for --incremental (default: next to the config file)')
+    parser.add_argument('--streaming', action='store_true', help='Aggregate page by page without keeping raw or per-issue data (no Detailed Issues sheet)')
+    parser.add_argument('--streaming-export', action='store_true', help='Write the Excel report in write-only streaming mode (faster, lower memory, unstyled)')
+    parser.add_argument('--full-refresh', action='store_true', help='With --incremental, discard the stored watermark and refetch everything')
+    parser.add_argument('--resolve-features', action='store_true', help='Resolve Feature Links through parent issues (sub-task -> story -> epic -> feature)')
+    parser.add_argument('--feature-types', default=','.join(DEFAULT_FEATURE_TYPES),
+                        help='Comma-separated issue types that count as features; the highest matching ancestor wins (default: %(default)s)')
+    parser.add_argument('--hierarchy-cache', help='Parent issue cache for --resolve-features (default: next to the config file)')
+    parser.add_argument('--hierarchy-ttl', type=float, default=DEFAULT_HIERARCHY_TTL_HOURS,
+                        help='Hours before cached parent issues are fetched again (default: %(default)s)')
+    parser.add_argument('--metrics-json', help='Write a JSON run report (stage timings, request latencies, counters) to this file')
+    parser.add_argument('--metrics-prom', help='Write the run report as a Prometheus textfile (node_exporter textfile collector)')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
+    if args.streaming and args.incremental:
+        parser.error('--streaming cannot be combined with --incremental')
+    
+    profiler = StageProfiler(args.profile, args.trace_memory)
     try:
         # Load configuration
         if args.use_env:
@@ -385,40 +562,111 @@ def main():
         else:
             config = JiraConfig.from_file(args.config)
         
+        if args.workers:
+            config.workers = args.workers
+        
         # Validate configuration
         if not all([config.base_url, config.username, config.api_token]):
             logger.error("Missing required configuration. Please provide base_url, username, and api_token")
             sys.exit(1)
         
+        config_dir = os.getcwd() if args.use_env else os.path.dirname(os.path.abspath(args.config))
+        
         # Initialize aggregator
         aggregator = JiraDataAggregator(config)
+        metrics = aggregator.metrics
+        if args.metrics_json or args.metrics_prom:
+            metrics = RunMetrics()
+            aggregator.set_metrics(metrics)
+        
+        hierarchy_cache = None
+        if args.resolve_features:
+            hierarchy_cache = HierarchyCache(
+                args.hierarchy_cache or os.path.join(config_dir, DEFAULT_HIERARCHY_CACHE), args.hierarchy_ttl
+            )
+            feature_types = [t.strip() for t in args.feature_types.split(',') if t.strip()]
+            aggregator.set_feature_resolver(FeatureResolver(aggregator, hierarchy_cache, feature_types))
+        aggregator.set_profiler(profiler)
         
         # Test connection
-        if not aggregator.test_connection():
+        with profiler.stage('connect'), metrics.stage('connect'):
+            connected = aggregator.test_connection()
+        if not connected:
             logger.error("Failed to connect to JIRA. Please check your configuration.")
             sys.exit(1)
         
         # Fetch issues
         logger.info("Fetching JIRA issues...")
         jql_query = args.jql if args.jql else config.default_jql
-        issues = aggregator.fetch_issues(jql_query)
-        
-        if not issues:
+        detailed_df = None
+        if args.streaming:
+            # Times its own per-page fetch, resolve_features, extract and aggregate stages
+            summary_df = aggregator.aggregate_streaming(jql_query)
+            issue_count = int(summary_df['Issue Count'].sum()) if not summary_df.empty else 0
+        else:
+            with profiler.stage('fetch'), metrics.stage('fetch'):
+                if args.incremental:
+                    store_path = args.store
+                    if store_path is None:
+                        store_path = os.path.join(config_dir, 'jira_issue_store.sqlite')
+                    
+                    with IssueStore(store_path) as store:
+                        if args.full_refresh:
+                            store.reset(jql_query)
+                        issues = aggregator.fetch_issues_incremental(store, jql_query)
+                else:
+                    issues = aggregator.fetch_issues(jql_query)
+            issue_count = len(issues)
+        metrics.count('issues', issue_count)
+        metrics.count('link_lookups', aggregator.link_lookups)
+        
+        stats = aggregator.session.stats
+        logger.info(f"HTTP requests: {stats['requests']}, retries: {stats['retries']}, "
+                    f"throttled: {stats['throttled']}, received: {stats['bytes'] / 1024:.0f} KiB"
+                    + (f" ({stats['bytes'] / issue_count:.0f} bytes per issue)" if issue_count and not args.incremental else ""))
+        if aggregator.link_lookups:
+            logger.info(f"Fetched issue links separately for {aggregator.link_lookups} issues without an Epic Link")
+        
+        if not issue_count:
             logger.warning("No issues found matching the query")
             return
         
-        # Create detailed summary
-        detailed_df = aggregator.create_summary_report(issues)
+        if not args.streaming:
+            # pandas is first needed here; load it in its own stage rather than in extract's
+            with profiler.stage('import'), metrics.stage('import'):
+                import pandas
+            
+            # Create detailed summary
+            feature_links = aggregator.resolve_feature_links(issues)
+            with profiler.stage('extract'), metrics.stage('extract'):
+                detailed_df = aggregator.create_summary_report(issues, feature_links)
+            # Drop the raw JSON before aggregating
+            del issues
+            
+            # Create aggregated summary
+            with profiler.stage('aggregate'), metrics.stage('aggregate'):
+                summary_df = aggregator.create_aggregated_summary(detailed_df)
         
-        # Create aggregated summary
-        summary_df = aggregator.create_aggregated_summary(detailed_df)
+        if aggregator.feature_resolver:
+            logger.info(f"Parent issues fetched for feature resolution: {aggregator.feature_resolver.fetched}")
+            metrics.count('hierarchy_fetches', aggregator.feature_resolver.fetched)
         
         # Print to console
         aggregator.print_summary_console(summary_df)
         
-        # Export to Excel unless console-only mode
+        # Export report unless console-only mode
         if not args.console_only:
-            aggregator.export_to_excel(detailed_df, summary_df, args.output)
+            with profiler.stage('export'), metrics.stage('export'):
+                aggregator.export_report(detailed_df, summary_df, args.output, args.format, args.streaming_export)
+        
+        if hierarchy_cache:
+            hierarchy_cache.close()
+        
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json, aggregator.session.stats)
+            logger.info(f"Run report written to {args.metrics_json}")
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom, aggregator.session.stats)
         
     except FileNotFoundError as e:
         logger.error(f"Configuration file not found: {e}")
@@ -426,6 +674,8 @@ def main():
     except Exception as e:
         logger.error(f"An error occurred: {e}")
         sys.exit(1)
+    finally:
+        profiler.finish()
 
 if __name__ == "__main__":
     main()
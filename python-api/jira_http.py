@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+JIRA HTTP Client
+Shared HTTP layer for the JIRA clients: retries with exponential backoff and
+jitter, honours Retry-After, and adapts the number of concurrent requests
+when JIRA starts throttling (429/503). Sessions are pooled per configuration
+so every client in a process reuses the same keep-alive connections.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from run_metrics import NO_METRICS
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before retrying a JIRA request"""
+    max_retries: int = 5
+    backoff_base: float = 1.0   # Seconds; doubled on every attempt
+    backoff_max: float = 60.0
+    retry_statuses: tuple = (429, 500, 502, 503, 504)
+    throttle_statuses: tuple = (429, 503)
+
+    def compute_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retry number `attempt` (0-based).
+        A Retry-After header wins; otherwise full-jitter exponential backoff.
+        """
+        if retry_after:
+            delay = self._parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.backoff_max)
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_retry_after(value: str) -> Optional[float]:
+        """Retry-After is either delta-seconds or an HTTP date"""
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that halves when JIRA throttles and creeps back up by
+    one slot after a full window of successful requests (AIMD)
+    """
+
+    def __init__(self, max_concurrency: int = 1):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.limit = self.max_concurrency
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False):
+        with self._condition:
+            self.in_flight -= 1
+            self._adjust(throttled)
+            self._condition.notify_all()
+
+    def _adjust(self, throttled: bool):
+        if throttled:
+            if self.limit > 1:
+                self.limit = max(1, self.limit // 2)
+                logger.warning(f"JIRA is throttling requests, reducing concurrency to {self.limit}")
+            self._successes = 0
+        elif self.limit < self.max_concurrency:
+            self._successes += 1
+            if self._successes >= self.limit:
+                self.limit += 1
+                self._successes = 0
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """AdaptiveLimiter for coroutines sharing one event loop"""
+
+    def __init__(self, max_concurrency: int = 1):
+        super().__init__(max_concurrency)
+        # Imported here so the synchronous clients start without asyncio
+        import asyncio
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, throttled: bool = False):
+        async with self._condition:
+            self.in_flight -= 1
+            self._adjust(throttled)
+            self._condition.notify_all()
+
+class RetryingSession(requests.Session):
+    """
+    requests.Session that retries throttled, failed and timed-out requests
+    and keeps counters of what happened for run metrics. Assign a RunMetrics
+    to `metrics` to also record the latency, status and size of each attempt.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, limiter: Optional[AdaptiveLimiter] = None,
+                 timeout: Optional[Tuple[float, float]] = None):
+        super().__init__()
+        self.policy = policy or RetryPolicy()
+        self.limiter = limiter or AdaptiveLimiter(1)
+        self.timeout = timeout  # (connect, read) seconds, used when a call passes none
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'bytes': 0}
+        self.metrics = NO_METRICS
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def request(self, method, url, *args, **kwargs):
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            throttled = False
+            status = None
+            size = 0
+            started = time.perf_counter()
+            try:
+                self._count('requests')
+                response = super().request(method, url, *args, **kwargs)
+                status = response.status_code
+                throttled = response.status_code in self.policy.throttle_statuses
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.policy.max_retries:
+                    raise
+                delay = self.policy.compute_delay(attempt)
+                logger.warning(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in self.policy.retry_statuses or attempt >= self.policy.max_retries:
+                    if not kwargs.get('stream'):
+                        # Decoded body size, i.e. after gzip
+                        size = len(response.content)
+                        self._count('bytes', size)
+                    return response
+                delay = self.policy.compute_delay(attempt, response.headers.get('Retry-After'))
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+            finally:
+                if throttled:
+                    self._count('throttled')
+                self.limiter.release(throttled)
+                if self.metrics.enabled:
+                    self.metrics.observe_request(method, url, status, time.perf_counter() - started, size)
+
+            self._count('retries')
+            attempt += 1
+            time.sleep(delay)
+
+_sessions: Dict[tuple, RetryingSession] = {}
+_sessions_lock = threading.Lock()
+
+def pool_size(config) -> int:
+    """Connections kept open per host: enough for every worker, at least 10"""
+    return config.pool_size or max(config.workers, 10)
+
+def create_session(config) -> RetryingSession:
+    """
+    Create an authenticated, retrying session for a JiraConfig, with a
+    connection pool sized for its workers and its timeouts, keep-alive and
+    compression settings
+    """
+    policy = RetryPolicy(max_retries=config.max_retries)
+    timeout = (config.connect_timeout, config.read_timeout)
+    session = RetryingSession(policy, AdaptiveLimiter(config.workers), timeout)
+
+    # Retries are handled by RetryingSession, not urllib3
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size(config), max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    session.auth = (config.username, config.api_token)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Content-Type': 'application/json',
+        'Accept-Encoding': 'gzip, deflate' if config.compress else 'identity'
+    })
+    if not config.keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+def get_session(config) -> RetryingSession:
+    """
+    Shared session for a JiraConfig. Clients created from equal
+    configurations (aggregator, worklog fetcher, field inspector) get the
+    same session and so share its connection pool and limiter. Its `stats`
+    and `metrics` are shared too: they count the requests of every such
+    client in the process, so take differences to attribute them to one.
+    """
+    key = (
+        config.base_url, config.username, config.api_token, config.workers, config.max_retries,
+        config.pool_size, config.keep_alive, config.compress, config.connect_timeout, config.read_timeout
+    )
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = create_session(config)
+        return session
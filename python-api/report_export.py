@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Report Export
+Writes the aggregator report tables to Excel, either through pandas'
+ExcelWriter or in streaming (write-only) mode for large reports, or as one
+columnar file per table (Parquet/Feather/CSV) for downstream jobs
+"""
+
+import math
+import os
+import re
+from typing import TYPE_CHECKING, List, Tuple
+
+# pandas and openpyxl are imported by the writers, so the CLIs can read
+# REPORT_FORMATS without loading them
+if TYPE_CHECKING:
+    import pandas as pd
+
+# (sheet name, DataFrame, write the index as leading columns)
+Sheet = Tuple[str, 'pd.DataFrame', bool]
+
+# Output formats accepted by write_report / the --format CLI options
+REPORT_FORMATS = ('xlsx', 'parquet', 'feather', 'csv')
+
+# Text written for infinite values by both Excel writers (pandas' default)
+INF_REP = 'inf'
+
+def write_report(output: str, sheets: List[Sheet], fmt: str = 'xlsx', streaming: bool = False) -> List[str]:
+    """
+    Write the report in the requested format and return the paths written.
+    xlsx produces one workbook at `output`; the other formats produce one
+    file per table inside the `output` directory.
+    """
+    if fmt == 'xlsx':
+        write_excel(output, sheets, streaming)
+        return [output]
+    return write_tables(output, sheets, fmt)
+
+def write_tables(directory: str, sheets: List[Sheet], fmt: str) -> List[str]:
+    """
+    Write each table to its own file, e.g. detailed_issues.parquet.
+    Parquet and Feather need pyarrow (pip install pyarrow).
+    """
+    if fmt not in REPORT_FORMATS or fmt == 'xlsx':
+        raise ValueError(f"Unsupported table format: {fmt}")
+    
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    
+    for sheet_name, df, index in sheets:
+        # Columnar formats have no index; keep it as regular columns
+        frame = df.reset_index() if index else df.reset_index(drop=True)
+        path = os.path.join(directory, f"{table_file_stem(sheet_name)}.{fmt}")
+        
+        if fmt == 'parquet':
+            frame.to_parquet(path, index=False)
+        elif fmt == 'feather':
+            frame.to_feather(path)
+        else:
+            frame.to_csv(path, index=False)
+        
+        paths.append(path)
+    
+    return paths
+
+def table_file_stem(sheet_name: str) -> str:
+    """'Summary by Feature & Assignee' -> 'summary_by_feature_assignee'"""
+    return re.sub(r'[^a-z0-9]+', '_', sheet_name.lower()).strip('_')
+
+def write_excel(filename: str, sheets: List[Sheet], streaming: bool = False):
+    """Write report sheets to an Excel workbook"""
+    if streaming:
+        write_excel_streaming(filename, sheets)
+        return
+    
+    import pandas as pd
+    
+    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        for sheet_name, df, index in sheets:
+            df.to_excel(writer, sheet_name=sheet_name, index=index, inf_rep=INF_REP)
+
+def write_excel_streaming(filename: str, sheets: List[Sheet]):
+    """
+    Write report sheets with openpyxl's write-only workbook.
+    Rows are serialised as they are appended instead of building the full
+    cell object graph in memory, so the writer's memory does not grow with
+    the row count. Cells are written without pandas' header styling.
+    """
+    from openpyxl import Workbook
+    from pandas import NaT
+    
+    workbook = Workbook(write_only=True)
+    
+    for sheet_name, df, index in sheets:
+        worksheet = workbook.create_sheet(title=sheet_name)
+        frame = df.reset_index() if index else df
+        
+        worksheet.append([str(column) for column in frame.columns])
+        for row in frame.itertuples(index=False, name=None):
+            worksheet.append([_cell_value(value, NaT) for value in row])
+    
+    workbook.save(filename)
+
+def _cell_value(value, nat):
+    """
+    Excel has no NaN or infinity; write missing values (NaN, pandas' NaT)
+    as empty cells and infinite ones as text, like DataFrame.to_excel
+    """
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, float) and math.isinf(value):
+        return INF_REP if value > 0 else f"-{INF_REP}"
+    if value is nat:
+        return None
+    return value
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Run Metrics
+Per-stage timings and HTTP request metrics for a single aggregator run,
+written as a structured JSON run report and optionally as a Prometheus
+textfile (for node_exporter's textfile collector). Without --metrics-json
+or --metrics-prom the aggregator keeps NO_METRICS, which ignores every
+stage, request and counter, so the instrumentation stays in place at
+next to no cost.
+"""
+
+import contextlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Issue keys and ids in REST paths are folded so requests group by endpoint
+PATH_ID_PATTERN = re.compile(r'/issue/[^/]+/')
+
+_DISABLED_STAGE = contextlib.nullcontext()
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def endpoint(url: str) -> str:
+    """REST path of a URL with issue keys replaced, e.g. /rest/api/3/issue/{key}/worklog"""
+    path = url.split('://', 1)[-1]
+    path = path[path.find('/'):] if '/' in path else '/'
+    return PATH_ID_PATTERN.sub('/issue/{key}/', path.split('?', 1)[0])
+
+class _Stage:
+    """Context manager adding its wall time to one stage"""
+    __slots__ = ('metrics', 'name', 'start')
+    
+    def __init__(self, metrics: 'RunMetrics', name: str):
+        self.metrics = metrics
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.add_stage_time(self.name, time.perf_counter() - self.start)
+
+class RunMetrics:
+    """Collects stage timings, request latencies and counters for one run"""
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = time.time()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.requests: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def stage(self, name: str):
+        """
+        Time a block as part of a stage. Stages may nest (json_decode runs
+        inside fetch) and may be entered from several threads, in which case
+        their seconds add up across threads.
+        """
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _Stage(self, name)
+    
+    def add_stage_time(self, name: str, seconds: float):
+        with self._lock:
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += seconds
+            stage['calls'] += 1
+    
+    def count(self, name: str, amount: float = 1):
+        """Add to a named counter (issues, link lookups, ...)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def observe_request(self, method: str, url: str, status: Optional[int], seconds: float, size: int = 0):
+        """Record one HTTP attempt (status None when it failed without a response)"""
+        if not self.enabled:
+            return
+        key = f"{method} {endpoint(url)}"
+        with self._lock:
+            entry = self.requests.setdefault(key, {'latencies': [], 'statuses': {}, 'bytes': 0})
+            entry['latencies'].append(seconds)
+            status_key = str(status) if status is not None else 'error'
+            entry['statuses'][status_key] = entry['statuses'].get(status_key, 0) + 1
+            entry['bytes'] += size
+    
+    def report(self, session_stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """The run report as a JSON-serialisable dict"""
+        finished = time.time()
+        with self._lock:
+            requests = {}
+            for key, entry in self.requests.items():
+                latencies = sorted(entry['latencies'])
+                requests[key] = {
+                    'count': len(latencies),
+                    'statuses': dict(entry['statuses']),
+                    'bytes': entry['bytes'],
+                    'seconds_total': round(sum(latencies), 6),
+                    'seconds_p50': round(_percentile(latencies, 0.5), 6),
+                    'seconds_p95': round(_percentile(latencies, 0.95), 6),
+                    'seconds_max': round(latencies[-1], 6) if latencies else 0.0
+                }
+            stages = {
+                name: {'seconds': round(stage['seconds'], 6), 'calls': stage['calls']}
+                for name, stage in self.stages.items()
+            }
+            counters = dict(self.counters)
+        
+        if session_stats:
+            counters.update({f"http_{name}": value for name, value in session_stats.items()})
+        
+        return {
+            'started': datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec='seconds'),
+            'finished': datetime.fromtimestamp(finished, timezone.utc).isoformat(timespec='seconds'),
+            'duration_seconds': round(finished - self.started, 6),
+            'peak_rss_bytes': peak_rss_bytes(),
+            'stages': stages,
+            'requests': requests,
+            'counters': counters
+        }
+    
+    def write_json(self, path: str, session_stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Write the run report as JSON"""
+        report = self.report(session_stats)
+        _write_atomic(path, json.dumps(report, indent=2) + '\n')
+        return report
+    
+    def write_prometheus(self, path: str, session_stats: Optional[Dict[str, int]] = None,
+                         namespace: str = 'jira_aggregator', job: Optional[str] = None):
+        """
+        Write the run report in the Prometheus text exposition format. The
+        file is replaced atomically, as the textfile collector requires.
+        """
+        report = self.report(session_stats)
+        base_labels = {'job': job} if job else {}
+        lines: List[str] = []
+        
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]):
+            full_name = f"{namespace}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{full_name}{_labels({**base_labels, **labels})} {value}")
+        
+        metric('last_run_timestamp_seconds', 'gauge', 'Unix time the run finished',
+               [({}, round(self.started + report['duration_seconds'], 3))])
+        metric('run_duration_seconds', 'gauge', 'Wall time of the whole run',
+               [({}, report['duration_seconds'])])
+        if report['peak_rss_bytes'] is not None:
+            metric('peak_rss_bytes', 'gauge', 'Peak resident set size of the run',
+                   [({}, report['peak_rss_bytes'])])
+        metric('stage_seconds', 'gauge', 'Seconds spent per stage (summed across threads)',
+               [({'stage': name}, stage['seconds']) for name, stage in report['stages'].items()])
+        metric('stage_calls', 'gauge', 'Times each stage was entered',
+               [({'stage': name}, stage['calls']) for name, stage in report['stages'].items()])
+        
+        request_samples = []
+        for key, entry in report['requests'].items():
+            method, route = key.split(' ', 1)
+            for status, count in entry['statuses'].items():
+                request_samples.append(({'method': method, 'endpoint': route, 'status': status}, count))
+        metric('http_requests', 'gauge', 'HTTP attempts by endpoint and status', request_samples)
+        
+        latency_samples = []
+        for key, entry in report['requests'].items():
+            method, route = key.split(' ', 1)
+            for quantile in ('p50', 'p95', 'max'):
+                latency_samples.append(({'method': method, 'endpoint': route, 'quantile': quantile},
+                                        entry[f"seconds_{quantile}"]))
+        metric('http_request_seconds', 'gauge', 'HTTP attempt latency by endpoint', latency_samples)
+        metric('http_response_bytes', 'gauge', 'Decoded response bytes by endpoint',
+               [({'method': key.split(' ', 1)[0], 'endpoint': key.split(' ', 1)[1]}, entry['bytes'])
+                for key, entry in report['requests'].items()])
+        
+        for name, value in sorted(report['counters'].items()):
+            metric(f"run_{_metric_name(name)}", 'gauge', f"Run counter {name}", [({}, value)])
+        
+        _write_atomic(path, '\n'.join(lines) + '\n')
+
+NO_METRICS = RunMetrics(enabled=False)
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+def _metric_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    def escape(value) -> str:
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+def _write_atomic(path: str, text: str):
+    # Scrapers and readers must never see a half-written file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
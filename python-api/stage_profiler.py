@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Stage Profiler
+Opt-in cProfile and tracemalloc hooks for the aggregator CLIs. Each stage of
+a run (fetch, extract, aggregate, export, ...) gets its own cProfile profile,
+dumped as a pstats file next to a combined one, and with memory tracing on,
+its own tracemalloc snapshot diff listing the lines that allocated the most.
+A stage entered repeatedly (once per page of a streaming run) adds up into
+one profile and one memory entry, whose allocating lines come from its first
+run since snapshots are too slow to take per page. Without --profile or
+--trace-memory, stage() returns nullcontext() and nothing is measured.
+"""
+
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tracemalloc
+from itertools import islice
+from typing import Dict, List, Optional, TextIO, Tuple
+
+# Functions listed per stage, by cumulative time
+PROFILE_TOP = 15
+
+# Allocating lines listed per stage
+MEMORY_TOP = 10
+
+# Frames kept per traced allocation; more attribute better but cost more
+TRACE_FRAMES = 1
+
+_DISABLED_STAGE = contextlib.nullcontext()
+
+# tracemalloc's own bookkeeping and import machinery are never interesting.
+# They are dropped from the compared lines rather than with
+# Snapshot.filter_traces, which walks every trace of both snapshots.
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    '<frozen importlib._bootstrap>',
+    '<frozen importlib._bootstrap_external>',
+    '<unknown>'
+)
+
+def stage_path(path: str, stage: str) -> str:
+    """Per-stage pstats file name, e.g. run.prof -> run.fetch.prof"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{stage}{ext or '.prof'}"
+
+class StageProfiler:
+    """Profiles and/or traces memory per named stage of a CLI run"""
+    
+    def __init__(self, profile_path: Optional[str] = None, trace_memory: bool = False):
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        # stage -> (net growth, highest peak above the stage's start, top allocating lines)
+        self.memory: Dict[str, Tuple[int, int, List[tracemalloc.StatisticDiff]]] = {}
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.profile_path) or self.trace_memory
+    
+    def stage(self, name: str):
+        """
+        Profile a block as part of a stage. cProfile only sees the calling
+        thread, so work handed to thread pools shows up as waiting on them.
+        """
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return self._stage(name)
+    
+    @contextlib.contextmanager
+    def _stage(self, name: str):
+        before = start_size = None
+        if self.trace_memory:
+            if name not in self.memory:
+                before = tracemalloc.take_snapshot()
+            # After the snapshot, so building it does not count towards the stage's peak
+            tracemalloc.reset_peak()
+            start_size = tracemalloc.get_traced_memory()[0]
+        
+        profile = None
+        if self.profile_path:
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            if start_size is not None:
+                size, peak = tracemalloc.get_traced_memory()
+                top = []
+                if before is not None:
+                    diffs = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+                    top = list(islice((diff for diff in diffs
+                                       if diff.traceback[0].filename not in _IGNORED_FILES), MEMORY_TOP))
+                growth, highest, top = self.memory.get(name, (0, 0, top))
+                self.memory[name] = (growth + size - start_size, max(highest, peak - start_size), top)
+    
+    def dump(self, stream: Optional[TextIO] = None) -> List[str]:
+        """
+        Write the per-stage and combined pstats files; returns the paths
+        written. A file that cannot be written is reported, not raised, so
+        a bad --profile path never fails a finished run.
+        """
+        if not self.profile_path or not self.profiles:
+            return []
+        stream = stream or sys.stderr
+        
+        paths = []
+        combined = None
+        for name, profile in self.profiles.items():
+            path = stage_path(self.profile_path, name)
+            if _dump_stats(profile, path, stream):
+                paths.append(path)
+            if combined is None:
+                combined = pstats.Stats(profile)
+            else:
+                combined.add(profile)
+        if _dump_stats(combined, self.profile_path, stream):
+            paths.insert(0, self.profile_path)
+        return paths
+    
+    def report(self, stream: Optional[TextIO] = None):
+        """Print the top functions and allocating lines of each stage"""
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        
+        for name, profile in self.profiles.items():
+            buffer = io.StringIO()
+            stats = pstats.Stats(profile, stream=buffer)
+            stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP)
+            print(f"\n=== Profile: {name} ===", file=stream)
+            print(buffer.getvalue().strip('\n'), file=stream)
+        
+        for name, (growth, peak, top) in self.memory.items():
+            print(f"\n=== Memory: {name} (net {_size(growth)}, peak {_size(peak)} above start) ===", file=stream)
+            for diff in top:
+                frame = diff.traceback[0]
+                print(f"{_size(diff.size_diff):>12} {diff.count_diff:>+9,} blocks  "
+                      f"{frame.filename}:{frame.lineno}", file=stream)
+    
+    def finish(self, stream: Optional[TextIO] = None):
+        """Report, dump the profiles and stop tracing"""
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        self.report(stream)
+        for path in self.dump(stream):
+            print(f"Profile written to {path}", file=stream)
+        if self.trace_memory:
+            tracemalloc.stop()
+
+NO_PROFILER = StageProfiler()
+
+def add_profile_arguments(parser):
+    """--profile and --trace-memory options shared by the CLIs"""
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Profile each stage with cProfile and write pstats files (PATH and PATH.<stage>)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Trace allocations with tracemalloc and report the top allocating lines per stage')
+
+def _dump_stats(stats, path: str, stream: TextIO) -> bool:
+    try:
+        stats.dump_stats(path)
+        return True
+    except OSError as e:
+        print(f"Could not write profile {path}: {e}", file=stream)
+        return False
+
+def _size(size: int) -> str:
+    if abs(size) < 2**20:
+        return f"{size / 2**10:+,.1f} KiB"
+    return f"{size / 2**20:+,.1f} MiB"
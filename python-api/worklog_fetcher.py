@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+JIRA Worklog Fetcher
+Fetches every worklog of the issues matching a JQL query. Worklogs embedded
+in search results are used when complete; JIRA only embeds the first 20 per
+issue, so issues with more are re-fetched from /issue/{key}/worklog, page by
+page, on a thread pool.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from jira_data_aggregator import JiraDataAggregator
+from worklog_store import WorklogStore
+
+logger = logging.getLogger(__name__)
+
+# Worklogs requested per /issue/{key}/worklog page
+WORKLOG_PAGE_SIZE = 1000
+
+# Worklog ids accepted per /worklog/list request (JIRA limit)
+WORKLOG_LIST_BATCH = 1000
+
+class WorklogFetcher:
+    """Complete worklogs for search results, using the aggregator's session"""
+    
+    def __init__(self, aggregator: JiraDataAggregator, page_size: int = WORKLOG_PAGE_SIZE):
+        self.aggregator = aggregator
+        self.page_size = page_size
+        self.truncated_issues = 0
+    
+    @staticmethod
+    def is_truncated(issue: Dict[str, Any]) -> bool:
+        """True if the worklogs embedded in a search result are incomplete"""
+        worklog = issue.get('fields', {}).get('worklog') or {}
+        return worklog.get('total', 0) > len(worklog.get('worklogs', []))
+    
+    def fetch_issue_worklogs(self, issue_key: str) -> List[Dict[str, Any]]:
+        """All worklogs of an issue whose search result embedded only the first of them"""
+        url = f"{self.aggregator.config.base_url}/rest/api/3/issue/{issue_key}/worklog"
+        worklogs = []
+        start_at = 0
+        
+        while True:
+            response = self.aggregator.session.get(url, params={'startAt': start_at, 'maxResults': self.page_size})
+            response.raise_for_status()
+            data = response.json()
+            page = data.get('worklogs', [])
+            worklogs.extend(page)
+            
+            start_at += len(page)
+            if not page or start_at >= data.get('total', 0):
+                break
+        
+        return worklogs
+    
+    def iter_worklogs(self, jql: str, fields: Optional[List[str]] = None) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Yield (issue, worklogs) for every issue matching the query, in search
+        order. Search pages are fetched through the aggregator's pagination;
+        the truncated issues of each page are completed concurrently.
+        """
+        search_fields = ','.join(['worklog'] + list(fields or ['assignee']))
+        workers = max(self.aggregator.config.workers, 1)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for issues in self.aggregator.iter_issue_pages(jql, search_fields):
+                truncated = {
+                    issue['key']: executor.submit(self.fetch_issue_worklogs, issue['key'])
+                    for issue in issues if self.is_truncated(issue)
+                }
+                self.truncated_issues += len(truncated)
+                
+                for issue in issues:
+                    if issue['key'] in truncated:
+                        worklogs = truncated[issue['key']].result()
+                    else:
+                        worklogs = (issue.get('fields', {}).get('worklog') or {}).get('worklogs', [])
+                    yield issue, worklogs
+        
+        if self.truncated_issues:
+            logger.info(f"Fetched full worklogs for {self.truncated_issues} issues with more than the embedded limit")
+    
+    def sync(self, store: WorklogStore, jql: str, full_refresh: bool = False):
+        """
+        Bring the store's worklogs for a query up to date. The first sync
+        (or a full refresh) fetches every worklog; later syncs read the
+        /worklog/updated and /worklog/deleted feeds since the previous sync
+        and fully fetch only issues that newly match the query.
+        """
+        if full_refresh:
+            store.reset(jql)
+        
+        since = store.get_watermark(jql)
+        # Anything changed while this sync runs is picked up by the next one
+        sync_started = int(time.time() * 1000)
+        
+        if since is None:
+            logger.info("No worklog watermark for this query, fetching all worklogs")
+            issues = []
+            for issue, worklogs in self.iter_worklogs(jql, fields=['assignee']):
+                store.replace_issue_worklogs(issue['id'], worklogs)
+                issues.append(issue)
+            store.set_query_issues(jql, issues)
+            store.set_watermark(jql, sync_started)
+            return
+        
+        known_ids = store.query_issue_ids(jql)
+        issues = []
+        for page in self.aggregator.iter_issue_pages(jql, 'assignee'):
+            issues.extend(page)
+        store.set_query_issues(jql, issues)
+        issue_ids = {str(issue['id']) for issue in issues}
+        
+        # Issues that newly match the query have no worklogs stored yet
+        new_issues = [issue for issue in issues if str(issue['id']) not in known_ids]
+        if new_issues:
+            logger.info(f"Fetching all worklogs for {len(new_issues)} issues new to this query")
+            with ThreadPoolExecutor(max_workers=max(self.aggregator.config.workers, 1)) as executor:
+                results = executor.map(self.fetch_issue_worklogs, [issue['key'] for issue in new_issues])
+                for issue, worklogs in zip(new_issues, results):
+                    store.replace_issue_worklogs(issue['id'], worklogs)
+        
+        updated_ids, updated_until = self.read_worklog_feed('updated', since)
+        changed = [
+            worklog for worklog in self.fetch_worklogs_by_id(updated_ids)
+            if str(worklog.get('issueId')) in issue_ids
+        ]
+        store.upsert_worklogs(changed)
+        
+        deleted_ids, deleted_until = self.read_worklog_feed('deleted', since)
+        store.delete_worklogs(deleted_ids)
+        
+        logger.info(f"Worklog sync: {len(changed)} changed, {len(deleted_ids)} deleted since last run")
+        store.set_watermark(jql, min(updated_until, deleted_until))
+    
+    def read_worklog_feed(self, feed: str, since: int) -> Tuple[List[int], int]:
+        """
+        Read /worklog/updated or /worklog/deleted from `since` (epoch ms) to
+        the end. Returns the worklog ids and the position to resume from.
+        """
+        url = f"{self.aggregator.config.base_url}/rest/api/3/worklog/{feed}"
+        worklog_ids = []
+        
+        while True:
+            response = self.aggregator.session.get(url, params={'since': since})
+            response.raise_for_status()
+            data = response.json()
+            
+            worklog_ids.extend(value['worklogId'] for value in data.get('values', []))
+            # JIRA reports where this page ends; it trails real time slightly
+            since = data.get('until', since)
+            
+            if data.get('lastPage', True):
+                return worklog_ids, since
+    
+    def fetch_worklogs_by_id(self, worklog_ids: List[int]) -> List[Dict[str, Any]]:
+        """Fetch worklogs by id through /worklog/list, batches in parallel"""
+        url = f"{self.aggregator.config.base_url}/rest/api/3/worklog/list"
+        ids = iter(worklog_ids)
+        batches = list(iter(lambda: list(islice(ids, WORKLOG_LIST_BATCH)), []))
+        
+        def fetch(batch: List[int]) -> List[Dict[str, Any]]:
+            response = self.aggregator.session.post(url, json={'ids': batch})
+            response.raise_for_status()
+            return response.json()
+        
+        with ThreadPoolExecutor(max_workers=max(self.aggregator.config.workers, 1)) as executor:
+            return [worklog for page in executor.map(fetch, batches) for worklog in page]
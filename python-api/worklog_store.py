@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Local JIRA Worklog Store
+SQLite-backed copy of the worklogs of the issues matching a JQL query, used
+for incremental worklog syncs. Remembers per query how far the
+/worklog/updated and /worklog/deleted feeds have been read, so later runs
+only fetch worklogs that changed since the previous sync.
+"""
+
+import sqlite3
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class WorklogStore:
+    """Persists worklogs, their issues and per-query feed watermarks in SQLite"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS worklogs (
+                id TEXT PRIMARY KEY,
+                issue_id TEXT NOT NULL,
+                started TEXT,
+                seconds INTEGER NOT NULL,
+                updated TEXT
+            );
+            CREATE INDEX IF NOT EXISTS worklogs_issue ON worklogs (issue_id);
+            CREATE TABLE IF NOT EXISTS issues (
+                id TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                assignee TEXT
+            );
+            CREATE TABLE IF NOT EXISTS query_issues (
+                jql TEXT NOT NULL,
+                issue_id TEXT NOT NULL,
+                PRIMARY KEY (jql, issue_id)
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                jql TEXT PRIMARY KEY,
+                since INTEGER NOT NULL
+            );
+        """)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+    
+    def get_watermark(self, jql: str) -> Optional[int]:
+        """Feed position (epoch milliseconds) reached by the last sync of a query"""
+        row = self.conn.execute(
+            'SELECT since FROM watermarks WHERE jql = ?', (jql,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set_watermark(self, jql: str, since: int):
+        """Advance a query's feed position (epoch milliseconds)"""
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO watermarks (jql, since) VALUES (?, ?)', (jql, since)
+            )
+    
+    def reset(self, jql: str):
+        """Drop a query's feed watermark and issue list, so its next sync re-reads every worklog"""
+        with self.conn:
+            self.conn.execute('DELETE FROM watermarks WHERE jql = ?', (jql,))
+            self.conn.execute('DELETE FROM query_issues WHERE jql = ?', (jql,))
+    
+    def query_issue_ids(self, jql: str) -> Set[str]:
+        """Ids of the issues that matched a query at its last sync"""
+        rows = self.conn.execute('SELECT issue_id FROM query_issues WHERE jql = ?', (jql,))
+        return {issue_id for (issue_id,) in rows}
+    
+    def set_query_issues(self, jql: str, issues: List[Dict[str, Any]]):
+        """Record the issues currently matching a query (id, key, assignee)"""
+        rows = []
+        for issue in issues:
+            assignee = issue.get('fields', {}).get('assignee')
+            rows.append((
+                str(issue['id']),
+                issue['key'],
+                assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
+            ))
+        
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO issues (id, key, assignee) VALUES (?, ?, ?)', rows)
+            self.conn.execute('DELETE FROM query_issues WHERE jql = ?', (jql,))
+            self.conn.executemany(
+                'INSERT INTO query_issues (jql, issue_id) VALUES (?, ?)',
+                [(jql, issue_id) for issue_id, _, _ in rows]
+            )
+    
+    def replace_issue_worklogs(self, issue_id: str, worklogs: List[Dict[str, Any]]):
+        """Replace every stored worklog of an issue with a complete fetch"""
+        with self.conn:
+            self.conn.execute('DELETE FROM worklogs WHERE issue_id = ?', (str(issue_id),))
+            self._insert(worklogs, issue_id)
+    
+    def upsert_worklogs(self, worklogs: List[Dict[str, Any]]):
+        """Insert new and replace changed worklogs"""
+        with self.conn:
+            self._insert(worklogs)
+    
+    def delete_worklogs(self, worklog_ids: Iterable[str]):
+        """Drop worklogs deleted in JIRA"""
+        with self.conn:
+            self.conn.executemany('DELETE FROM worklogs WHERE id = ?', [(str(i),) for i in worklog_ids])
+    
+    def _insert(self, worklogs: List[Dict[str, Any]], issue_id: Optional[str] = None):
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO worklogs (id, issue_id, started, seconds, updated) VALUES (?, ?, ?, ?, ?)',
+            [
+                (
+                    str(worklog['id']),
+                    str(worklog.get('issueId', issue_id)),
+                    worklog.get('started', ''),
+                    worklog.get('timeSpentSeconds', 0),
+                    worklog.get('updated', '')
+                )
+                for worklog in worklogs
+            ]
+        )
+    
+    def load_worklogs(self, jql: str) -> 'pd.DataFrame':
+        """
+        Worklog rows of the issues currently matching a query, in the shape
+        of fetch_jira_worklogs: Date, Feature Link, Assignee, Time Logged (Hours)
+        """
+        import pandas as pd
+        
+        return pd.read_sql_query(
+            'SELECT substr(w.started, 1, 10) AS "Date", i.key AS "Feature Link", '
+            'i.assignee AS "Assignee", round(w.seconds / 3600.0, 2) AS "Time Logged (Hours)" '
+            'FROM worklogs w '
+            'JOIN query_issues q ON q.issue_id = w.issue_id AND q.jql = ? '
+            'JOIN issues i ON i.id = w.issue_id '
+            'ORDER BY i.key, w.started',
+            self.conn,
+            params=(jql,)
+        )